@@ -1,16 +1,77 @@
 #OpenAI 클라이언트
+# ai_client.py
+"""
+프로세스 전체가 공유하는 OpenAI 클라이언트.
+- 처음 필요할 때 한 번만 만들고(스레드 안전), 모든 세션/페이지가 같은 커넥션 풀을 써서
+  이미 열린 TLS 연결을 재사용한다.
+- 페이지를 import하는 것만으로는 secrets를 읽거나 네트워크 설정을 하지 않는다.
+- 연결/읽기 타임아웃과 keep-alive 풀 크기를 명시한다 (기본값은 읽기 600초).
+"""
 import os
-import streamlit as st
-from openai import OpenAI
+import threading
+
+import httpx
+from openai import DefaultHttpxClient, OpenAI
+
+
+# 연결은 빨리 포기하고, 읽기는 긴 녹음 전사/긴 대본 생성까지 기다린다
+CONNECT_TIMEOUT_SEC = 10.0
+READ_TIMEOUT_SEC = 120.0
+WRITE_TIMEOUT_SEC = 60.0
+# 풀에서 빈 연결을 기다리는 시간
+POOL_TIMEOUT_SEC = 30.0
+
+# 동시 세션 수 + 배치 작업 동시 호출 수를 감당할 정도
+MAX_CONNECTIONS = 64
+MAX_KEEPALIVE_CONNECTIONS = 32
+KEEPALIVE_EXPIRY_SEC = 60.0
+MAX_RETRIES = 2
+
+TIMEOUT = httpx.Timeout(
+    READ_TIMEOUT_SEC,
+    connect=CONNECT_TIMEOUT_SEC,
+    write=WRITE_TIMEOUT_SEC,
+    pool=POOL_TIMEOUT_SEC,
+)
+LIMITS = httpx.Limits(
+    max_connections=MAX_CONNECTIONS,
+    max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+    keepalive_expiry=KEEPALIVE_EXPIRY_SEC,
+)
+
+_lock = threading.Lock()
+_client = None
+
+
+def get_api_key() -> str:
+    """
+    Streamlit secrets 또는 환경변수에서 OPENAI_API_KEY를 읽는다.
+    (secrets 파일이 없는 CLI/배치 환경에서는 환경변수만 본다)
+    """
+    try:
+        import streamlit as st
+
+        if "OPENAI_API_KEY" in st.secrets:
+            return st.secrets["OPENAI_API_KEY"]
+    except Exception:
+        pass
+    return os.environ.get("OPENAI_API_KEY")
 
 
 def get_client() -> OpenAI:
     """
-    Streamlit secrets 또는 환경변수에서 OPENAI_API_KEY를 읽어
-    OpenAI 클라이언트를 리턴한다.
+    공유 OpenAI 클라이언트를 리턴한다. 처음 호출할 때 만들어지고,
+    이후에는 모든 스레드/세션이 같은 객체(같은 커넥션 풀)를 쓴다.
     """
-    if "OPENAI_API_KEY" in st.secrets:
-        os.environ["OPENAI_API_KEY"] = st.secrets["OPENAI_API_KEY"]
-    # 환경변수에 이미 세팅되어 있다면 이 줄만으로 충분
-    client = OpenAI()
-    return client
+    global _client
+    if _client is None:
+        with _lock:
+            if _client is None:
+                _client = OpenAI(
+                    api_key=get_api_key(),
+                    timeout=TIMEOUT,
+                    max_retries=MAX_RETRIES,
+                    http_client=DefaultHttpxClient(limits=LIMITS, timeout=TIMEOUT),
+                )
+    return _client
+
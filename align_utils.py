@@ -0,0 +1,281 @@
+#대본-전사 정렬 (단어 단위, 앵커 기반)
+# align_utils.py
+"""
+기준 대본과 Whisper 전사를 정규화한 단어(어절) 단위로 맞춰 본다.
+- 앞뒤 공통 부분을 떼고, 양쪽에 한 번씩만 나오는 단어 중 순서가 맞는 것들(LIS)을 앵커로 삼아 쪼갠다.
+- 앵커 사이가 충분히 작아지면 편집 거리 DP로 마무리한다.
+- 점수는 띄어쓰기에 흔들리지 않게, 일치하지 않은 구간을 공백 없이 이어 붙여 글자 단위로 다시 맞춰 센다
+  ("발표할 주제는"과 "발표할주제는"은 같은 말로 본다).
+대본이 길어도 거의 선형 시간에 끝나며, 전체 점수와 함께 문장별 일치율,
+빠뜨린(delete)/추가한(insert)/바꿔 말한(replace) 단어 구간을 돌려준다.
+"""
+import bisect
+import difflib
+import re
+import unicodedata
+from collections import Counter, namedtuple
+
+
+# 이 크기(셀 수) 이하의 구간은 DP로 정렬한다
+DP_MAX_CELLS = 4096
+
+_TOKEN = re.compile(r"\S+")
+_NON_WORD = re.compile(r"[^\w]+")
+_SENTENCE_END = re.compile(r"[.?!。…]+[\"'”’)\]]*$")
+
+# tag: equal / replace / delete(대본에 있는데 말하지 않음) / insert(대본에 없는 말)
+# ref_*, hyp_*는 각 토큰 리스트의 [시작, 끝) 인덱스
+AlignOp = namedtuple("AlignOp", ["tag", "ref_start", "ref_end", "hyp_start", "hyp_end"])
+# start/end는 대본 토큰 인덱스, match_rate는 0~100 (%)
+SentenceMatch = namedtuple("SentenceMatch", ["text", "start", "end", "match_rate"])
+# tokens는 원문 표기 그대로의 어절, score는 0~100 (%)
+Alignment = namedtuple("Alignment", ["score", "ref_tokens", "hyp_tokens", "ops", "sentences"])
+
+
+def normalize_token(token: str) -> str:
+    """유니코드 정규화(NFKC) + 소문자 + 문장부호 제거."""
+    return _NON_WORD.sub("", unicodedata.normalize("NFKC", token).lower())
+
+
+def tokenize(text: str):
+    """
+    어절 단위로 나눠 (원문 토큰, 정규화 토큰, 문장 번호) 리스트를 만든다.
+    문장부호만 있는 토큰은 버리고, 문장 끝 부호나 줄바꿈에서 문장 번호를 올린다.
+    """
+    tokens = []
+    sentence = 0
+    prev_end = 0
+    ended = False
+    for m in _TOKEN.finditer(text or ""):
+        if tokens and (ended or "\n" in text[prev_end:m.start()]):
+            sentence += 1
+        prev_end = m.end()
+        raw = m.group()
+        ended = bool(_SENTENCE_END.search(raw))
+        norm = normalize_token(raw)
+        if norm:
+            tokens.append((raw, norm, sentence))
+    return tokens
+
+
+def _emit(ops, tag, i1, i2, j1, j2):
+    if i1 == i2 and j1 == j2:
+        return
+    if ops and ops[-1].tag == tag and ops[-1].ref_end == i1 and ops[-1].hyp_end == j1:
+        ops[-1] = AlignOp(tag, ops[-1].ref_start, i2, ops[-1].hyp_start, j2)
+    else:
+        ops.append(AlignOp(tag, i1, i2, j1, j2))
+
+
+def _emit_gap(ops, i1, i2, j1, j2):
+    """정렬 대상이 한쪽에만 남은 구간, 또는 양쪽 모두 남은 구간을 바꿈으로 처리한다."""
+    if i1 < i2 and j1 < j2:
+        _emit(ops, "replace", i1, i2, j1, j2)
+    elif i1 < i2:
+        _emit(ops, "delete", i1, i2, j1, j1)
+    elif j1 < j2:
+        _emit(ops, "insert", i1, i1, j1, j2)
+
+
+def _dp_align(a, b, alo, ahi, blo, bhi, ops):
+    """작은 구간의 편집 거리 정렬 (같음 0, 바꿈/빠뜨림/추가 1)."""
+    n, m = ahi - alo, bhi - blo
+    cost = [[0] * (m + 1) for _ in range(n + 1)]
+    for i in range(1, n + 1):
+        cost[i][0] = i
+    for j in range(1, m + 1):
+        cost[0][j] = j
+    for i in range(1, n + 1):
+        ai = a[alo + i - 1]
+        row, prev = cost[i], cost[i - 1]
+        for j in range(1, m + 1):
+            if ai == b[blo + j - 1]:
+                row[j] = prev[j - 1]
+            else:
+                row[j] = 1 + min(prev[j - 1], prev[j], row[j - 1])
+
+    steps = []
+    i, j = n, m
+    while i > 0 or j > 0:
+        if i > 0 and j > 0 and a[alo + i - 1] == b[blo + j - 1] and cost[i][j] == cost[i - 1][j - 1]:
+            steps.append("equal")
+            i, j = i - 1, j - 1
+        elif i > 0 and j > 0 and cost[i][j] == cost[i - 1][j - 1] + 1:
+            steps.append("replace")
+            i, j = i - 1, j - 1
+        elif i > 0 and cost[i][j] == cost[i - 1][j] + 1:
+            steps.append("delete")
+            i -= 1
+        else:
+            steps.append("insert")
+            j -= 1
+
+    i, j = alo, blo
+    for step in reversed(steps):
+        di = 0 if step == "insert" else 1
+        dj = 0 if step == "delete" else 1
+        _emit(ops, step, i, i + di, j, j + dj)
+        i, j = i + di, j + dj
+
+
+# 단어 하나로 앵커를 못 찾으면 2~4단어 묶음으로 찾는다 (어휘가 적고 반복이 많은 대본)
+ANCHOR_NGRAMS = (3, 2, 4, 1)
+
+
+def _unique_anchors(a, b, alo, ahi, blo, bhi, n: int = 1):
+    """
+    양쪽 구간에 한 번씩만 나오는 n단어 묶음 쌍 중 순서가 맞는 가장 긴 것들 (patience 방식).
+    [(a 시작, b 시작)]를 반환하며, 이웃한 앵커끼리 겹칠 수 있다.
+    """
+    keys_a = [tuple(a[i:i + n]) for i in range(alo, ahi - n + 1)]
+    keys_b = [tuple(b[j:j + n]) for j in range(blo, bhi - n + 1)]
+    count_a = Counter(keys_a)
+    count_b = Counter(keys_b)
+    pos_b = {key: blo + j for j, key in enumerate(keys_b) if count_b[key] == 1}
+    pairs = [
+        (alo + i, pos_b[key])
+        for i, key in enumerate(keys_a)
+        if count_a[key] == 1 and key in pos_b
+    ]
+
+    # b 위치 기준 최장 증가 부분 수열
+    tails, tails_idx = [], []
+    prev = [-1] * len(pairs)
+    for k, (_, j) in enumerate(pairs):
+        t = bisect.bisect_left(tails, j)
+        if t == len(tails):
+            tails.append(j)
+            tails_idx.append(k)
+        else:
+            tails[t] = j
+            tails_idx[t] = k
+        prev[k] = tails_idx[t - 1] if t > 0 else -1
+
+    anchors = []
+    k = tails_idx[-1] if tails_idx else -1
+    while k >= 0:
+        anchors.append(pairs[k])
+        k = prev[k]
+    return anchors[::-1]
+
+
+def _align_range(a, b, alo, ahi, blo, bhi, ops):
+    # 앞뒤 공통 부분
+    while alo < ahi and blo < bhi and a[alo] == b[blo]:
+        _emit(ops, "equal", alo, alo + 1, blo, blo + 1)
+        alo, blo = alo + 1, blo + 1
+    suffix = 0
+    while alo < ahi - suffix and blo < bhi - suffix and a[ahi - suffix - 1] == b[bhi - suffix - 1]:
+        suffix += 1
+    ahi_core, bhi_core = ahi - suffix, bhi - suffix
+
+    if alo == ahi_core or blo == bhi_core:
+        _emit_gap(ops, alo, ahi_core, blo, bhi_core)
+    elif (ahi_core - alo) * (bhi_core - blo) <= DP_MAX_CELLS:
+        _dp_align(a, b, alo, ahi_core, blo, bhi_core, ops)
+    else:
+        for n in ANCHOR_NGRAMS:
+            anchors = _unique_anchors(a, b, alo, ahi_core, blo, bhi_core, n)
+            if anchors:
+                break
+        if anchors:
+            i, j = alo, blo
+            for ai, bj in anchors:
+                if ai < i or bj < j:
+                    # 앞 앵커와 겹치는 부분은 이미 일치로 처리했다
+                    skip = max(i - ai, j - bj)
+                    if skip >= n or i - ai != j - bj:
+                        continue
+                    ai, bj = ai + skip, bj + skip
+                    _emit(ops, "equal", ai, ai + n - skip, bj, bj + n - skip)
+                    i, j = ai + n - skip, bj + n - skip
+                    continue
+                _align_range(a, b, i, ai, j, bj, ops)
+                _emit(ops, "equal", ai, ai + n, bj, bj + n)
+                i, j = ai + n, bj + n
+            _align_range(a, b, i, ahi_core, j, bhi_core, ops)
+        else:
+            # 반복되는 단어뿐인 큰 구간: 토큰 단위 최장 일치 블록으로 나눈다
+            matcher = difflib.SequenceMatcher(None, a[alo:ahi_core], b[blo:bhi_core], autojunk=False)
+            i, j = alo, blo
+            for block in matcher.get_matching_blocks():
+                bi, bj = alo + block.a, blo + block.b
+                if (bi - i) * (bj - j) <= DP_MAX_CELLS:
+                    _dp_align(a, b, i, bi, j, bj, ops)
+                else:
+                    _emit_gap(ops, i, bi, j, bj)
+                _emit(ops, "equal", bi, bi + block.size, bj, bj + block.size)
+                i, j = bi + block.size, bj + block.size
+
+    if suffix:
+        _emit(ops, "equal", ahi_core, ahi, bhi_core, bhi)
+
+
+def _match_gap_chars(a, b, i1, i2, j1, j2, ref_hits) -> int:
+    """
+    일치하지 않은 구간의 양쪽 어절을 공백 없이 이어 붙여 글자 단위로 맞춘다.
+    맞은 글자 수를 대본 토큰별로 ref_hits에 더하고, 전체 맞은 글자 수를 반환한다.
+    """
+    if i1 == i2 or j1 == j2:
+        return 0
+    owner = [i for i in range(i1, i2) for _ in a[i]]
+    matcher = difflib.SequenceMatcher(None, "".join(a[i1:i2]), "".join(b[j1:j2]), autojunk=False)
+    matched = 0
+    for block in matcher.get_matching_blocks():
+        for k in range(block.a, block.a + block.size):
+            ref_hits[owner[k]] += 1
+        matched += block.size
+    return matched
+
+
+def align_texts(reference: str, hypothesis: str) -> Alignment:
+    """
+    대본(reference)과 전사(hypothesis)를 정렬한다.
+    점수는 공백을 뺀 정규화 글자 수 기준 2*M/T (difflib의 ratio와 같은 정의, 0~100).
+    M은 일치한 어절의 글자 수에, 일치하지 않은 구간을 글자 단위로 다시 맞춘 글자 수를 더한 값이다.
+    둘 다 비어 있으면 100.
+    """
+    ref = tokenize(reference)
+    hyp = tokenize(hypothesis)
+    a = [t[1] for t in ref]
+    b = [t[1] for t in hyp]
+
+    ops = []
+    _align_range(a, b, 0, len(a), 0, len(b), ops)
+
+    # 대본 토큰별로 맞은 글자 수
+    ref_hits = [0] * len(a)
+    matched_chars = 0
+    gap = None
+    for op in ops + [None]:
+        if op is not None and op.tag != "equal":
+            # 이어지는 replace/delete/insert는 한 구간으로 묶는다 (띄어쓰기가 달라 생긴 1:2 바꿈 등)
+            gap = (gap[0], op.ref_end, gap[2], op.hyp_end) if gap else tuple(op[1:])
+            continue
+        if gap:
+            matched_chars += _match_gap_chars(a, b, *gap, ref_hits)
+            gap = None
+        if op is not None:
+            for i in range(op.ref_start, op.ref_end):
+                ref_hits[i] = len(a[i])
+                matched_chars += len(a[i])
+    total_chars = sum(map(len, a)) + sum(map(len, b))
+    score = 2 * matched_chars / total_chars * 100 if total_chars else 100.0
+
+    sentences = []
+    start = 0
+    for i in range(1, len(ref) + 1):
+        if i == len(ref) or ref[i][2] != ref[start][2]:
+            chars = sum(len(a[k]) for k in range(start, i))
+            hit = sum(ref_hits[start:i])
+            sentences.append(
+                SentenceMatch(
+                    " ".join(t[0] for t in ref[start:i]),
+                    start,
+                    i,
+                    hit / chars * 100 if chars else 0.0,
+                )
+            )
+            start = i
+
+    return Alignment(score, [t[0] for t in ref], [t[0] for t in hyp], ops, sentences)
@@ -1,31 +1,167 @@
 #오디오 분석 & 텍스트 유사도
 # analysis_utils.py
-import difflib
+import io
+import wave
+from collections import namedtuple
+
+import numpy as np
 import librosa
 
+from align_utils import align_texts
 
-def analyze_audio_features(y, sr):
+
+N_FFT = 2048
+HOP_LENGTH = 512
+TOP_DB = 25
+
+# 피치 추적: 음성에 충분한 분석 샘플링레이트와 사람 목소리 기본 주파수 범위
+PITCH_SR = 16000
+VOICE_FMIN = 70.0
+VOICE_FMAX = 400.0
+PITCH_HOP_SEC = 0.01
+
+# VAD: 비침묵 구간 앞뒤로 남길 여유, 이보다 짧은 무음은 하나의 발화 구간으로 합친다 (초)
+VAD_PAD_SEC = 0.15
+VAD_MERGE_GAP_SEC = 0.5
+# STT 업로드용 샘플링레이트 (Whisper 내부 처리 레이트)
+STT_SR = 16000
+
+# 한 번의 프레임 분할 + 한 번의 STFT에서 나온 특징들
+# intervals는 비침묵 구간(샘플 인덱스 [시작, 끝)), segments는 VAD 발화 구간,
+# onset_env는 온셋 강도 포락선. cent/onset_env는 발화 구간 밖에서 NaN/0이다
+# (발화 구간만 STFT하므로). 모든 프레임의 센트로이드가 필요하면 analyze_audio_features를 쓴다.
+AudioFeatures = namedtuple(
+    "AudioFeatures",
+    [
+        "times",
+        "rms",
+        "cent",
+        "total_dur",
+        "silence_ratio",
+        "init_silence",
+        "intervals",
+        "onset_env",
+        "segments",
+    ],
+)
+
+
+def _nonsilent_intervals(rms, n_samples: int, hop_length: int, top_db: float):
     """
-    음성 신호 y와 샘플링레이트 sr을 받아
-    - RMS(볼륨)
-    - 시간축
-    - 스펙트럴 센트로이드
-    - 전체 길이
-    - 침묵 비율
-    - 초기 침묵 시간
-    을 계산한다.
+    이미 계산한 프레임 RMS로 librosa.effects.split과 같은 규칙의 비침묵 구간을 구한다.
+    (최댓값 대비 top_db 이내인 프레임 → 샘플 인덱스 구간)
+    """
+    if rms.size == 0:
+        return np.zeros((0, 2), dtype=int)
+    db = librosa.power_to_db(rms**2, ref=np.max, top_db=None)
+    non_silent = db > -top_db
+
+    edges = np.flatnonzero(np.diff(non_silent.astype(int))) + 1
+    if non_silent[0]:
+        edges = np.concatenate(([0], edges))
+    if non_silent[-1]:
+        edges = np.concatenate((edges, [len(non_silent)]))
+
+    edges = librosa.frames_to_samples(edges, hop_length=hop_length)
+    edges = np.minimum(edges, n_samples)
+    return edges.reshape((-1, 2))
+
+
+def speech_segments(
+    intervals,
+    sr,
+    n_samples: int,
+    pad_sec: float = VAD_PAD_SEC,
+    merge_gap_sec: float = VAD_MERGE_GAP_SEC,
+):
+    """
+    비침묵 구간에 앞뒤 여유를 붙이고, 짧은 무음으로 떨어진 구간은 합쳐
+    VAD 발화 구간(샘플 인덱스 [시작, 끝))을 만든다.
+    """
+    pad = int(pad_sec * sr)
+    merge_gap = int(merge_gap_sec * sr)
+    segments = []
+    for start, end in np.asarray(intervals).reshape(-1, 2):
+        start, end = max(int(start) - pad, 0), min(int(end) + pad, n_samples)
+        if segments and start - segments[-1][1] <= merge_gap:
+            segments[-1][1] = max(segments[-1][1], end)
+        else:
+            segments.append([start, end])
+    return np.array(segments, dtype=int).reshape(-1, 2)
+
+
+def detect_speech(y, sr, n_fft: int = N_FFT, hop_length: int = HOP_LENGTH, top_db: float = TOP_DB):
+    """
+    VAD 단계: 프레임 에너지 한 번으로 (RMS, 비침묵 구간, 발화 구간)을 구한다.
+    이후의 스펙트럼 분석과 STT 업로드는 발화 구간만 사용한다.
+    """
+    rms = librosa.feature.rms(y=y, frame_length=n_fft, hop_length=hop_length)[0]
+    intervals = _nonsilent_intervals(rms, len(y), hop_length, top_db)
+    return rms, intervals, speech_segments(intervals, sr, len(y))
+
+
+def trim_to_segments(y, segments):
+    """발화 구간만 이어 붙인 신호를 반환한다."""
+    if len(segments) == 0:
+        return y[:0]
+    return np.concatenate([y[s:e] for s, e in segments])
+
+
+def to_original_time(t, segments, sr):
+    """
+    trim_to_segments로 잘라 붙인 신호의 시각(초)을 원본 녹음의 시각으로 되돌린다.
+    스칼라와 배열 모두 받는다.
+    """
+    t = np.asarray(t, dtype=float)
+    if len(segments) == 0:
+        return t
+    segments = np.asarray(segments)
+    lengths = (segments[:, 1] - segments[:, 0]) / sr
+    trimmed_starts = np.concatenate(([0.0], np.cumsum(lengths)[:-1]))
+    idx = np.clip(np.searchsorted(trimmed_starts, t, side="right") - 1, 0, len(segments) - 1)
+    return segments[idx, 0] / sr + (t - trimmed_starts[idx])
+
+
+def speech_only_wav(y, sr, segments, target_sr: int = STT_SR) -> bytes:
+    """
+    발화 구간만 남겨 target_sr, 16비트 모노 WAV 바이트로 만든다 (STT 업로드용).
+    발화 구간이 없으면 전체 신호를 쓴다.
+    """
+    trimmed = trim_to_segments(y, segments) if len(segments) else y
+    if sr != target_sr:
+        trimmed = librosa.resample(trimmed, orig_sr=sr, target_sr=target_sr, res_type="soxr_hq")
+    pcm = (np.clip(trimmed, -1.0, 1.0) * 32767).astype("<i2")
+
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(target_sr)
+        w.writeframes(pcm.tobytes())
+    return buf.getvalue()
+
+
+def frame_span(y, first: int, last: int, frame_length: int, hop_length: int):
     """
-    rms = librosa.feature.rms(y=y)[0]
-    times = librosa.times_like(rms, sr=sr)
-    cent = librosa.feature.spectral_centroid(y=y, sr=sr)[0]
+    center=True 프레임 격자(프레임 i는 i*hop_length 중심)에서 first~last-1 프레임이
+    덮는 샘플 구간을 잘라 온다. 신호 끝을 넘는 부분만 0으로 채우므로, 이 구간을
+    center=False로 분석하면 전체 신호를 한 번에 분석한 값과 프레임별로 같다.
+    """
+    lo = first * hop_length - frame_length // 2
+    hi = (last - 1) * hop_length + frame_length - frame_length // 2
+    span = y[max(lo, 0):min(hi, len(y))]
+    if lo < 0 or hi > len(y):
+        span = np.pad(span, (max(-lo, 0), max(hi - len(y), 0)))
+    return span
+
 
-    # 비침묵 구간 탐지
-    non_silent = librosa.effects.split(y, top_db=25)
-    non_silent_dur = sum((e - s) for s, e in non_silent) / sr
-    total_dur = librosa.get_duration(y=y, sr=sr)
+def _silence_stats(y, sr, non_silent):
+    """(전체 길이, 침묵 비율, 초기 침묵 시간)을 초 단위로 반환한다."""
+    non_silent_dur = float(np.sum(non_silent[:, 1] - non_silent[:, 0])) / sr
+    total_dur = len(y) / sr
 
     if len(non_silent) > 0:
-        # non_silent는 샘플 인덱스를 반환하므로 sr로 나눠서 초로 변환
+        # non_silent는 샘플 인덱스이므로 sr로 나눠서 초로 변환
         init_silence = non_silent[0][0] / sr
     else:
         init_silence = 0.0
@@ -33,12 +169,172 @@ def analyze_audio_features(y, sr):
     silence_ratio = (
         (total_dur - non_silent_dur) / total_dur if total_dur > 0 else 0.0
     )
+    return total_dur, silence_ratio, init_silence
+
+
+def extract_features(
+    y,
+    sr,
+    n_fft: int = N_FFT,
+    hop_length: int = HOP_LENGTH,
+    top_db: float = TOP_DB,
+    with_onset: bool = False,
+    speech=None,
+):
+    """
+    먼저 VAD(detect_speech)로 프레임 에너지와 발화 구간을 구하고
+    (이미 구한 detect_speech 결과가 있으면 speech로 넘겨 재사용한다),
+    크기 스펙트로그램은 발화 구간 프레임에서만 (앞뒤 실제 샘플을 문맥으로) 계산해 스펙트럴 센트로이드와
+    (with_onset이면) 온셋 포락선을 파생시킨다. 결과는 원본 시간축 프레임에 맞춰 채운다.
+    새 특징이 필요하면 여기서 같은 배열로부터 계산해 AudioFeatures에 추가한다.
+    """
+    if speech is None:
+        speech = detect_speech(y, sr, n_fft, hop_length, top_db)
+    rms, non_silent, segments = speech
+    times = librosa.times_like(rms, sr=sr, hop_length=hop_length)
+
+    n_frames = len(rms)
+    cent = np.full(n_frames, np.nan)
+    onset_env = np.zeros(n_frames) if with_onset else None
+    for start, end in segments:
+        # 프레임 격자를 원본과 맞추기 위해 시작점을 hop 배수로 내린다
+        first = start // hop_length
+        last = min(first + 1 + (end - first * hop_length) // hop_length, n_frames)
+        S = np.abs(
+            librosa.stft(
+                frame_span(y, first, last, n_fft, hop_length),
+                n_fft=n_fft,
+                hop_length=hop_length,
+                center=False,
+            )
+        )
+        cent[first:last] = librosa.feature.spectral_centroid(
+            S=S, sr=sr, n_fft=n_fft, hop_length=hop_length
+        )[0]
+        if with_onset:
+            mel = librosa.feature.melspectrogram(S=S**2, sr=sr, n_fft=n_fft, hop_length=hop_length)
+            # beat_track(y=...)가 내부에서 쓰는 것과 같은 median 집계 온셋 포락선
+            onset_env[first:last] = librosa.onset.onset_strength(
+                S=librosa.power_to_db(mel), sr=sr, hop_length=hop_length, aggregate=np.median
+            )
+
+    total_dur, silence_ratio, init_silence = _silence_stats(y, sr, non_silent)
+    return AudioFeatures(
+        times, rms, cent, total_dur, silence_ratio, init_silence, non_silent, onset_env, segments
+    )
+
+
+# f0는 무성/침묵 프레임에서 NaN, voiced는 유성 프레임 마스크
+PitchTrack = namedtuple("PitchTrack", ["times", "f0", "voiced"])
+
+
+def pitch_frame_params(fmin: float = VOICE_FMIN, analysis_sr: int = PITCH_SR):
+    """피치 분석 (frame_length, hop_length): fmin 주기의 두 배 이상을 담는 가장 작은 2의 거듭제곱 프레임."""
+    frame_length = int(2 ** np.ceil(np.log2(2.2 * analysis_sr / fmin)))
+    return frame_length, int(analysis_sr * PITCH_HOP_SEC)
+
+
+def pitch_frame_ranges(intervals, frame_length: int, hop_length: int, n_frames: int):
+    """
+    analysis_sr 기준 비침묵 구간마다 피치를 구할 프레임 범위 [first, last)를 만든다.
+    프레임 하나보다 짧은 구간은 건너뛴다.
+    """
+    ranges = []
+    for start, end in intervals:
+        if end - start < frame_length:
+            continue
+        first = int(round(start / hop_length))
+        last = min(first + 1 + (end - start) // hop_length, n_frames)
+        if first < last:
+            ranges.append((first, last))
+    return ranges
+
+
+def track_pitch(
+    y,
+    sr,
+    intervals=None,
+    fmin: float = VOICE_FMIN,
+    fmax: float = VOICE_FMAX,
+    analysis_sr: int = PITCH_SR,
+):
+    """
+    목소리 범위(fmin~fmax)에 맞춘 피치(f0) 추적.
+    - 신호를 analysis_sr로 한 번만 리샘플링한다.
+    - extract_features가 찾은 비침묵 구간(intervals, 원래 sr 기준 샘플 인덱스)의 프레임에서만 yin을 돌린다.
+    - 범위 경계에 붙은 값(골짜기를 못 찾은 프레임)은 무성으로 보고 NaN 처리한다.
+    """
+    if sr != analysis_sr:
+        y = librosa.resample(y, orig_sr=sr, target_sr=analysis_sr, res_type="soxr_hq")
+    if intervals is None:
+        intervals = np.array([[0, len(y)]])
+    else:
+        intervals = np.round(np.asarray(intervals) * analysis_sr / sr).astype(int)
+
+    frame_length, hop_length = pitch_frame_params(fmin, analysis_sr)
+
+    n_frames = 1 + len(y) // hop_length
+    f0 = np.full(n_frames, np.nan)
+    for first, last in pitch_frame_ranges(intervals, frame_length, hop_length, n_frames):
+        f0[first:last] = librosa.yin(
+            frame_span(y, first, last, frame_length, hop_length),
+            fmin=fmin,
+            fmax=fmax,
+            sr=analysis_sr,
+            frame_length=frame_length,
+            hop_length=hop_length,
+            center=False,
+        )
+
+    voiced = np.isfinite(f0) & (f0 > fmin * 1.01) & (f0 < fmax * 0.99)
+    f0[~voiced] = np.nan
+    times = librosa.frames_to_time(np.arange(n_frames), sr=analysis_sr, hop_length=hop_length)
+    return PitchTrack(times, f0, voiced)
+
+
+def analysis_config_fingerprint() -> str:
+    """분석 결과를 바꾸는 설정값 묶음 (결과 캐시 키에 넣어 설정이 바뀌면 다시 계산되게 한다)."""
+    return ":".join(
+        str(v)
+        for v in (
+            librosa.__version__,
+            N_FFT,
+            HOP_LENGTH,
+            TOP_DB,
+            PITCH_SR,
+            VOICE_FMIN,
+            VOICE_FMAX,
+            PITCH_HOP_SEC,
+            VAD_PAD_SEC,
+            VAD_MERGE_GAP_SEC,
+        )
+    )
+
 
+def analyze_audio_features(y, sr):
+    """
+    음성 신호 y와 샘플링레이트 sr을 받아
+    - 시간축
+    - RMS(볼륨)
+    - 스펙트럴 센트로이드 (전체 신호, 모든 프레임)
+    - 전체 길이
+    - 침묵 비율
+    - 초기 침묵 시간
+    을 계산한다. 센트로이드를 뺀 값은 extract_features와 같다.
+    extract_features의 cent는 발화 구간 밖이 NaN이므로, 여기서는 발화 구간별 분석 대신
+    전체 신호를 한 번 STFT해 모든 프레임의 센트로이드를 구한다.
+    """
+    rms, non_silent, _ = detect_speech(y, sr)
+    times = librosa.times_like(rms, sr=sr, hop_length=HOP_LENGTH)
+    S = np.abs(librosa.stft(y, n_fft=N_FFT, hop_length=HOP_LENGTH))
+    cent = librosa.feature.spectral_centroid(S=S, sr=sr, n_fft=N_FFT, hop_length=HOP_LENGTH)[0]
+    total_dur, silence_ratio, init_silence = _silence_stats(y, sr, non_silent)
     return times, rms, cent, total_dur, silence_ratio, init_silence
 
 
 def calculate_similarity(t1: str, t2: str) -> float:
     """
     두 문자열의 유사도를 0~100 (%)로 반환.
+    (정규화한 어절 단위 정렬 점수, 문장별 결과가 필요하면 align_utils.align_texts)
     """
-    return difflib.SequenceMatcher(None, t1, t2).ratio() * 100
+    return align_texts(t1, t2).score
@@ -1,5 +1,9 @@
 # app.py
+# librosa(numba)보다 먼저 import해야 JIT 디스크 캐시 위치가 적용된다
+import warmup
 import streamlit as st
+import os
+import tempfile
 import time
 import pandas as pd
 import plotly.express as px
@@ -26,6 +30,11 @@ from pages.interview import (
     render_interview_upload_page,
     render_interview_practice_page,
 )
+from pdf_utils import get_ocr_stats, OCR_DPI_LEVELS, OCR_CONF_THRESHOLD
+from ai_client import get_client
+from llm_utils import LLM_CACHE_ENABLED, get_llm_cache_stats
+from rate_limit import openai_governor
+from batch_questions import collect_pdf_sources, run_batch
 
 # ----------------------------------------
 # 상수 설정
@@ -36,6 +45,8 @@ ADMIN_ID = "jjhjjh420"  # 관리자 아이디
 st.set_page_config(page_title="Spec-trum Pro", page_icon="🎙️", layout="wide")
 # DB 초기화
 init_db()
+# 음성 분석 워밍업 (SPECTRUM_WARMUP=1일 때, 프로세스당 한 번 백그라운드에서)
+warmup.start_warmup()
 
 # ✅ 전역 스타일 주입 (Manage App 및 툴바 완전 숨김)
 st.markdown("""
@@ -368,7 +379,7 @@ elif st.session_state.step == "admin_dashboard":
         st.markdown("<h1 style='color:#F87171;'>⚙️ Admin Dashboard</h1>", unsafe_allow_html=True)
         st.caption(f"관리자 모드 접속 중: {st.session_state.user}")
         
-        tab_dash, tab_users, tab_inquiries, tab_settings = st.tabs(["대시보드", "사용자 관리", "📞 문의 내역", "시스템 설정"])
+        tab_dash, tab_users, tab_inquiries, tab_batch, tab_settings = st.tabs(["대시보드", "사용자 관리", "📞 문의 내역", "📚 일괄 질문 생성", "시스템 설정"])
         
         with tab_dash:
             try:
@@ -432,11 +443,81 @@ elif st.session_state.step == "admin_dashboard":
             else:
                 st.info("아직 도착한 문의가 없습니다.")
 
+        with tab_batch:
+            st.markdown("#### 📚 학급 단위 면접 질문 일괄 생성")
+            st.caption("파일 이름(확장자 제외)을 학생 아이디로 사용합니다. 예: hong123.pdf → hong123")
+            batch_files = st.file_uploader(
+                "생기부 PDF 여러 개 또는 zip 파일",
+                type=["pdf", "zip"],
+                accept_multiple_files=True,
+            )
+            if batch_files and st.button("일괄 생성 시작", type="primary", use_container_width=True):
+                with tempfile.TemporaryDirectory() as batch_dir:
+                    sources = []
+                    for f in batch_files:
+                        path = os.path.join(batch_dir, os.path.basename(f.name))
+                        with open(path, "wb") as out:
+                            out.write(f.getbuffer())
+                        if f.name.lower().endswith(".zip"):
+                            sources.extend(collect_pdf_sources(path))
+                        else:
+                            sources.append((os.path.splitext(os.path.basename(f.name))[0], path))
+
+                    progress = st.progress(0.0, text=f"0/{len(sources)} 완료")
+
+                    def on_batch_progress(done, total, result):
+                        progress.progress(done / total, text=f"{done}/{total} 완료 · {result['student_id']}")
+
+                    batch_results = run_batch(sources, get_client(), on_progress=on_batch_progress)
+
+                ok_count = sum(1 for r in batch_results if r["status"] == "ok")
+                st.success(f"{ok_count}/{len(batch_results)}명의 질문 세트를 저장했습니다.")
+                st.dataframe(pd.DataFrame(batch_results), use_container_width=True, hide_index=True)
+
         with tab_settings:
             st.markdown("#### 🔧 시스템 제어")
             st.toggle("🚧 유지보수 모드 활성화")
             st.toggle("🔔 전체 공지사항 배너")
 
+            st.markdown("#### 🔎 생기부 OCR 통계 (이 서버 프로세스 기준)")
+            ocr_stats = get_ocr_stats()
+            ocr1, ocr2, ocr3 = st.columns(3)
+            ocr1.metric("OCR 페이지 수", f"{ocr_stats.get('pages', 0)} 쪽")
+            ocr2.metric("DPI 상향 비율", f"{ocr_stats['escalation_rate'] * 100:.1f}%")
+            ocr3.metric(
+                "페이지당 OCR 시간",
+                f"{ocr_stats.get('seconds', 0) / max(ocr_stats.get('pages', 0), 1):.2f}초",
+            )
+            st.caption(
+                f"DPI 단계: {', '.join(map(str, OCR_DPI_LEVELS))} · "
+                f"신뢰도 기준: {OCR_CONF_THRESHOLD:g}"
+            )
+
+            st.markdown("#### 💾 LLM 응답 캐시 (이 서버 프로세스 기준)")
+            llm_stats = get_llm_cache_stats()
+            llm1, llm2, llm3 = st.columns(3)
+            llm1.metric("캐시 적중", f"{llm_stats['hits']} 회")
+            llm2.metric("적중률", f"{llm_stats['hit_rate'] * 100:.1f}%")
+            llm3.metric("절약한 토큰", f"{llm_stats['saved_tokens']:,}")
+            if llm_stats["sites"]:
+                st.dataframe(
+                    pd.DataFrame.from_dict(llm_stats["sites"], orient="index").fillna(0).astype(int),
+                    use_container_width=True,
+                )
+            st.caption(f"캐시 사용: {'켜짐' if LLM_CACHE_ENABLED else '꺼짐 (LLM_CACHE=0)'}")
+
+            st.markdown("#### 🚦 OpenAI 호출 대기열 (이 서버 프로세스 기준)")
+            gov = openai_governor.snapshot()
+            gov1, gov2, gov3, gov4 = st.columns(4)
+            gov1.metric("대기 중 / 진행 중", f"{gov['queued_now']} / {gov['in_flight']}")
+            gov2.metric("최근 1분 요청", f"{gov['rpm_used']} / {gov['rpm_limit']}")
+            gov3.metric("최근 1분 토큰(추정)", f"{gov['tpm_used']:,} / {gov['tpm_limit']:,}")
+            gov4.metric("평균 대기", f"{gov['avg_wait_sec']:.1f}초")
+            st.caption(
+                f"대기한 요청 {gov.get('queued', 0)}건 · 429 응답 {gov.get('rate_limited', 0)}건 · "
+                "한도는 OPENAI_RPM_LIMIT / OPENAI_TPM_LIMIT / OPENAI_MAX_CONCURRENCY로 설정"
+            )
+
 
 # 요금제 페이지
 elif st.session_state.step == "pricing":
@@ -0,0 +1,168 @@
+#오디오 디코드 (float32 모노, 분석 샘플링레이트로 한 번만 리샘플링)
+# audio_io.py
+import io
+import os
+import shutil
+import struct
+import subprocess
+
+import numpy as np
+import soundfile as sf
+import soxr
+
+
+# 분석/피치/STT가 모두 쓰는 기준 샘플링레이트 (음성에는 8kHz 대역이면 충분)
+ANALYSIS_SR = 16000
+
+_WAVE_FORMAT_PCM = 1
+_WAVE_FORMAT_FLOAT = 3
+_WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+
+def _as_buffer(source):
+    """
+    파일 경로는 그대로, 업로드 파일(BytesIO)과 bytes는 복사 없는 memoryview로 바꾼다.
+    그 밖의 파일 객체는 읽어서 bytes로 만든다.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        return os.fspath(source)
+    if hasattr(source, "getvalue"):
+        # getbuffer()는 BytesIO가 공유하던 bytes를 복사하게 만들지만 getvalue()는 그대로 돌려준다
+        return memoryview(source.getvalue())
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return memoryview(source)
+    return memoryview(source.read())
+
+
+def _read_head(buf, size: int = 4096) -> bytes:
+    if isinstance(buf, str):
+        with open(buf, "rb") as f:
+            return f.read(size)
+    return bytes(buf[:size])
+
+
+def _parse_wav(buf):
+    """
+    RIFF/WAVE 헤더에서 (채널 수, 샘플링레이트, numpy dtype, data 오프셋, 샘플 수)를 읽는다.
+    16비트 정수/32비트 실수 PCM이 아니면 None (soundfile로 넘긴다).
+    """
+    if isinstance(buf, str):
+        with open(buf, "rb") as f:
+            return _parse_wav_chunks(f)
+    return _parse_wav_chunks(io.BytesIO(buf[:65536]))
+
+
+def _parse_wav_chunks(f):
+    riff = f.read(12)
+    if len(riff) < 12 or riff[:4] != b"RIFF" or riff[8:12] != b"WAVE":
+        return None
+    fmt = None
+    while True:
+        header = f.read(8)
+        if len(header) < 8:
+            return None
+        chunk_id, size = header[:4], struct.unpack("<I", header[4:])[0]
+        if chunk_id == b"data":
+            break
+        body_start = f.tell()
+        if chunk_id == b"fmt ":
+            body = f.read(size)
+            tag, channels, sr, _, _, bits = struct.unpack("<HHIIHH", body[:16])
+            if tag == _WAVE_FORMAT_EXTENSIBLE and len(body) >= 26:
+                tag = struct.unpack("<H", body[24:26])[0]
+            fmt = (tag, channels, sr, bits)
+        f.seek(body_start + size + (size & 1))
+
+    if fmt is None:
+        return None
+    tag, channels, sr, bits = fmt
+    if tag == _WAVE_FORMAT_PCM and bits == 16:
+        dtype = np.dtype("<i2")
+    elif tag == _WAVE_FORMAT_FLOAT and bits == 32:
+        dtype = np.dtype("<f4")
+    else:
+        return None
+    return channels, sr, dtype, f.tell(), size // (dtype.itemsize * channels)
+
+
+def _decode_wav(buf, info):
+    """
+    PCM 샘플을 복사 없이 가리킨 뒤(경로는 memmap, 업로드는 frombuffer)
+    float32 모노 버퍼 하나로 변환한다.
+    """
+    channels, sr, dtype, offset, n_frames = info
+    # 녹음 중 끊긴 파일은 헤더의 길이가 실제보다 클 수 있다
+    available = (os.path.getsize(buf) if isinstance(buf, str) else len(buf)) - offset
+    count = min(n_frames, available // (dtype.itemsize * channels)) * channels
+    if isinstance(buf, str):
+        raw = np.memmap(buf, dtype=dtype, mode="r", offset=offset, shape=(count,))
+    else:
+        raw = np.frombuffer(buf, dtype=dtype, count=count, offset=offset)
+
+    # 채널 평균을 float32 버퍼 하나에 누적한다
+    y = raw[0::channels].astype(np.float32)
+    for ch in range(1, channels):
+        y += raw[ch::channels]
+    if channels > 1:
+        y /= channels
+    if dtype.kind == "i":
+        y *= 1.0 / 32768.0
+    return y, sr
+
+
+def _decode_soundfile(buf):
+    """WAV 이외의 libsndfile 포맷 (FLAC, Ogg Vorbis/Opus 등)."""
+    src = buf if isinstance(buf, str) else io.BytesIO(buf)
+    with sf.SoundFile(src) as f:
+        data = f.read(dtype="float32", always_2d=True)
+        sr = f.samplerate
+    y = data[:, 0] if data.shape[1] == 1 else data.mean(axis=1, dtype=np.float32)
+    return np.ascontiguousarray(y), sr
+
+
+def _decode_ffmpeg(buf, target_sr: int):
+    """
+    WebM/Opus 등 libsndfile이 못 읽는 포맷은 ffmpeg로 디코드/모노 변환/리샘플링을 한 번에 한다.
+    (서버에 ffmpeg 필요: packages.txt)
+    """
+    if shutil.which("ffmpeg") is None:
+        raise RuntimeError("이 오디오 형식을 읽으려면 ffmpeg가 필요합니다.")
+    cmd = ["ffmpeg", "-nostdin", "-v", "error", "-i", buf if isinstance(buf, str) else "pipe:0"]
+    cmd += ["-f", "f32le", "-ac", "1", "-ar", str(target_sr), "pipe:1"]
+    proc = subprocess.run(
+        cmd,
+        input=None if isinstance(buf, str) else bytes(buf),
+        capture_output=True,
+        check=False,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"오디오 디코드 실패: {proc.stderr.decode(errors='ignore').strip()}")
+    return np.frombuffer(proc.stdout, dtype="<f4"), target_sr
+
+
+def load_audio(source, sr: int = ANALYSIS_SR):
+    """
+    녹음(파일 경로, st.audio_input 업로드, bytes)을 float32 모노 (y, sr)로 디코드한다.
+    - WAV(16비트/실수 PCM): 헤더만 읽고 샘플은 memmap/frombuffer로 가리켜 바로 float32로 변환
+    - FLAC/Ogg 등: soundfile, WebM 등: ffmpeg
+    - sr이 있으면 한 번만 리샘플링한다 (sr=None이면 원래 레이트 유지)
+    """
+    buf = _as_buffer(source)
+    head = _read_head(buf, 12)
+
+    if head[:4] == b"\x1a\x45\xdf\xa3":  # Matroska/WebM
+        y, orig_sr = _decode_ffmpeg(buf, sr or 48000)
+    else:
+        info = _parse_wav(buf) if head[:4] == b"RIFF" else None
+        if info is not None:
+            y, orig_sr = _decode_wav(buf, info)
+        else:
+            try:
+                y, orig_sr = _decode_soundfile(buf)
+            except sf.LibsndfileError:
+                y, orig_sr = _decode_ffmpeg(buf, sr or 48000)
+
+    if sr is not None and orig_sr != sr:
+        y = soxr.resample(y, orig_sr, sr, quality="HQ")
+        orig_sr = sr
+    return y, orig_sr
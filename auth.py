@@ -36,6 +36,16 @@ def init_db():
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         )
     ''')
+
+    # 3. 일괄 생성된 면접 질문 세트 (학생 아이디별 최신 1개)
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS question_sets (
+            username TEXT PRIMARY KEY,
+            questions TEXT,
+            source TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
     
     conn.commit()
     conn.close()
@@ -134,3 +144,49 @@ def check_user_has_inquiry(username):
         return False
     finally:
         conn.close()
+
+def save_question_set(username, questions, source=""):
+    """일괄 생성한 면접 질문 원문을 학생 아이디 기준으로 저장 (기존 세트는 덮어씀)"""
+    conn = sqlite3.connect("users.db", timeout=30)
+    c = conn.cursor()
+    try:
+        c.execute(
+            "INSERT OR REPLACE INTO question_sets (username, questions, source, created_at) "
+            "VALUES (?, ?, ?, CURRENT_TIMESTAMP)",
+            (username, questions, source),
+        )
+        conn.commit()
+        return True
+    except Exception as e:
+        print(e)
+        return False
+    finally:
+        conn.close()
+
+def get_question_set(username):
+    """학생에게 저장된 질문 세트를 dict로 반환 (없으면 None)"""
+    if not username:
+        return None
+    conn = sqlite3.connect("users.db")
+    c = conn.cursor()
+    try:
+        c.execute(
+            "SELECT questions, source, created_at FROM question_sets WHERE username = ?",
+            (username,),
+        )
+        row = c.fetchone()
+    except:
+        row = None
+    finally:
+        conn.close()
+    if row is None:
+        return None
+    return {"questions": row[0], "source": row[1], "created_at": row[2]}
+
+def get_usernames():
+    """가입된 사용자 아이디 집합 (일괄 작업에서 대상 학생 확인용)"""
+    conn = sqlite3.connect("users.db")
+    try:
+        return {row[0] for row in conn.execute("SELECT username FROM users")}
+    finally:
+        conn.close()
@@ -0,0 +1,266 @@
+#발표 녹음 일괄 분석 (CLI)
+# batch_audio.py
+"""
+폴더 안의 발표 녹음들을 프로세스 풀로 나눠 분석하고, 파일마다 한 줄씩
+(길이, 침묵 비율, 초기 침묵, 피치 통계, 발화 속도) 결과 표를 CSV 또는 Parquet로 저장한다.
+파일별 시계열(RMS, 센트로이드, 피치)은 --series-dir 아래에 입력 폴더 구조를 그대로 따라 .npz로 저장한다.
+이미 .npz가 있는 파일은 건너뛰므로, 중간에 멈춘 작업은 같은 명령으로 이어서 돌리면 된다
+(--stt 없이 분석한 파일은 --stt로 다시 돌리면 발화 속도를 채우려고 다시 분석한다).
+
+    python batch_audio.py ./rehearsals --output results.csv --workers 8
+    python batch_audio.py ./rehearsals --output results.parquet --stt   # Whisper로 발화 속도까지
+"""
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import soundfile as sf
+
+import warmup  # noqa: F401  (librosa보다 먼저: 워커들이 numba 컴파일 캐시를 공유)
+from speech_utils import compute_speech_rate, transcribe_speech, words_from_transcription, words_to_original
+from stream_utils import analyze_stream, speech_only_wav_from_file
+
+
+AUDIO_EXTENSIONS = (".wav", ".flac", ".ogg", ".mp3")
+
+RESULT_COLUMNS = [
+    "file",
+    "status",
+    "duration_sec",
+    "silence_ratio",
+    "initial_silence_sec",
+    "pitch_median_hz",
+    "pitch_mean_hz",
+    "pitch_std_hz",
+    "pitch_p5_hz",
+    "pitch_p95_hz",
+    "voiced_ratio",
+    "speech_rate_spm",
+    "articulation_rate_spm",
+    "pause_count",
+    "analyze_sec",
+    "series_file",
+    "error",
+]
+
+# 워커 프로세스마다 하나씩 만드는 OpenAI 클라이언트 (--stt일 때만)
+_client = None
+
+
+def collect_audio_files(path: str) -> list:
+    """폴더(하위 폴더 포함)의 녹음 파일을 [(상대 경로, 절대 경로)]로 모은다."""
+    files = []
+    for root, _, names in os.walk(path):
+        for name in names:
+            if name.lower().endswith(AUDIO_EXTENSIONS) and not name.startswith("."):
+                full = os.path.join(root, name)
+                files.append((os.path.relpath(full, path), full))
+    return sorted(files)
+
+
+def series_path(series_dir: str, rel: str) -> str:
+    """녹음의 상대 경로를 그대로 따르는 시계열 파일 경로 (하위 폴더끼리 이름이 겹치지 않는다)."""
+    return os.path.join(series_dir, rel + ".npz")
+
+
+def _source_stamp(path: str) -> str:
+    st = os.stat(path)
+    return f"{st.st_size}:{int(st.st_mtime)}"
+
+
+def load_completed(npz_path: str, path: str, with_stt: bool = False):
+    """
+    이전 실행의 결과 행을 읽는다. 시계열 파일이 없거나, 그 뒤에 녹음 파일이
+    바뀌었거나(크기/수정 시각), with_stt인데 이전 실행이 전사 없이 분석했으면
+    None을 반환해 다시 분석하게 한다.
+    """
+    if not os.path.exists(npz_path):
+        return None
+    try:
+        with np.load(npz_path, allow_pickle=False) as data:
+            if str(data["source_stamp"]) != _source_stamp(path):
+                return None
+            if with_stt and not ("with_stt" in data.files and bool(data["with_stt"])):
+                return None
+            return json.loads(str(data["summary"]))
+    except Exception:
+        return None
+
+
+def _init_worker(with_stt: bool):
+    global _client
+    if with_stt:
+        from ai_client import get_client
+
+        _client = get_client()
+
+
+def _pitch_stats(pitch) -> dict:
+    f0 = pitch.f0[pitch.voiced]
+    if f0.size == 0:
+        return dict.fromkeys(
+            ["pitch_median_hz", "pitch_mean_hz", "pitch_std_hz", "pitch_p5_hz", "pitch_p95_hz"]
+        ) | {"voiced_ratio": 0.0}
+    p5, p95 = np.percentile(f0, [5, 95])
+    return {
+        "pitch_median_hz": round(float(np.median(f0)), 1),
+        "pitch_mean_hz": round(float(np.mean(f0)), 1),
+        "pitch_std_hz": round(float(np.std(f0)), 1),
+        "pitch_p5_hz": round(float(p5), 1),
+        "pitch_p95_hz": round(float(p95), 1),
+        "voiced_ratio": round(float(np.mean(pitch.voiced)), 4),
+    }
+
+
+def _analyze_file(rel: str, path: str, npz_path: str) -> dict:
+    """
+    (워커 프로세스) 녹음 하나를 블록 단위로 디코드하며 분석하고,
+    시계열과 결과 행을 .npz 하나에 원자적으로 저장한다 (이 파일이 완료 표시다).
+    """
+    start = time.perf_counter()
+    feats, pitch = analyze_stream(path)
+    row = {
+        "file": rel,
+        "status": "ok",
+        "duration_sec": round(feats.total_dur, 2),
+        "silence_ratio": round(feats.silence_ratio, 4),
+        "initial_silence_sec": round(feats.init_silence, 2),
+        **_pitch_stats(pitch),
+        "speech_rate_spm": None,
+        "articulation_rate_spm": None,
+        "pause_count": None,
+        "series_file": rel + ".npz",
+        "error": "",
+    }
+
+    if _client is not None and len(feats.segments):
+        sr = sf.info(path).samplerate
+        transcription = transcribe_speech(_client, speech_only_wav_from_file(path, feats.segments))
+        words = words_to_original(words_from_transcription(transcription), feats.segments, sr)
+        rate = compute_speech_rate(words, feats.intervals, sr)
+        row["speech_rate_spm"] = round(rate.speech_rate_spm, 1)
+        row["articulation_rate_spm"] = round(rate.articulation_rate_spm, 1)
+        row["pause_count"] = rate.pause_count
+    row["analyze_sec"] = round(time.perf_counter() - start, 2)
+
+    os.makedirs(os.path.dirname(npz_path), exist_ok=True)
+    tmp_path = npz_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        np.savez_compressed(
+            f,
+            times=feats.times,
+            rms=feats.rms,
+            cent=feats.cent,
+            pitch_times=pitch.times,
+            f0=pitch.f0,
+            intervals=feats.intervals,
+            summary=json.dumps(row, ensure_ascii=False),
+            source_stamp=_source_stamp(path),
+            with_stt=_client is not None,
+        )
+    os.replace(tmp_path, npz_path)
+    return row
+
+
+def run_batch(files, series_dir: str, workers: int = None, with_stt: bool = False, force: bool = False, on_progress=None) -> list:
+    """
+    완료되지 않은 파일만 프로세스 풀로 분석한다. 파일끼리 공유하는 것이 없어
+    처리량은 워커 수에 거의 비례한다. 결과 행 리스트(이전 실행분 포함)를 반환하고,
+    on_progress(완료 수, 전체 수, 행, 건너뜀 여부)를 호출한다.
+    """
+    os.makedirs(series_dir, exist_ok=True)
+    total = len(files)
+    rows = []
+    pending = []
+    for rel, path in files:
+        npz_path = series_path(series_dir, rel)
+        row = None if force else load_completed(npz_path, path, with_stt)
+        if row is not None:
+            rows.append(row)
+            if on_progress:
+                on_progress(len(rows), total, row, True)
+        else:
+            pending.append((rel, path, npz_path))
+
+    if pending:
+        with ProcessPoolExecutor(
+            max_workers=workers or os.cpu_count() or 1,
+            initializer=_init_worker,
+            initargs=(with_stt,),
+        ) as pool:
+            futures = {pool.submit(_analyze_file, *job): job[0] for job in pending}
+            for future in as_completed(futures):
+                try:
+                    row = future.result()
+                except Exception as e:
+                    # 완료 표시(.npz)를 남기지 않으므로 다음 실행에서 다시 시도한다
+                    row = dict.fromkeys(RESULT_COLUMNS) | {
+                        "file": futures[future],
+                        "status": "error",
+                        "error": str(e),
+                    }
+                rows.append(row)
+                if on_progress:
+                    on_progress(len(rows), total, row, False)
+
+    return sorted(rows, key=lambda r: r["file"])
+
+
+def write_results(rows, output: str) -> str:
+    """
+    확장자에 따라 CSV 또는 Parquet으로 저장하고 실제로 저장한 경로를 반환한다.
+    Parquet에 필요한 pyarrow가 없으면 같은 이름의 .csv로 대신 저장한다.
+    """
+    import pandas as pd
+
+    df = pd.DataFrame(rows, columns=RESULT_COLUMNS)
+    if output.lower().endswith(".parquet"):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            output = os.path.splitext(output)[0] + ".csv"
+            print(f"pyarrow가 설치되어 있지 않아 Parquet 대신 CSV로 저장합니다: {output} (pip install pyarrow)")
+        else:
+            df.to_parquet(output, index=False)
+            return output
+    df.to_csv(output, index=False, encoding="utf-8-sig")
+    return output
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", help="녹음 파일이 들어 있는 폴더")
+    parser.add_argument("--output", default="audio_results.csv", help="결과 표 (.csv 또는 .parquet)")
+    parser.add_argument("--series-dir", default=None, help="파일별 시계열 .npz 폴더 (기본: <output>_series)")
+    parser.add_argument("--workers", type=int, default=None, help="분석 프로세스 수 (기본: CPU 코어 수)")
+    parser.add_argument("--stt", action="store_true", help="Whisper로 전사해 발화 속도까지 계산")
+    parser.add_argument("--force", action="store_true", help="완료된 파일도 다시 분석")
+    args = parser.parse_args()
+
+    series_dir = args.series_dir or os.path.splitext(args.output)[0] + "_series"
+    files = collect_audio_files(args.path)
+    print(f"{len(files)}개의 녹음을 처리합니다.")
+
+    def on_progress(done, total, row, skipped):
+        mark = "-" if skipped else ("✓" if row["status"] == "ok" else "✗")
+        print(f"[{done}/{total}] {mark} {row['file']} {row.get('error') or ''}")
+
+    start = time.perf_counter()
+    rows = run_batch(
+        files,
+        series_dir,
+        workers=args.workers,
+        with_stt=args.stt,
+        force=args.force,
+        on_progress=on_progress,
+    )
+    output = write_results(rows, args.output)
+    ok = sum(1 for r in rows if r["status"] == "ok")
+    print(f"완료: {ok}/{len(rows)}개, {time.perf_counter() - start:.1f}초 → {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+#생기부 PDF 일괄 면접 질문 생성 (관리자 대시보드 / CLI 공용)
+# batch_questions.py
+"""
+폴더 또는 zip 안의 생기부 PDF들로 학생별 면접 질문 세트를 한 번에 만들어 저장한다.
+파일 이름(확장자 제외)을 학생 아이디로 사용한다. 예: hong123.pdf → hong123
+
+    python batch_questions.py ./records.zip --workers 8 --concurrency 8
+"""
+import argparse
+import os
+import threading
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+import pdf_utils
+from auth import get_usernames, init_db, save_question_set
+from question_utils import record_text_from_pdf, generate_questions
+
+
+# OpenAI 동시 호출 수 상한
+LLM_CONCURRENCY = 8
+
+
+def collect_pdf_sources(path: str) -> list:
+    """
+    폴더(하위 폴더 포함) 또는 zip 파일에서 PDF 목록을 모은다.
+    [(학생 아이디, 소스)]를 반환하며, 소스는 파일 경로 또는 (zip 경로, 내부 이름) 튜플이다.
+    PDF 내용은 워커가 필요할 때 읽으므로 여기서는 메모리에 올리지 않는다.
+    """
+    sources = []
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as zf:
+            for name in zf.namelist():
+                base = os.path.basename(name)
+                if base.lower().endswith(".pdf") and not base.startswith("."):
+                    sources.append((os.path.splitext(base)[0], (path, name)))
+    else:
+        for root, _, files in os.walk(path):
+            for name in files:
+                if name.lower().endswith(".pdf"):
+                    sources.append((os.path.splitext(name)[0], os.path.join(root, name)))
+    return sorted(sources)
+
+
+def source_label(source) -> str:
+    """소스를 사람이 읽을 수 있는 경로로 (zip 안의 파일은 "zip경로:내부 이름")."""
+    if isinstance(source, tuple):
+        return f"{source[0]}:{source[1]}"
+    return source
+
+
+def check_sources(sources, known_users) -> tuple:
+    """
+    저장하기 전에 걸러야 할 소스를 찾는다.
+    - 파일 이름(학생 아이디)이 겹치는 PDF: 서로 덮어쓰게 되므로 모두 제외
+    - 가입되지 않은 아이디: 저장해도 학생이 볼 수 없으므로 제외
+    (처리할 소스 리스트, 학생 아이디별 오류 결과 dict 리스트)를 반환한다.
+    """
+    by_id = {}
+    for student_id, source in sources:
+        by_id.setdefault(student_id, []).append(source)
+
+    valid, errors = [], []
+    for student_id, group in by_id.items():
+        if len(group) > 1:
+            paths = ", ".join(source_label(src) for src in group)
+            error = f"같은 아이디의 PDF가 {len(group)}개 있습니다: {paths}"
+        elif student_id not in known_users:
+            error = f"가입되지 않은 아이디입니다: {source_label(group[0])}"
+        else:
+            valid.append((student_id, group[0]))
+            continue
+        errors.extend(
+            {
+                "student_id": student_id,
+                "status": "error",
+                "questions": 0,
+                "extract_sec": 0.0,
+                "generate_sec": 0.0,
+                "error": error,
+            }
+            for _ in group
+        )
+    return valid, errors
+
+
+def _read_source(source) -> bytes:
+    if isinstance(source, tuple):
+        zip_path, member = source
+        with zipfile.ZipFile(zip_path) as zf:
+            return zf.read(member)
+    with open(source, "rb") as f:
+        return f.read()
+
+
+def _init_extract_worker():
+    # 문서 단위로 이미 병렬이므로, 문서 안의 OCR은 워커 안에서 순차로 돌린다
+    pdf_utils.OCR_WORKERS = 1
+    # fork로 띄운 워커는 부모(Streamlit)가 이미 만든 OCR 풀과 잠금 상태를 물려받는다.
+    # 그 풀은 관리 스레드가 없어 작업이 끝나지 않으므로 버리고 워커 안에서 새로 만든다.
+    pdf_utils._ocr_pool = None
+    pdf_utils._ocr_pool_lock = threading.Lock()
+
+
+def _extract_record(source) -> tuple:
+    """(워커 프로세스) PDF를 읽어 질문 생성용 생기부 내용을 만든다."""
+    start = time.perf_counter()
+    text = record_text_from_pdf(_read_source(source))
+    return text, time.perf_counter() - start
+
+
+def run_batch(
+    sources,
+    client,
+    workers: int = None,
+    concurrency: int = LLM_CONCURRENCY,
+    on_progress=None,
+    known_users=None,
+) -> list:
+    """
+    텍스트 추출은 프로세스 풀에서, 질문 생성은 최대 concurrency개의 동시 호출로 진행한다.
+    추출이 끝난 문서부터 바로 질문 생성으로 넘기므로, 전체 소요 시간은
+    모든 문서의 합이 아니라 가장 오래 걸리는 문서에 가까워진다.
+    아이디가 겹치거나 가입되지 않은 PDF는 처리하지 않고 오류 결과로 남긴다
+    (known_users를 주지 않으면 DB의 사용자 목록을 쓴다).
+    학생별 결과 dict 리스트를 반환하고, on_progress(완료 수, 전체 수, 결과)를 호출한다.
+    """
+    total = len(sources)
+    results = []
+    if total == 0:
+        return results
+
+    if known_users is None:
+        known_users = get_usernames()
+    sources, errors = check_sources(sources, known_users)
+    for result in errors:
+        results.append(result)
+        if on_progress:
+            on_progress(len(results), total, result)
+    if not sources:
+        return sorted(results, key=lambda r: r["student_id"])
+
+    def generate(student_id, text, extract_sec):
+        result = {
+            "student_id": student_id,
+            "status": "ok",
+            "questions": 0,
+            "extract_sec": round(extract_sec, 2),
+            "generate_sec": 0.0,
+            "error": "",
+        }
+        if len(text) <= 50:
+            result["status"] = "error"
+            result["error"] = "텍스트 인식 실패"
+            return result
+        start = time.perf_counter()
+        q_text, q_list = generate_questions(client, text)
+        result["generate_sec"] = round(time.perf_counter() - start, 2)
+        result["questions"] = len(q_list)
+        if not save_question_set(student_id, q_text, source="batch"):
+            result["status"] = "error"
+            result["error"] = "저장 실패"
+        return result
+
+    with ProcessPoolExecutor(
+        max_workers=workers or os.cpu_count() or 1,
+        initializer=_init_extract_worker,
+    ) as extract_pool, ThreadPoolExecutor(max_workers=concurrency) as llm_pool:
+        extract_futures = {
+            extract_pool.submit(_extract_record, source): student_id
+            for student_id, source in sources
+        }
+        llm_futures = {}
+        for future in as_completed(extract_futures):
+            student_id = extract_futures[future]
+            try:
+                text, extract_sec = future.result()
+            except Exception as e:
+                results.append(
+                    {
+                        "student_id": student_id,
+                        "status": "error",
+                        "questions": 0,
+                        "extract_sec": 0.0,
+                        "generate_sec": 0.0,
+                        "error": f"추출 오류: {e}",
+                    }
+                )
+                if on_progress:
+                    on_progress(len(results), total, results[-1])
+                continue
+            llm_futures[llm_pool.submit(generate, student_id, text, extract_sec)] = student_id
+
+        for future in as_completed(llm_futures):
+            try:
+                result = future.result()
+            except Exception as e:
+                result = {
+                    "student_id": llm_futures[future],
+                    "status": "error",
+                    "questions": 0,
+                    "extract_sec": 0.0,
+                    "generate_sec": 0.0,
+                    "error": f"질문 생성 오류: {e}",
+                }
+            results.append(result)
+            if on_progress:
+                on_progress(len(results), total, result)
+
+    return sorted(results, key=lambda r: r["student_id"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", help="생기부 PDF가 들어 있는 폴더 또는 zip 파일")
+    parser.add_argument("--workers", type=int, default=None, help="텍스트 추출 프로세스 수 (기본: CPU 코어 수)")
+    parser.add_argument("--concurrency", type=int, default=LLM_CONCURRENCY, help="OpenAI 동시 호출 수")
+    args = parser.parse_args()
+
+    from ai_client import get_client
+
+    init_db()
+    sources = collect_pdf_sources(args.path)
+    print(f"{len(sources)}개의 PDF를 처리합니다.")
+
+    def on_progress(done, total, result):
+        mark = "✓" if result["status"] == "ok" else "✗"
+        print(f"[{done}/{total}] {mark} {result['student_id']} {result['questions']}문항 {result['error']}")
+
+    start = time.perf_counter()
+    results = run_batch(
+        sources,
+        get_client(),
+        workers=args.workers,
+        concurrency=args.concurrency,
+        on_progress=on_progress,
+    )
+    ok = sum(1 for r in results if r["status"] == "ok")
+    print(f"완료: {ok}/{len(results)}명, {time.perf_counter() - start:.1f}초")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,2 @@
+# benchmarks/__init__.py
+# 벤치마크 스크립트 모음 (python -m benchmarks.<이름> 으로 실행)
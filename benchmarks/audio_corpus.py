@@ -0,0 +1,87 @@
+#벤치마크용 음성/대본 코퍼스 생성기
+# benchmarks/audio_corpus.py
+"""
+네트워크나 녹음 파일 없이 발표 녹음과 비슷한 신호, 대본/전사 쌍을 만든다.
+- speech_like: 피치가 움직이는 배음 + 모음 포먼트 + 음절 리듬(4~5Hz) + 문장 사이 쉼 + 잡음 바닥
+- script_pair: 대본과, 단어 일부를 바꾸거나 빼고 넣은 "전사" 텍스트
+"""
+import io
+import random
+
+import numpy as np
+import soundfile as sf
+
+
+WORDS_KO = [
+    "안녕하세요", "오늘", "발표할", "주제는", "인공지능의", "윤리적", "쟁점입니다",
+    "먼저", "데이터", "편향", "문제를", "살펴보고", "다음으로", "책임의", "소재를",
+    "이야기하겠습니다", "예를", "들어", "자율주행", "자동차가", "사고를", "냈을", "때",
+    "누가", "책임을", "져야", "할까요", "결론적으로", "기술과", "제도가", "함께",
+    "발전해야", "합니다", "감사합니다",
+]
+
+
+def speech_like(duration: float, sr: int, seed: int = 0):
+    """발화 80% / 쉼 20% 정도의 말소리 비슷한 float32 모노 신호."""
+    rng = np.random.default_rng(seed)
+    n = int(duration * sr)
+    t = np.arange(n) / sr
+
+    # 문장(2~6초) 단위 발화와 0.3~1.2초 쉼
+    gate = np.zeros(n, dtype=np.float32)
+    pos = int(rng.uniform(0.2, 0.8) * sr)
+    while pos < n:
+        length = int(rng.uniform(2.0, 6.0) * sr)
+        gate[pos:pos + length] = 1.0
+        pos += length + int(rng.uniform(0.3, 1.2) * sr)
+
+    # 천천히 움직이는 기본 주파수 (100~250Hz)
+    f0 = 160 + 50 * np.sin(2 * np.pi * 0.2 * t + rng.uniform(0, 6)) + 20 * np.sin(2 * np.pi * 1.3 * t)
+    phase = 2 * np.pi * np.cumsum(f0) / sr
+    source = np.zeros(n)
+    for k in range(1, 25):
+        if 160 * k > min(sr / 2 - 500, 4000):
+            break
+        # 모음 포먼트(700Hz, 1200Hz 근처)를 흉내 낸 배음 가중치
+        weight = 1 / k + 0.8 * np.exp(-((160 * k - 700) / 250) ** 2) + 0.5 * np.exp(-((160 * k - 1200) / 300) ** 2)
+        source += weight * np.sin(k * phase)
+
+    # 음절 리듬 (4~5Hz 진폭 변조)
+    syllable = 0.55 + 0.45 * np.sin(2 * np.pi * 4.5 * t + rng.uniform(0, 6)) ** 2
+    y = 0.08 * source / np.max(np.abs(source)) * syllable * gate
+    y += 0.002 * rng.standard_normal(n)
+    return y.astype(np.float32)
+
+
+def speech_wav_bytes(duration: float, sr: int, seed: int = 0) -> bytes:
+    """speech_like 신호를 16비트 WAV 바이트로 (브라우저 녹음 업로드와 같은 형태)."""
+    buf = io.BytesIO()
+    sf.write(buf, speech_like(duration, sr, seed), sr, format="WAV", subtype="PCM_16")
+    return buf.getvalue()
+
+
+def script_pair(n_chars: int, edit_rate: float = 0.1, seed: int = 0):
+    """
+    대략 n_chars 글자의 대본과, 단어의 edit_rate 비율을 바꾸거나 빼고 넣은 전사 텍스트.
+    (STT 오인식, 애드리브, 생략을 흉내 낸다)
+    """
+    rng = random.Random(seed)
+    words = []
+    length = 0
+    while length < n_chars:
+        word = rng.choice(WORDS_KO)
+        words.append(word)
+        length += len(word) + 1
+
+    transcript = []
+    for word in words:
+        r = rng.random()
+        if r < edit_rate / 3:
+            continue
+        if r < edit_rate * 2 / 3:
+            transcript.append(rng.choice(WORDS_KO))
+        elif r < edit_rate:
+            transcript.extend([word, rng.choice(["음", "어", "그"])])
+        else:
+            transcript.append(word)
+    return " ".join(words), " ".join(transcript)
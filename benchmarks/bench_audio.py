@@ -0,0 +1,201 @@
+#음성 분석(DSP) & 대본 유사도 벤치마크, 성능 예산 검사
+# benchmarks/bench_audio.py
+"""
+합성 음성 신호(여러 길이/샘플링레이트)와 대본/전사 쌍(여러 크기)으로
+발표 분석 경로의 단계별 시간과 최대 메모리(tracemalloc)를 잰다.
+단계가 예산을 넘거나 저장된 기준선보다 나빠지면 exit 1. 오프라인 CPU 환경에서 동작한다(OpenAI 호출 없음).
+
+    python -m benchmarks.bench_audio                  # 측정 → 예산/기준선 검사
+    python -m benchmarks.bench_audio --quick
+    python -m benchmarks.bench_audio --save-baseline  # 현재 결과를 기준선으로 저장
+    python -m benchmarks.bench_audio --allow-missing-baseline  # 기준선이 없으면 예산만 검사
+
+기준선(benchmarks/baselines/audio_dsp.json)이 없으면 기본적으로 exit 1이다.
+"""
+import argparse
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from benchmarks import harness
+from benchmarks.audio_corpus import script_pair, speech_wav_bytes
+
+
+# (원본 샘플링레이트, 길이 초)
+AUDIO_CASES = [(16000, 10), (16000, 60), (22050, 60), (48000, 60), (48000, 300)]
+QUICK_AUDIO_CASES = [(16000, 10), (48000, 60)]
+# 대본 글자 수
+TEXT_SIZES = [500, 3000, 10000]
+QUICK_TEXT_SIZES = [500, 3000]
+
+# 오디오 단계 예산: 녹음 1초당 처리 시간(초). 텍스트 단계 예산: 케이스당 초
+# 측정한 최댓값(기준선)의 3~5배 정도로, 느린 CI 머신은 견디고 알고리즘 회귀는 잡는다
+AUDIO_BUDGETS = {
+    "decode": 0.0015,
+    "detect_speech": 0.0005,
+    "extract_features": 0.005,
+    "track_pitch": 0.01,
+    "speech_only_wav": 0.0005,
+    "speech_rate": 0.0002,
+    "stream_analyze": 0.02,
+    "decimate": 0.0005,
+}
+TEXT_BUDGETS = {500: 0.01, 3000: 0.05, 10000: 0.15}
+# 짧은 녹음에서 고정 비용(다운샘플링 등)과 측정 잡음을 흡수하는 최소 예산 (초)
+AUDIO_BUDGET_FLOOR_SEC = 0.1
+
+# 지표별 (좋은 방향, 허용 변화율)
+RULES = {
+    "seconds": ("lower", 0.5),
+    "peak_mb": ("lower", 0.25),
+}
+# 이보다 작은 절대 변화는 회귀로 보지 않는다 (수 ms짜리 단계의 스케줄링 잡음)
+NOISE_FLOOR = {"seconds": 0.05, "peak_mb": 1.0}
+BASELINE_NAME = "audio_dsp"
+
+
+def measure(fn, repeat: int):
+    """fn을 repeat번 돌린 최소 시간과, 한 번 돌릴 때 새로 할당한 최대 메모리(MB)."""
+    tracemalloc.start()
+    result = fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return result, best, peak / (1024 * 1024)
+
+
+def warm_up():
+    """numba JIT, FFT 계획 등 첫 호출 비용을 측정에서 뺀다."""
+    run_audio_case(16000, 2, repeat=1)
+    run_text_case(200, repeat=1)
+
+
+def run_audio_case(sr: int, duration: float, repeat: int) -> dict:
+    from analysis_utils import detect_speech, extract_features, speech_only_wav, track_pitch
+    from audio_io import load_audio
+    from plot_utils import decimate
+    from speech_utils import Word, compute_speech_rate
+    from stream_utils import analyze_stream
+
+    wav = speech_wav_bytes(duration, sr)
+    ctx = {}
+    results = {}
+
+    def record(stage, fn):
+        ctx[stage], seconds, peak_mb = measure(fn, repeat)
+        results[f"{stage}-{sr // 1000}k-{duration}s"] = {
+            "stage": stage,
+            "seconds": seconds,
+            "rtf": seconds / duration,
+            "peak_mb": peak_mb,
+            "budget_sec": max(AUDIO_BUDGETS[stage] * duration, AUDIO_BUDGET_FLOOR_SEC),
+        }
+
+    record("decode", lambda: load_audio(wav))
+    y, asr = ctx["decode"]
+    record("detect_speech", lambda: detect_speech(y, asr))
+    speech = ctx["detect_speech"]
+    record("extract_features", lambda: extract_features(y, asr, speech=speech))
+    feats = ctx["extract_features"]
+    record("track_pitch", lambda: track_pitch(y, asr, feats.intervals))
+    record("speech_only_wav", lambda: speech_only_wav(y, asr, feats.segments))
+
+    # 초당 4음절 정도의 단어 타임스탬프
+    words = [Word("발표", t, t + 0.4) for t in np.arange(0.0, duration - 0.5, 0.5)]
+    record("speech_rate", lambda: compute_speech_rate(words, feats.intervals, asr))
+
+    with tempfile.NamedTemporaryFile(suffix=".wav") as f:
+        f.write(wav)
+        f.flush()
+        record("stream_analyze", lambda: analyze_stream(f.name))
+
+    pitch = ctx["track_pitch"]
+    record("decimate", lambda: (decimate(feats.times, feats.rms), decimate(pitch.times, pitch.f0)))
+    return results
+
+
+def run_text_case(n_chars: int, repeat: int) -> dict:
+    from analysis_utils import calculate_similarity
+
+    script, transcript = script_pair(n_chars)
+    score, seconds, peak_mb = measure(lambda: calculate_similarity(script, transcript), repeat)
+    return {
+        f"similarity-{n_chars}c": {
+            "stage": "similarity",
+            "seconds": seconds,
+            "peak_mb": peak_mb,
+            "score": score,
+            "budget_sec": TEXT_BUDGETS.get(n_chars, max(TEXT_BUDGETS.values())),
+        }
+    }
+
+
+def check_budgets(results: dict) -> list:
+    return [
+        f"{case}: {m['seconds']:.3f}s > 예산 {m['budget_sec']:.3f}s"
+        for case, m in results.items()
+        if m["seconds"] > m["budget_sec"]
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--quick", action="store_true", help="작은 케이스만 실행")
+    parser.add_argument("--repeat", type=int, default=5, help="단계별 반복 횟수 (최소 시간 사용)")
+    parser.add_argument("--save-baseline", action="store_true", help="결과를 기준선으로 저장")
+    parser.add_argument("--tolerance", type=float, default=None, help="모든 지표의 허용 변화율을 덮어쓴다 (예: 0.1)")
+    parser.add_argument(
+        "--allow-missing-baseline",
+        action="store_true",
+        help="기준선이 없으면 회귀 검사 없이 예산만 검사한다",
+    )
+    args = parser.parse_args()
+
+    warm_up()
+    results = {}
+    for sr, duration in QUICK_AUDIO_CASES if args.quick else AUDIO_CASES:
+        results.update(run_audio_case(sr, duration, args.repeat))
+        print(f"  audio {sr}Hz {duration}s", file=sys.stderr)
+    for n_chars in QUICK_TEXT_SIZES if args.quick else TEXT_SIZES:
+        results.update(run_text_case(n_chars, args.repeat))
+        print(f"  text {n_chars} chars", file=sys.stderr)
+
+    harness.print_table(results, ["seconds", "budget_sec", "peak_mb"])
+
+    if args.save_baseline:
+        harness.save_baseline(BASELINE_NAME, results)
+        print(f"기준선 저장: {harness.baseline_path(BASELINE_NAME)}")
+        return
+
+    failures = check_budgets(results)
+    baseline = harness.load_baseline(BASELINE_NAME)
+    if baseline:
+        rules = RULES
+        if args.tolerance is not None:
+            rules = {k: (better, args.tolerance) for k, (better, _) in RULES.items()}
+        failures += harness.compare_to_baseline(results, baseline, rules, NOISE_FLOOR)
+    else:
+        print(f"저장된 기준선이 없습니다: {harness.baseline_path(BASELINE_NAME)}")
+        if args.allow_missing_baseline:
+            print("--allow-missing-baseline: 예산만 검사합니다.")
+        else:
+            failures.append("기준선 없음 (--save-baseline으로 기준선을 만들어 커밋해 주세요)")
+
+    if failures:
+        print("\n성능 예산 초과 / 회귀 발견:")
+        for line in failures:
+            print(f"  - {line}")
+        sys.exit(1)
+    print("\n예산 초과/회귀 없음.")
+
+
+if __name__ == "__main__":
+    main()
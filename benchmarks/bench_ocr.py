@@ -0,0 +1,89 @@
+#OCR 백엔드 벤치마크
+# benchmarks/bench_ocr.py
+"""
+같은 페이지 이미지들을 pytesseract(페이지마다 프로세스 실행)와
+tesserocr(프로세스 안에서 엔진 재사용)로 OCR해서 페이지당 시간을 비교한다.
+pdf_utils가 실제로 부르는 recognize(텍스트 + 단어 신뢰도)를 잰다.
+
+    python -m benchmarks.bench_ocr --pages 10
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+import pdf_utils
+from benchmarks import harness
+from benchmarks.pdf_corpus import find_korean_font, make_page_lines, render_page_image
+
+
+def time_backend(backend, paths):
+    """실제 OCR 경로와 같은 recognize(텍스트 + 단어 신뢰도)로 페이지별 시간을 잰다."""
+    timings = []
+    chars = 0
+    for path in paths:
+        start = time.perf_counter()
+        text, _ = backend.recognize(path)
+        chars += len(text.strip())
+        timings.append(time.perf_counter() - start)
+    return timings, chars
+
+
+def positive_int(value: str) -> int:
+    n = int(value)
+    if n < 1:
+        raise argparse.ArgumentTypeError("1 이상이어야 합니다")
+    return n
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=positive_int, default=10, help="측정할 페이지 수 (1 이상)")
+    args = parser.parse_args()
+
+    harness.require_tesseract()
+    font_path = find_korean_font()
+    lang = "ko" if font_path else "en"
+    rng = random.Random(0)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        paths = []
+        for i in range(args.pages):
+            path = os.path.join(workdir, f"page_{i + 1:03d}.png")
+            render_page_image(make_page_lines(lang, i + 1, rng), font_path).save(path)
+            paths.append(path)
+
+        results = {}
+        backends = [("pytesseract", pdf_utils.PytesseractBackend)]
+        if pdf_utils.tesserocr is not None:
+            backends.append(("tesserocr", pdf_utils.TesserocrBackend))
+        else:
+            print("tesserocr가 설치되어 있지 않아 pytesseract만 측정합니다.")
+
+        for name, cls in backends:
+            start = time.perf_counter()
+            backend = cls()
+            init_sec = time.perf_counter() - start
+            timings, chars = time_backend(backend, paths)
+            if chars == 0:
+                print(f"{name}: OCR 결과가 비어 있습니다. 언어 데이터({pdf_utils.OCR_LANG})를 확인하세요.", file=sys.stderr)
+                sys.exit(1)
+            per_page = sum(timings) / len(timings)
+            results[name] = per_page
+            print(
+                f"{name:12s} init {init_sec * 1000:7.1f} ms | "
+                f"{per_page * 1000:7.1f} ms/page | {chars} chars"
+            )
+
+    if "tesserocr" in results:
+        saved = results["pytesseract"] - results["tesserocr"]
+        print(
+            f"tesserocr saves {saved * 1000:.1f} ms/page "
+            f"({saved / results['pytesseract'] * 100:.0f}%)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+#PDF 추출 벤치마크 & 회귀 검사
+# benchmarks/bench_pdf.py
+"""
+생성한 PDF 코퍼스(텍스트 레이어 / 스캔 / 혼합, 여러 페이지 수, 한글/영문)로
+pdf_utils의 추출 경로별 처리량(pages/s), 최대 RSS, 복원 글자 수와 복원율을 잰다.
+각 케이스는 새 프로세스에서 캐시 없이 실행한다. 오프라인 CPU 환경에서 동작한다.
+
+    python -m benchmarks.bench_pdf                  # 측정 후 기준선과 비교 (회귀 시 exit 1)
+    python -m benchmarks.bench_pdf --save-baseline  # 현재 결과를 기준선으로 저장
+    python -m benchmarks.bench_pdf --allow-missing-baseline  # 기준선이 없으면 검사 생략 (exit 0)
+
+기준선(benchmarks/baselines/pdf_extract.json)이 없으면 기본적으로 exit 1이다.
+스캔/혼합 케이스가 있는데 tesseract가 없거나, OCR 케이스의 추출 글자가 0이면 실패로 본다.
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from benchmarks import harness
+from benchmarks.pdf_corpus import build_pdf
+
+
+# (종류, 언어, 페이지 수)
+CASES = [
+    ("text", "ko", 1),
+    ("text", "ko", 10),
+    ("text", "en", 10),
+    ("text", "ko", 40),
+    ("scan", "ko", 1),
+    ("scan", "ko", 5),
+    ("scan", "en", 5),
+    ("scan", "ko", 15),
+    ("mixed", "ko", 9),
+    ("mixed", "en", 9),
+]
+QUICK_CASES = [("text", "ko", 10), ("scan", "ko", 3), ("mixed", "ko", 6)]
+
+# 지표별 (좋은 방향, 허용 변화율)
+RULES = {
+    "pages_per_sec": ("higher", 0.25),
+    "peak_rss_mb": ("lower", 0.25),
+    "char_recall": ("higher", 0.05),
+}
+BASELINE_NAME = "pdf_extract"
+
+
+def char_recall(truth: str, extracted: str) -> float:
+    """정답 텍스트의 공백 아닌 글자 중 추출 결과에 (개수 기준으로) 들어 있는 비율."""
+    want = Counter(ch for ch in truth if not ch.isspace())
+    got = Counter(ch for ch in extracted if not ch.isspace())
+    total = sum(want.values())
+    if total == 0:
+        return 1.0
+    return sum(min(n, got[ch]) for ch, n in want.items()) / total
+
+
+def _run_case(pdf_path: str) -> dict:
+    """(새 프로세스) 캐시를 거치지 않고 한 번 추출하고 시간/메모리를 잰다."""
+    import pdf_utils
+
+    with open(pdf_path, "rb") as f:
+        pdf_bytes = f.read()
+
+    start = time.perf_counter()
+    pages, method, _ = pdf_utils._extract_pages(pdf_bytes)
+    seconds = time.perf_counter() - start
+
+    # OCR 워커를 종료시켜야 자식 프로세스의 최대 RSS가 집계된다
+    if pdf_utils._ocr_pool is not None:
+        pdf_utils._ocr_pool.shutdown(wait=True)
+    return {
+        "seconds": seconds,
+        "pages": len(pages),
+        "method": method,
+        "text": "\n".join(pages),
+        "peak_rss_mb": harness.peak_rss_mb(),
+    }
+
+
+def run_cases(cases) -> dict:
+    results = {}
+    ctx = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as workdir:
+        for kind, lang, page_count in cases:
+            name = f"{kind}-{lang}-{page_count}p"
+            pdf_bytes, truth_pages = build_pdf(kind, lang, page_count)
+            pdf_path = os.path.join(workdir, f"{name}.pdf")
+            with open(pdf_path, "wb") as f:
+                f.write(pdf_bytes)
+
+            with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as runner:
+                run = runner.submit(_run_case, pdf_path).result()
+
+            results[name] = {
+                "method": run["method"],
+                "pages_per_sec": run["pages"] / run["seconds"] if run["seconds"] > 0 else 0.0,
+                "peak_rss_mb": run["peak_rss_mb"],
+                "chars": len(run["text"]),
+                "char_recall": char_recall("\n".join(truth_pages), run["text"]),
+            }
+            print(f"  {name}: {run['seconds']:.2f}s", file=sys.stderr)
+    return results
+
+
+def empty_ocr_cases(results: dict) -> list:
+    """OCR을 거쳐야 하는 케이스(스캔/혼합)인데 글자를 하나도 못 읽은 것."""
+    return [
+        f"{name}: OCR 결과가 비어 있음 (tesseract/언어 데이터 확인)"
+        for name, m in results.items()
+        if not name.startswith("text-") and m["chars"] == 0
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--quick", action="store_true", help="작은 케이스만 실행")
+    parser.add_argument("--save-baseline", action="store_true", help="결과를 기준선으로 저장")
+    parser.add_argument("--tolerance", type=float, default=None, help="모든 지표의 허용 변화율을 덮어쓴다 (예: 0.1)")
+    parser.add_argument(
+        "--allow-missing-baseline",
+        action="store_true",
+        help="기준선이 없으면 회귀 검사를 건너뛰고 성공으로 끝낸다",
+    )
+    args = parser.parse_args()
+
+    cases = QUICK_CASES if args.quick else CASES
+    if any(kind != "text" for kind, _, _ in cases):
+        harness.require_tesseract()
+
+    results = run_cases(cases)
+    harness.print_table(results, ["method", "pages_per_sec", "peak_rss_mb", "chars", "char_recall"])
+
+    failures = empty_ocr_cases(results)
+    if failures:
+        # 빈 결과를 기준선으로 저장하거나 비교하지 않는다
+        print("\nOCR 실패:")
+        for line in failures:
+            print(f"  - {line}")
+        sys.exit(1)
+
+    if args.save_baseline:
+        harness.save_baseline(BASELINE_NAME, results)
+        print(f"기준선 저장: {harness.baseline_path(BASELINE_NAME)}")
+        return
+
+    baseline = harness.load_baseline(BASELINE_NAME)
+    if not baseline:
+        print(f"저장된 기준선이 없습니다: {harness.baseline_path(BASELINE_NAME)}")
+        if args.allow_missing_baseline:
+            print("--allow-missing-baseline: 회귀 검사를 건너뜁니다.")
+            return
+        print("--save-baseline으로 기준선을 만들어 커밋해 주세요.")
+        sys.exit(1)
+
+    rules = RULES
+    if args.tolerance is not None:
+        rules = {k: (better, args.tolerance) for k, (better, _) in RULES.items()}
+    regressions = harness.compare_to_baseline(results, baseline, rules)
+    if regressions:
+        print("\n성능 회귀 발견:")
+        for line in regressions:
+            print(f"  - {line}")
+        sys.exit(1)
+    print("\n기준선 대비 회귀 없음.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#벤치마크 공통 도구 (측정, 기준선 비교)
+# benchmarks/harness.py
+import json
+import os
+import resource
+import sys
+
+
+BASELINE_DIR = os.path.join(os.path.dirname(__file__), "baselines")
+
+
+def peak_rss_mb() -> float:
+    """
+    현재 프로세스와 (이미 종료된) 자식 프로세스 중 가장 큰 최대 RSS를 MB로 반환한다.
+    케이스마다 새 프로세스에서 측정해야 케이스별 값이 된다.
+    """
+    usage = max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    )
+    # 리눅스는 KB, macOS는 바이트 단위
+    return usage / (1024 * 1024) if sys.platform == "darwin" else usage / 1024
+
+
+def require_tesseract():
+    """
+    tesseract 실행 파일이 없으면 OCR 결과가 빈 문자열이 되어 측정이 무의미하므로,
+    조용히 넘어가지 않고 이유를 출력한 뒤 exit 2로 끝낸다.
+    """
+    import pytesseract
+
+    try:
+        return pytesseract.get_tesseract_version()
+    except Exception as e:
+        print(f"tesseract를 실행할 수 없어 OCR 벤치마크를 돌릴 수 없습니다: {e}", file=sys.stderr)
+        sys.exit(2)
+
+
+def baseline_path(name: str) -> str:
+    return os.path.join(BASELINE_DIR, f"{name}.json")
+
+
+def load_baseline(name: str) -> dict:
+    path = baseline_path(name)
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_baseline(name: str, results: dict):
+    os.makedirs(BASELINE_DIR, exist_ok=True)
+    with open(baseline_path(name), "w", encoding="utf-8") as f:
+        json.dump(results, f, ensure_ascii=False, indent=2, sort_keys=True)
+
+
+def compare_to_baseline(results: dict, baseline: dict, rules: dict, noise_floor: dict = None) -> list:
+    """
+    케이스별 지표를 기준선과 비교해 회귀 설명 문자열 리스트를 반환한다.
+    rules는 {지표: ("higher" 또는 "lower", 허용 비율)}로,
+    "higher"는 값이 클수록 좋은 지표(예: 처리량), "lower"는 작을수록 좋은 지표(예: 시간, 메모리)다.
+    noise_floor는 {지표: 절대 변화량}으로, 변화가 이보다 작으면 비율과 상관없이 측정 잡음으로 본다.
+    """
+    noise_floor = noise_floor or {}
+    regressions = []
+    for case, metrics in results.items():
+        base = baseline.get(case)
+        if not base:
+            continue
+        for metric, (better, tolerance) in rules.items():
+            if metric not in metrics or metric not in base:
+                continue
+            now, before = metrics[metric], base[metric]
+            if before == 0:
+                continue
+            if abs(now - before) < noise_floor.get(metric, 0.0):
+                continue
+            change = (now - before) / abs(before)
+            if (better == "higher" and change < -tolerance) or (
+                better == "lower" and change > tolerance
+            ):
+                regressions.append(
+                    f"{case}: {metric} {before:.3g} → {now:.3g} ({change * 100:+.1f}%, 허용 ±{tolerance * 100:.0f}%)"
+                )
+    return regressions
+
+
+def print_table(results: dict, columns):
+    header = f"{'case':28s}" + "".join(f"{c:>16s}" for c in columns)
+    print(header)
+    print("-" * len(header))
+    for case, metrics in results.items():
+        cells = []
+        for c in columns:
+            value = metrics.get(c)
+            if isinstance(value, float):
+                cells.append(f"{value:>16.3f}")
+            else:
+                cells.append(f"{str(value):>16s}")
+        print(f"{case:28s}" + "".join(cells))
@@ -0,0 +1,204 @@
+#벤치마크용 PDF 코퍼스 생성기
+# benchmarks/pdf_corpus.py
+"""
+네트워크나 외부 파일 없이 생기부 형태의 PDF를 만든다.
+- text : 텍스트 레이어만 있는 PDF (한글은 Adobe-Korea1 기본 CID 글꼴, 임베딩 없음)
+- scan : 텍스트를 이미지로 그린 스캔 PDF (텍스트 레이어 없음)
+- mixed: text 페이지 사이에 scan 페이지가 섞인 PDF
+"""
+import io
+import os
+import random
+
+from PIL import Image, ImageDraw, ImageFont
+from PyPDF2 import PdfReader, PdfWriter
+
+
+KOREAN_FONT_CANDIDATES = [
+    "/usr/share/fonts/truetype/nanum/NanumGothic.ttf",
+    "/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc",
+    "/usr/share/fonts/noto-cjk/NotoSansCJK-Regular.ttc",
+]
+
+SECTION_TITLES_KO = [
+    "창의적 체험활동상황",
+    "교과학습발달상황",
+    "세부능력 및 특기사항",
+    "독서활동상황",
+    "행동특성 및 종합의견",
+]
+WORDS_KO = [
+    "학급", "회의를", "주도하며", "탐구", "보고서를", "작성하고", "발표함", "친구들과",
+    "협력하여", "실험을", "설계함", "수학적", "모델링", "과정에서", "문제를", "해결하는",
+    "능력이", "뛰어남", "독서", "토론", "동아리", "활동에", "적극적으로", "참여함",
+    "진로", "탐색", "봉사", "리더십을", "발휘함", "성실하고", "책임감이", "강함",
+]
+SECTION_TITLES_EN = [
+    "Creative Activities",
+    "Academic Achievement",
+    "Subject Notes",
+    "Reading Log",
+    "Behavior and Comments",
+]
+WORDS_EN = [
+    "led", "class", "meetings", "wrote", "a", "research", "report", "and", "presented",
+    "designed", "experiments", "with", "peers", "solved", "problems", "using",
+    "mathematical", "modeling", "joined", "debate", "club", "volunteered", "showed",
+    "leadership", "responsible", "sincere", "curious", "reading", "science", "history",
+]
+
+PAGE_SIZE_PT = (595, 842)  # A4
+SCAN_DPI = 200
+LINES_PER_PAGE = 30
+
+
+def find_korean_font():
+    for path in KOREAN_FONT_CANDIDATES:
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def make_page_lines(lang: str, page_number: int, rng: random.Random) -> list:
+    """한 페이지 분량의 생기부 비슷한 줄들 (첫 줄은 섹션 제목)."""
+    titles = SECTION_TITLES_KO if lang == "ko" else SECTION_TITLES_EN
+    words = WORDS_KO if lang == "ko" else WORDS_EN
+    lines = [f"{page_number}. {titles[(page_number - 1) % len(titles)]}"]
+    for _ in range(LINES_PER_PAGE - 1):
+        lines.append(" ".join(rng.choice(words) for _ in range(rng.randint(5, 8))))
+    return lines
+
+
+def _escape_pdf_string(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def text_layer_pdf(pages_lines) -> bytes:
+    """
+    줄 리스트들로 텍스트 레이어만 있는 PDF를 직접 작성한다.
+    ASCII 줄은 Helvetica, 그 외 줄은 HYSMyeongJo-Medium(UniKS-UCS2-H)으로 쓴다.
+    """
+    objects = []
+
+    def add(body: bytes) -> int:
+        objects.append(body)
+        return len(objects)
+
+    font_en = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    cid_font = add(
+        b"<< /Type /Font /Subtype /CIDFontType0 /BaseFont /HYSMyeongJo-Medium "
+        b"/CIDSystemInfo << /Registry (Adobe) /Ordering (Korea1) /Supplement 1 >> "
+        b"/FontDescriptor << /Type /FontDescriptor /FontName /HYSMyeongJo-Medium /Flags 6 "
+        b"/FontBBox [0 -148 1001 880] /ItalicAngle 0 /Ascent 880 /Descent -148 "
+        b"/CapHeight 880 /StemV 93 >> /DW 1000 >>"
+    )
+    font_ko = add(
+        b"<< /Type /Font /Subtype /Type0 /BaseFont /HYSMyeongJo-Medium "
+        b"/Encoding /UniKS-UCS2-H /DescendantFonts [%d 0 R] >>" % cid_font
+    )
+    pages_id = add(b"")  # 페이지 목록은 마지막에 채운다
+
+    kids = []
+    for lines in pages_lines:
+        ops = ["BT"]
+        y = PAGE_SIZE_PT[1] - 50
+        for line in lines:
+            if line.isascii():
+                ops.append(f"/F1 11 Tf 1 0 0 1 50 {y} Tm ({_escape_pdf_string(line)}) Tj")
+            else:
+                hex_text = "".join(f"{ord(ch):04X}" for ch in line)
+                ops.append(f"/F2 11 Tf 1 0 0 1 50 {y} Tm <{hex_text}> Tj")
+            y -= 24
+        ops.append("ET")
+        stream = "\n".join(ops).encode("ascii")
+        content = add(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        kids.append(
+            add(
+                b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 %d %d] "
+                b"/Resources << /Font << /F1 %d 0 R /F2 %d 0 R >> >> /Contents %d 0 R >>"
+                % (pages_id, PAGE_SIZE_PT[0], PAGE_SIZE_PT[1], font_en, font_ko, content)
+            )
+        )
+    objects[pages_id - 1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % k for k in kids),
+        len(kids),
+    )
+    catalog = add(b"<< /Type /Catalog /Pages %d 0 R >>" % pages_id)
+
+    out = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    offsets = []
+    for i, body in enumerate(objects):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % (i + 1) + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1,
+        catalog,
+        xref,
+    )
+    return bytes(out)
+
+
+def render_page_image(lines, font_path=None) -> Image.Image:
+    """줄 리스트를 A4, SCAN_DPI 해상도의 흑백 이미지로 그린다."""
+    size = (int(PAGE_SIZE_PT[0] / 72 * SCAN_DPI), int(PAGE_SIZE_PT[1] / 72 * SCAN_DPI))
+    image = Image.new("L", size, 255)
+    draw = ImageDraw.Draw(image)
+    font_px = int(11 / 72 * SCAN_DPI * 1.4)
+    if font_path:
+        font = ImageFont.truetype(font_path, font_px)
+    else:
+        font = ImageFont.load_default(size=font_px)
+    y = int(50 / 72 * SCAN_DPI)
+    for line in lines:
+        draw.text((int(50 / 72 * SCAN_DPI), y), line, fill=0, font=font)
+        y += int(24 / 72 * SCAN_DPI)
+    return image
+
+
+def scanned_pdf(pages_lines, font_path=None) -> bytes:
+    images = [render_page_image(lines, font_path) for lines in pages_lines]
+    buf = io.BytesIO()
+    images[0].save(buf, "PDF", resolution=SCAN_DPI, save_all=True, append_images=images[1:])
+    return buf.getvalue()
+
+
+def build_pdf(kind: str, lang: str, page_count: int, seed: int = 0):
+    """
+    kind("text" / "scan" / "mixed"), lang("ko" / "en"), 페이지 수로 PDF를 만든다.
+    (PDF 바이트, 페이지별 정답 텍스트 리스트)를 반환한다.
+    한글 글꼴이 없는 환경에서는 스캔 페이지를 영문으로 그린다.
+    """
+    rng = random.Random(f"{kind}-{lang}-{page_count}-{seed}")
+    font_path = find_korean_font()
+    scan_lang = lang if (lang != "ko" or font_path) else "en"
+
+    if kind == "text":
+        truth = [make_page_lines(lang, i + 1, rng) for i in range(page_count)]
+        return text_layer_pdf(truth), ["\n".join(p) for p in truth]
+
+    if kind == "scan":
+        truth = [make_page_lines(scan_lang, i + 1, rng) for i in range(page_count)]
+        return scanned_pdf(truth, font_path), ["\n".join(p) for p in truth]
+
+    if kind == "mixed":
+        # 세 쪽마다 한 쪽이 스캔 첨부 페이지
+        truth = []
+        writer = PdfWriter()
+        for i in range(page_count):
+            if i % 3 == 2:
+                lines = make_page_lines(scan_lang, i + 1, rng)
+                single = scanned_pdf([lines], font_path)
+            else:
+                lines = make_page_lines(lang, i + 1, rng)
+                single = text_layer_pdf([lines])
+            writer.add_page(PdfReader(io.BytesIO(single)).pages[0])
+            truth.append("\n".join(lines))
+        buf = io.BytesIO()
+        writer.write(buf)
+        return buf.getvalue(), truth
+
+    raise ValueError(f"알 수 없는 PDF 종류: {kind}")
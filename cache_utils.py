@@ -0,0 +1,121 @@
+#디스크 캐시 (SQLite)
+# cache_utils.py
+import os
+import pickle
+import sqlite3
+import time
+
+
+CACHE_DIR = os.environ.get("SPECTRUM_CACHE_DIR", ".cache")
+
+
+class DiskCache:
+    """
+    프로세스/세션 간에 공유되는 SQLite 기반 키-값 캐시.
+    값은 pickle로 저장하고, 전체 크기가 max_bytes를 넘으면
+    가장 오래 사용되지 않은 항목부터 지운다(LRU).
+    """
+
+    def __init__(self, name: str, max_bytes: int):
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        self.path = os.path.join(CACHE_DIR, f"{name}.db")
+        self.max_bytes = max_bytes
+
+        conn = self._connect()
+        try:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS cache (
+                    key TEXT PRIMARY KEY,
+                    value BLOB,
+                    size INTEGER,
+                    accessed_at REAL,
+                    expires_at REAL
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_accessed ON cache(accessed_at)")
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def get(self, key: str, default=None):
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT value, expires_at FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return default
+
+            now = time.time()
+            if row[1] is not None and row[1] < now:
+                conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                conn.commit()
+                return default
+
+            conn.execute("UPDATE cache SET accessed_at = ? WHERE key = ?", (now, key))
+            conn.commit()
+        finally:
+            conn.close()
+
+        try:
+            return pickle.loads(row[0])
+        except Exception:
+            self.delete(key)
+            return default
+
+    def set(self, key: str, value, ttl: float = None):
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(blob) > self.max_bytes:
+            return
+
+        now = time.time()
+        expires_at = now + ttl if ttl else None
+        conn = self._connect()
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, size, accessed_at, expires_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, blob, len(blob), now, expires_at),
+            )
+            self._evict(conn)
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _evict(self, conn):
+        """용량 상한을 넘으면 만료된 항목, 그 다음 오래 안 쓴 항목 순으로 지운다."""
+        conn.execute("DELETE FROM cache WHERE expires_at IS NOT NULL AND expires_at < ?", (time.time(),))
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM cache").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        for key, size in conn.execute(
+            "SELECT key, size FROM cache ORDER BY accessed_at ASC"
+        ).fetchall():
+            conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def delete(self, key: str):
+        conn = self._connect()
+        try:
+            conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def clear(self):
+        conn = self._connect()
+        try:
+            conn.execute("DELETE FROM cache")
+            conn.commit()
+        finally:
+            conn.close()
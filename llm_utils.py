@@ -0,0 +1,247 @@
+#LLM 채팅 호출 (스트리밍 + 응답 캐시)
+# llm_utils.py
+"""
+chat.completions 호출을 한곳에 모은다.
+- ChatStream: 스트리밍으로 받아 토큰이 오는 대로 화면에 그린다.
+  긴 한국어 대본/피드백도 첫 토큰이 오는 시점(수 초)부터 읽을 수 있다.
+- chat_completion: 한 번에 받는 호출.
+- 둘 다 (모델, 정규화한 프롬프트, 파라미터)가 같으면 디스크 캐시의 응답을 재사용한다.
+  같은 생기부 → 같은 질문 생성 프롬프트, 같은 대본/의도 → 같은 피드백 프롬프트처럼
+  반복되는 호출의 시간과 비용을 없앤다. 새로 샘플링해야 하는 호출은 cache=False.
+- 캐시에 없어 실제로 보내는 호출은 rate_limit의 관문(RPM/TPM 대기열)을 거친다.
+
+    stream = ChatStream(get_client(), "gpt-4o-mini", messages, site="script", ttl=3600)
+    try:
+        text = st.write_stream(stream)   # 다 받으면 전체 텍스트
+    finally:
+        stream.close()                   # 순회 전에 중단돼도 관문 입장을 돌려준다
+    if not stream.complete: ...          # 길이 제한 등으로 잘림
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import unicodedata
+import weakref
+from collections import Counter
+
+import openai
+
+from cache_utils import DiskCache
+from rate_limit import estimate_chat_tokens, governed, openai_governor, retry_after
+
+
+logger = logging.getLogger(__name__)
+
+# LLM_CACHE=0이면 캐시를 통째로 끈다
+LLM_CACHE_ENABLED = os.environ.get("LLM_CACHE", "1") != "0"
+LLM_CACHE_MAX_BYTES = 64 * 1024 * 1024
+_llm_cache = DiskCache("llm_responses", max_bytes=LLM_CACHE_MAX_BYTES)
+
+# (호출 위치, hit/miss/bypass/saved_tokens) → 횟수
+_llm_stats = Counter()
+_llm_stats_lock = threading.Lock()
+
+
+def normalize_prompt(text: str) -> str:
+    """줄바꿈/유니코드 표기, 줄 끝 공백, 앞뒤 공백 차이로 캐시가 갈리지 않게 한다."""
+    text = unicodedata.normalize("NFC", text or "").replace("\r\n", "\n")
+    return "\n".join(line.rstrip() for line in text.split("\n")).strip()
+
+
+def chat_cache_key(model: str, messages: list, params: dict) -> str:
+    payload = {
+        "model": model,
+        "messages": [
+            {"role": m["role"], "content": normalize_prompt(m["content"])} for m in messages
+        ],
+        "params": params,
+    }
+    blob = json.dumps(payload, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def _record(site: str, event: str, tokens: int = 0):
+    with _llm_stats_lock:
+        _llm_stats[(site, event)] += 1
+        if event == "hit" and tokens:
+            _llm_stats[(site, "saved_tokens")] += tokens
+    logger.debug("LLM cache %s: %s", event, site)
+
+
+def get_llm_cache_stats() -> dict:
+    """
+    이 프로세스의 호출 위치별 캐시 적중/실패/우회 횟수와 적중으로 아낀 토큰 수,
+    그리고 전체 합계와 적중률을 반환한다.
+    """
+    with _llm_stats_lock:
+        items = list(_llm_stats.items())
+    sites = {}
+    for (site, event), n in items:
+        sites.setdefault(site, Counter())[event] += n
+    total = sum(sites.values(), Counter())
+    looked_up = total["hit"] + total["miss"]
+    return {
+        "hits": total["hit"],
+        "misses": total["miss"],
+        "bypassed": total["bypass"],
+        "saved_tokens": total["saved_tokens"],
+        "hit_rate": total["hit"] / looked_up if looked_up else 0.0,
+        "sites": {site: dict(c) for site, c in sorted(sites.items())},
+    }
+
+
+def _lookup(site: str, key: str, cache: bool):
+    if not (cache and LLM_CACHE_ENABLED):
+        _record(site, "bypass")
+        return None
+    hit = _llm_cache.get(key)
+    if hit is None:
+        _record(site, "miss")
+        return None
+    _record(site, "hit", hit.get("tokens", 0))
+    return hit
+
+
+def _store(key: str, text: str, tokens: int, ttl: float, cache: bool):
+    if cache and LLM_CACHE_ENABLED:
+        _llm_cache.set(key, {"text": text, "tokens": tokens}, ttl=ttl)
+
+
+def chat_completion(
+    client,
+    model: str,
+    messages: list,
+    site: str,
+    ttl: float = None,
+    cache: bool = True,
+    on_wait=None,
+    **params,
+) -> str:
+    """
+    한 번에 받는 chat completion. 응답 텍스트를 반환한다.
+    끝까지 생성된(finish_reason == "stop") 응답만 ttl초 동안 캐시한다.
+    한도 때문에 기다리는 동안 on_wait(대기 순번, 예상 대기 초)를 부른다.
+    """
+    key = chat_cache_key(model, messages, params)
+    hit = _lookup(site, key, cache)
+    if hit is not None:
+        return hit["text"]
+
+    with governed(estimate_chat_tokens(messages, params.get("max_tokens")), on_wait) as usage:
+        res = client.chat.completions.create(model=model, messages=messages, **params)
+        if res.usage:
+            usage["tokens"] = res.usage.total_tokens
+    choice = res.choices[0]
+    text = choice.message.content
+    if choice.finish_reason == "stop":
+        tokens = res.usage.total_tokens if res.usage else 0
+        _store(key, text, tokens, ttl, cache)
+    return text
+
+
+class ChatStream:
+    """
+    델타 텍스트를 내보내는 이터러블. 받은 텍스트는 self.text에 쌓이고,
+    끝까지 받으면 finish_reason이 채워진다.
+    중간에 멈추면(에러, 세션 재실행/중지로 순회가 끊김) HTTP 스트림을 닫는다.
+    캐시에 있으면 요청 없이 저장된 응답을 한 번에 내보낸다 (self.cached).
+    """
+
+    def __init__(
+        self,
+        client,
+        model: str,
+        messages: list,
+        site: str,
+        ttl: float = None,
+        cache: bool = True,
+        on_wait=None,
+        **kwargs,
+    ):
+        self._key = chat_cache_key(model, messages, kwargs)
+        self._ttl = ttl
+        self._cache = cache
+        self._parts = []
+        self._stream = None
+        self._finalizer = None
+        self.finish_reason = None
+        self.tokens = 0
+
+        hit = _lookup(site, self._key, cache)
+        self.cached = hit is not None
+        if self.cached:
+            self._parts.append(hit["text"])
+            self.finish_reason = "stop"
+            return
+
+        # 관문 입장 + 응답 헤더가 올 때까지(대략 첫 토큰 전까지) 여기서 기다린다.
+        # 입장 기록은 close()에서 돌려준다. 순회도 close()도 없이 버려지면
+        # (첫 토큰 전에 세션이 중지/재실행되는 경우 등) 객체가 정리될 때 finalizer가 돌려준다.
+        admission = openai_governor.acquire(
+            estimate_chat_tokens(messages, kwargs.get("max_tokens")), on_wait
+        )
+        try:
+            self._stream = client.chat.completions.create(
+                model=model,
+                messages=messages,
+                stream=True,
+                stream_options={"include_usage": True},
+                **kwargs,
+            )
+        except BaseException as e:
+            if isinstance(e, openai.RateLimitError):
+                openai_governor.pause(retry_after(e))
+            openai_governor.release(admission)
+            raise
+        self._finalizer = weakref.finalize(self, _abandon_stream, self._stream, admission)
+
+    @property
+    def text(self) -> str:
+        return "".join(self._parts)
+
+    @property
+    def complete(self) -> bool:
+        return self.finish_reason == "stop"
+
+    def __iter__(self):
+        if self.cached:
+            yield self.text
+            return
+
+        try:
+            for chunk in self._stream:
+                if getattr(chunk, "usage", None):
+                    self.tokens = chunk.usage.total_tokens
+                if not chunk.choices:
+                    continue
+                choice = chunk.choices[0]
+                if choice.delta and choice.delta.content:
+                    self._parts.append(choice.delta.content)
+                    yield choice.delta.content
+                if choice.finish_reason:
+                    self.finish_reason = choice.finish_reason
+        finally:
+            self.close()
+
+        if self.complete:
+            _store(self._key, self.text, self.tokens, self._ttl, self._cache)
+
+    def close(self):
+        """HTTP 스트림을 닫고 관문 입장을 돌려준다. 여러 번 불러도 된다."""
+        if self._finalizer is None or not self._finalizer.alive:
+            return
+        _, _, (stream, admission), _ = self._finalizer.detach()
+        try:
+            stream.close()
+        finally:
+            openai_governor.release(admission, self.tokens or None)
+
+
+def _abandon_stream(stream, admission):
+    """close() 없이 버려진 ChatStream의 정리 (weakref.finalize용, self를 참조하지 않는다)."""
+    try:
+        stream.close()
+    finally:
+        openai_governor.release(admission)
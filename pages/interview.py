@@ -4,14 +4,20 @@ import time
 import json
 
 import streamlit as st
-import plotly.graph_objects as go
 import pandas as pd
 
 from ai_client import get_client
-from pdf_utils import extract_text_from_pdf
+from analysis_utils import detect_speech, speech_only_wav
+from audio_io import load_audio
+from auth import get_question_set
+from llm_utils import chat_completion
+from plot_utils import radar_chart
+from rate_limit import estimate_tokens, governed, wait_notice
+from question_utils import record_text_from_pdf, generate_questions, parse_question_lines
 
 
-client = get_client()
+# 같은 질문에 같은 답변(전사)이면 평가를 재사용한다 (초)
+EVAL_CACHE_TTL_SEC = 24 * 3600
 
 
 def text_to_speech_bytes(text: str) -> bytes:
@@ -22,18 +28,29 @@ def text_to_speech_bytes(text: str) -> bytes:
        필요하면 공식 문서를 보고 model/필드를 조정해야 함.
     """
     try:
-        response = client.audio.speech.create(
-            model="gpt-4o-mini-tts",  # 예: "tts-1" 등 환경에 맞게 변경 가능
-            voice="alloy",
-            input=text,
-        )
-        audio_bytes = response.read()
+        with governed(estimate_tokens(text), on_wait=wait_notice(st.empty())):
+            response = get_client().audio.speech.create(
+                model="gpt-4o-mini-tts",  # 예: "tts-1" 등 환경에 맞게 변경 가능
+                voice="alloy",
+                input=text,
+            )
+            audio_bytes = response.read()
         return audio_bytes
     except Exception as e:
         st.warning(f"TTS 생성 중 오류가 발생했습니다: {e}")
         return b""
 
 
+def _start_question_set(q_text: str, q_list: list):
+    st.session_state.uni_questions = q_text
+    st.session_state.uni_q_list = q_list
+    st.session_state.current_q_idx = 0
+    st.session_state.interview_records = []
+    st.session_state.interview_started = False
+    st.session_state.interview_start_time = None
+    st.session_state.interview_total_seconds = 0
+
+
 def render_interview_upload_page(go_to):
     st.markdown(
         """
@@ -48,36 +65,38 @@ def render_interview_upload_page(go_to):
         unsafe_allow_html=True,
     )
 
+    # 관리자가 일괄 생성해 둔 질문 세트가 있으면 바로 시작할 수 있다
+    saved = get_question_set(st.session_state.get("user"))
+    if saved:
+        st.markdown(
+            f"""
+            <div class="spec-card-tight">
+                <div class="spec-section-label">Prepared Set</div>
+                <div class="spec-subtitle">
+                    학교에서 미리 준비한 면접 질문 세트가 있습니다. ({saved["created_at"]} 생성)
+                </div>
+            </div>
+            """,
+            unsafe_allow_html=True,
+        )
+        if st.button("📚 준비된 질문으로 바로 시작", use_container_width=True):
+            _start_question_set(saved["questions"], parse_question_lines(saved["questions"]))
+            go_to("inter_practice")
+
     uploaded = st.file_uploader("학생부(생활기록부) PDF 업로드", type="pdf")
 
     if uploaded:
+        fresh = st.checkbox("이전에 생성한 질문 대신 새로 생성하기", value=False)
         if st.button("질문 생성 및 다음 단계", type="primary", use_container_width=True):
+            queue_notice = st.empty()
             with st.spinner("생기부를 분석해 면접 질문을 생성하고 있습니다..."):
-                text = extract_text_from_pdf(uploaded)
+                text = record_text_from_pdf(uploaded.getvalue())
                 if len(text) > 50:
-                    prompt = (
-                        "다음 생기부 내용을 바탕으로, 학생부 종합전형 면접에서 나올 법한 예상 질문 10개를 "
-                        "한국어로 만들어줘. 각 질문은 한 줄에 하나씩 써줘.\n\n"
-                        f"[생기부 내용]\n{text[:15000]}"
-                    )
                     try:
-                        res = client.chat.completions.create(
-                            model="gpt-4o-mini",
-                            messages=[{"role": "user", "content": prompt}],
+                        q_text, q_list = generate_questions(
+                            get_client(), text, cache=not fresh, on_wait=wait_notice(queue_notice)
                         )
-                        q_text = res.choices[0].message.content
-                        st.session_state.uni_questions = q_text
-
-                        # 줄 단위로 나누고, "?"가 포함된 줄만 질문으로 간주
-                        lines = [ln.strip("-• ").strip() for ln in q_text.splitlines()]
-                        q_list = [ln for ln in lines if "?" in ln]
-                        st.session_state.uni_q_list = q_list
-                        st.session_state.current_q_idx = 0
-                        st.session_state.interview_records = []
-                        st.session_state.interview_started = False
-                        st.session_state.interview_start_time = None
-                        st.session_state.interview_total_seconds = 0
-
+                        _start_question_set(q_text, q_list)
                         go_to("inter_practice")
                     except Exception as e:
                         st.error(f"질문 생성 중 오류가 발생했습니다: {e}")
@@ -278,13 +297,17 @@ def render_interview_practice_page(go_to):
                     if audio is None:
                         st.warning("먼저 답변을 녹음해 주세요.")
                     else:
+                        queue_notice = st.empty()
                         with st.spinner("면접관 평가 중입니다..."):
                             try:
-                                audio.seek(0)
-                                transcript = client.audio.transcriptions.create(
-                                    model="whisper-1",
-                                    file=audio,
-                                ).text
+                                # 앞뒤/중간의 긴 침묵을 잘라낸 발화 구간만 업로드
+                                y, sr = load_audio(audio)
+                                _, _, segments = detect_speech(y, sr)
+                                with governed(on_wait=wait_notice(queue_notice)):
+                                    transcript = get_client().audio.transcriptions.create(
+                                        model="whisper-1",
+                                        file=("answer.wav", speech_only_wav(y, sr, segments), "audio/wav"),
+                                    ).text
 
                                 eval_prompt = (
                                     "너는 학생부 종합전형 면접관이다.\n"
@@ -296,12 +319,16 @@ def render_interview_practice_page(go_to):
                                     '"suitability": 7, "feedback": "한 줄 이상의 코멘트"}'
                                 )
 
-                                res = client.chat.completions.create(
-                                    model="gpt-4o",
-                                    messages=[{"role": "user", "content": eval_prompt}],
+                                eval_text = chat_completion(
+                                    get_client(),
+                                    "gpt-4o",
+                                    [{"role": "user", "content": eval_prompt}],
+                                    site="answer_eval",
+                                    ttl=EVAL_CACHE_TTL_SEC,
+                                    on_wait=wait_notice(queue_notice),
                                     response_format={"type": "json_object"},
                                 )
-                                data = json.loads(res.choices[0].message.content)
+                                data = json.loads(eval_text)
 
                                 # 이번 문항에 대한 평가 카드
                                 st.markdown(
@@ -320,20 +347,7 @@ def render_interview_practice_page(go_to):
                                     data.get("suitability", 0) * 10,
                                 ]
 
-                                fig = go.Figure(
-                                    data=go.Scatterpolar(
-                                        r=vals,
-                                        theta=cats,
-                                        fill="toself",
-                                        name="면접 역량",
-                                    )
-                                )
-                                fig.update_layout(
-                                    polar=dict(radialaxis=dict(range=[0, 100])),
-                                    showlegend=False,
-                                    template="plotly_dark",
-                                    margin=dict(l=40, r=20, t=30, b=30),
-                                )
+                                fig = radar_chart(cats, vals, name="면접 역량")
                                 st.plotly_chart(fig, use_container_width=True)
 
                                 feedback_text = data.get(
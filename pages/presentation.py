@@ -1,14 +1,130 @@
 #발표 트랙 (대본 작성/평가/분석)
 # pages/presentation.py
+import hashlib
+import html
+from concurrent.futures import ThreadPoolExecutor
+
+import openai
 import streamlit as st
-import librosa
-import plotly.graph_objects as go
 
 from ai_client import get_client
-from analysis_utils import analyze_audio_features, calculate_similarity
-
-
-client = get_client()
+from analysis_utils import (
+    STT_SR,
+    analysis_config_fingerprint,
+    detect_speech,
+    extract_features,
+    track_pitch,
+    speech_only_wav,
+)
+from align_utils import align_texts
+from audio_io import ANALYSIS_SR, load_audio
+from cache_utils import DiskCache
+from llm_utils import ChatStream
+from plot_utils import line_chart
+from rate_limit import openai_governor, wait_notice
+from speech_utils import (
+    compute_speech_rate,
+    transcribe_speech,
+    transcription_to_dict,
+    words_from_transcription,
+    words_to_original,
+)
+
+
+# STT는 네트워크 대기라 스레드에서 돌리고, 그동안 현재 스레드에서 DSP를 계산한다
+# (HTTP 호출 자체의 타임아웃. 관문 대기 시간은 포함하지 않는다)
+STT_TIMEOUT_SEC = 120
+_stt_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="stt")
+
+
+# 같은 녹음의 분석/전사 결과를 재실행·세션 간에 재사용한다 (오디오 해시 + 분석 설정 기준)
+AUDIO_CACHE_MAX_BYTES = 256 * 1024 * 1024
+_analysis_cache = DiskCache("audio_analysis", max_bytes=AUDIO_CACHE_MAX_BYTES)
+STT_MODEL = "whisper-1"
+
+# 같은 대본과 의도면 이 기간 동안 피드백을 재사용한다 (초)
+FEEDBACK_CACHE_TTL_SEC = 3 * 24 * 3600
+
+
+def _transcribe(wav_bytes: bytes, admission: list, stt_key: str) -> dict:
+    """
+    (워커 스레드) 페이지 스레드가 받아 둔 관문 입장으로 전사하고 결과를 바로 캐시한다.
+    페이지가 먼저 중지/재실행돼도 늦게 온 응답은 캐시에 남아 다음 실행에서 쓴다.
+    """
+    client = get_client().with_options(timeout=STT_TIMEOUT_SEC)
+    transcription = transcription_to_dict(transcribe_speech(client, wav_bytes, admission=admission))
+    _analysis_cache.set(stt_key, transcription)
+    return transcription
+
+
+def _cache_keys(audio_bytes: bytes):
+    digest = hashlib.sha256(audio_bytes).hexdigest()
+    config = f"{ANALYSIS_SR}:{analysis_config_fingerprint()}"
+    return f"dsp:{digest}:{config}", f"stt:{digest}:{config}:{STT_MODEL}:{STT_SR}"
+
+
+def run_voice_analysis(audio, on_wait=None) -> dict:
+    """
+    오디오를 읽고 VAD까지 끝나면 바로 STT를 워커 스레드에 맡기고,
+    같은 시간에 스펙트럼 특징과 피치를 계산한 뒤 두 결과를 합친다.
+    (페이지 대기 시간이 STT + DSP가 아니라 둘 중 긴 쪽이 된다)
+    반환 dict: sr, feats, pitch, transcription, dsp_error, stt_error
+    한쪽이 실패해도 다른 쪽 결과는 그대로 돌려준다.
+    성공한 결과는 따로 캐시하므로, 위젯 조작으로 페이지가 다시 실행되면
+    디코드/분석/Whisper 호출 없이 캐시에서 바로 돌려준다 (실패한 쪽만 다시 시도).
+    요청 한도 때문에 STT가 기다리는 동안 on_wait(대기 순번, 예상 대기 초)를 부른다.
+    """
+    audio_bytes = audio.getvalue() if hasattr(audio, "getvalue") else audio
+    dsp_key, stt_key = _cache_keys(audio_bytes)
+    dsp = _analysis_cache.get(dsp_key)
+    transcription = _analysis_cache.get(stt_key)
+
+    result = {
+        "sr": ANALYSIS_SR,
+        "feats": None,
+        "pitch": None,
+        "transcription": transcription,
+        "dsp_error": None,
+        "stt_error": None,
+    }
+    if dsp is not None:
+        result["feats"], result["pitch"] = dsp
+        if transcription is not None:
+            return result
+
+    # 기준 레이트(16kHz) float32 모노로 한 번에 디코드 → 피치/STT 단계에서 다시 리샘플링하지 않는다
+    y, sr = load_audio(audio_bytes)
+    result["sr"] = sr
+    speech = detect_speech(y, sr)
+    stt_future = None
+    if transcription is None:
+        wav_bytes = speech_only_wav(y, sr, speech[2])
+        # 관문 대기(순번 안내)는 화면을 그릴 수 있는 이 스레드에서 하고, 워커는 HTTP 호출만 한다
+        admission = openai_governor.acquire(on_wait=on_wait)
+        try:
+            stt_future = _stt_executor.submit(_transcribe, wav_bytes, admission, stt_key)
+        except BaseException:
+            openai_governor.release(admission)
+            raise
+
+    if dsp is None:
+        try:
+            feats = extract_features(y, sr, speech=speech)
+            # 피치(f0): 목소리 범위, 비침묵 구간에서만 (무성 구간은 NaN → 그래프에서 끊김)
+            pitch = track_pitch(y, sr, feats.intervals)
+            result["feats"], result["pitch"] = feats, pitch
+            _analysis_cache.set(dsp_key, (feats, pitch))
+        except Exception as e:
+            result["dsp_error"] = str(e)
+
+    if stt_future is not None:
+        try:
+            result["transcription"] = stt_future.result()
+        except openai.APITimeoutError:
+            result["stt_error"] = f"{STT_TIMEOUT_SEC}초 안에 응답이 오지 않았습니다."
+        except Exception as e:
+            result["stt_error"] = str(e)
+    return result
 
 
 def render_presentation_menu(go_to):
@@ -53,7 +169,7 @@ def render_presentation_menu(go_to):
             <div class="spec-card">
                 <div class="spec-title">📊 음성 분석</div>
                 <div class="spec-subtitle">발표 속도, 침묵, 피치 변화까지 실제 발표처럼 분석합니다.</div>
-                <span class="spec-pill">Tempo</span>
+                <span class="spec-pill">Speech Rate</span>
                 <span class="spec-pill">Silence</span>
                 <span class="spec-pill">Pitch</span>
             </div>
@@ -97,23 +213,46 @@ def render_writer_page(go_to):
             if not topic:
                 st.warning("발표 주제는 최소한 하나 입력해야 합니다.")
             else:
-                with st.spinner("발표 대본을 구성 중입니다..."):
-                    prompt = (
-                        f"주제: {topic}\n"
-                        f"상황: {context}\n"
-                        f"요구사항: {req}\n"
-                        "위 정보를 바탕으로, 두괄식 구조의 발표 대본을 한국어로 작성해줘. "
-                        "서론-본론-결론이 명확히 드러나고, 말로 읽었을 때 자연스러운 문장이어야 한다."
-                    )
-                    try:
-                        res = client.chat.completions.create(
-                            model="gpt-4o-mini",
-                            messages=[{"role": "user", "content": prompt}],
+                prompt = (
+                    f"주제: {topic}\n"
+                    f"상황: {context}\n"
+                    f"요구사항: {req}\n"
+                    "위 정보를 바탕으로, 두괄식 구조의 발표 대본을 한국어로 작성해줘. "
+                    "서론-본론-결론이 명확히 드러나고, 말로 읽었을 때 자연스러운 문장이어야 한다."
+                )
+                # 생성되는 동안만 여기에 흘려 보여주고, 끝나면 아래 '생성된 발표 대본'으로 옮긴다
+                live = st.empty()
+                queue_notice = st.empty()
+                stream = None
+                try:
+                    with st.spinner("발표 대본을 구성 중입니다..."):
+                        # 같은 입력이라도 다시 누르면 다른 버전을 원하므로 캐시하지 않는다
+                        stream = ChatStream(
+                            get_client(),
+                            "gpt-4o-mini",
+                            [{"role": "user", "content": prompt}],
+                            site="script",
+                            cache=False,
+                            on_wait=wait_notice(queue_notice),
                         )
-                        st.session_state.script = res.choices[0].message.content
+                    with live.container():
+                        st.write_stream(stream)
+                except Exception as e:
+                    # 받은 부분은 화면에 남기되, 이전 대본을 덮어쓰지는 않는다
+                    st.error(f"대본 생성 중 오류가 발생했습니다: {e}")
+                    if stream is not None and stream.text:
+                        st.warning("생성이 중간에 끊겨 위 대본은 일부분입니다. 다시 생성해 주세요.")
+                else:
+                    live.empty()
+                    st.session_state.script = stream.text
+                    if stream.complete:
                         st.success("대본 생성이 완료되었습니다.")
-                    except Exception as e:
-                        st.error(f"대본 생성 중 오류가 발생했습니다: {e}")
+                    else:
+                        st.warning(f"대본이 끝까지 생성되지 않았습니다. (종료 사유: {stream.finish_reason})")
+                finally:
+                    # 첫 토큰 전에 중지/재실행돼 순회하지 못한 경우에도 관문 입장을 돌려준다
+                    if stream is not None:
+                        stream.close()
 
     with col_side:
         st.markdown(
@@ -179,43 +318,248 @@ def render_advisor_page(go_to):
         if not user_script.strip():
             st.warning("대본을 입력해야 피드백을 제공할 수 있습니다.")
         else:
-            with st.spinner("대본을 분석하고 있습니다..."):
-                prompt = (
-                    f"다음 발표 대본을 평가해줘.\n\n"
-                    f"[대본]\n{user_script}\n\n"
-                    f"[발표자가 전달하고 싶은 의도]\n{user_intent}\n\n"
-                    "- 논리 구조(두괄식인지, 전개가 자연스러운지)\n"
-                    "- 핵심 메시지 전달력(청중이 무엇을 기억할지)\n"
-                    "- 청중 이해도(전문용어, 난이도 조절)\n"
-                    "- 구체적인 개선점(문장 예시 포함)\n"
-                    "을 중심으로, 한국어로 친절하게 피드백해줘."
-                )
-                try:
-                    res = client.chat.completions.create(
-                        model="gpt-4o",
-                        messages=[{"role": "user", "content": prompt}],
-                    )
-                    feedback = res.choices[0].message.content
-
-                    st.markdown(
-                        """
-                        <div class="spec-feedback-box">
-                            <div class="spec-feedback-title">AI 코치 피드백</div>
-                            <div class="spec-feedback-body">
-                        """,
-                        unsafe_allow_html=True,
+            prompt = (
+                f"다음 발표 대본을 평가해줘.\n\n"
+                f"[대본]\n{user_script}\n\n"
+                f"[발표자가 전달하고 싶은 의도]\n{user_intent}\n\n"
+                "- 논리 구조(두괄식인지, 전개가 자연스러운지)\n"
+                "- 핵심 메시지 전달력(청중이 무엇을 기억할지)\n"
+                "- 청중 이해도(전문용어, 난이도 조절)\n"
+                "- 구체적인 개선점(문장 예시 포함)\n"
+                "을 중심으로, 한국어로 친절하게 피드백해줘."
+            )
+            queue_notice = st.empty()
+            stream = None
+            try:
+                with st.spinner("대본을 분석하고 있습니다..."):
+                    stream = ChatStream(
+                        get_client(),
+                        "gpt-4o",
+                        [{"role": "user", "content": prompt}],
+                        site="script_feedback",
+                        ttl=FEEDBACK_CACHE_TTL_SEC,
+                        on_wait=wait_notice(queue_notice),
                     )
-                    st.markdown(feedback, unsafe_allow_html=True)
-                    st.markdown("</div></div>", unsafe_allow_html=True)
 
-                except Exception as e:
-                    st.error(f"피드백 생성 중 오류가 발생했습니다: {e}")
+                st.markdown(
+                    """
+                    <div class="spec-feedback-box">
+                        <div class="spec-feedback-title">AI 코치 피드백</div>
+                        <div class="spec-feedback-body">
+                    """,
+                    unsafe_allow_html=True,
+                )
+                st.write_stream(stream)
+                st.markdown("</div></div>", unsafe_allow_html=True)
+                if stream.cached:
+                    st.caption("같은 대본과 의도로 받은 이전 피드백을 다시 보여드렸습니다.")
+                elif not stream.complete:
+                    st.warning(f"피드백이 끝까지 생성되지 않았습니다. (종료 사유: {stream.finish_reason})")
+
+            except Exception as e:
+                st.error(f"피드백 생성 중 오류가 발생했습니다: {e}")
+                if stream is not None and stream.text:
+                    st.warning("생성이 중간에 끊겨 위 피드백은 일부분입니다.")
+            finally:
+                if stream is not None:
+                    stream.close()
 
     st.markdown("---")
     if st.button("⬅️ 발표 메뉴로 복귀", use_container_width=True):
         go_to("pres_menu")
 
 
+def render_voice_report(res: dict, ref_text: str):
+    """run_voice_analysis 결과를 그린다. DSP와 STT 오류는 따로 알린다."""
+    feats, pitch, transcription, sr = res["feats"], res["pitch"], res["transcription"], res["sr"]
+
+    if res["dsp_error"]:
+        st.error(f"음성 신호 분석 중 오류가 발생했습니다: {res['dsp_error']}")
+    if res["stt_error"]:
+        st.warning(
+            f"음성 인식(STT) 중 오류가 발생했습니다: {res['stt_error']} "
+            "발표 속도와 대본 일치도는 표시되지 않습니다."
+        )
+
+    rate, transcript = None, None
+    if transcription is not None:
+        transcript = transcription["text"]
+        if feats is not None:
+            # 잘라 붙인 오디오 기준 시각을 원본 녹음 시각으로 되돌린다
+            words = words_to_original(
+                words_from_transcription(transcription), feats.segments, sr
+            )
+            # 발화 속도: 단어 타임스탬프의 음절 수 + 비침묵 구간
+            rate = compute_speech_rate(words, feats.intervals, sr)
+
+    # 대본 정렬 (대본과 STT 결과가 있을 때만)
+    alignment = (
+        align_texts(ref_text, transcript)
+        if ref_text.strip() and transcript is not None
+        else None
+    )
+    acc = alignment.score if alignment is not None else None
+
+    if feats is not None:
+        times, rms, cent = feats.times, feats.rms, feats.cent
+        tot_dur, silence_ratio, init_silence = (
+            feats.total_dur,
+            feats.silence_ratio,
+            feats.init_silence,
+        )
+
+        # ===== 상단 메트릭 카드 =====
+        col_top1, col_top2, col_top3 = st.columns(3)
+        with col_top1:
+            st.metric("발표 시간", f"{tot_dur:.1f}초")
+        with col_top2:
+            st.metric(
+                "발표 속도",
+                f"{rate.speech_rate_spm:.0f} 음절/분" if rate else "N/A",
+            )
+        with col_top3:
+            st.metric(
+                "침묵 비율",
+                f"{silence_ratio * 100:.1f}%",
+            )
+
+        col_mid1, col_mid2, col_mid3, col_mid4 = st.columns(4)
+        with col_mid3:
+            st.metric(
+                "조음 속도",
+                f"{rate.articulation_rate_spm:.0f} 음절/분" if rate else "N/A",
+                help="쉼을 뺀, 실제로 소리 내어 말한 시간 기준 속도입니다.",
+            )
+        with col_mid4:
+            if rate:
+                st.metric(
+                    "쉼 (0.25초 이상)",
+                    f"{rate.pause_count}회",
+                    f"평균 {rate.pause_mean:.1f}초 · 최장 {rate.pause_max:.1f}초",
+                    delta_color="off",
+                )
+            else:
+                st.metric("쉼 (0.25초 이상)", "N/A")
+        with col_mid1:
+            st.metric("초기 침묵 시간", f"{init_silence:.1f}초")
+        with col_mid2:
+            st.metric(
+                "대본과의 일치도",
+                f"{acc:.1f}%" if acc is not None else "N/A",
+            )
+
+        # 피치 추적만 실패했으면 빈 그래프로 둔다
+        f0, t_pitch, voiced = (
+            (pitch.f0, pitch.times, pitch.voiced) if pitch is not None else ([], [], None)
+        )
+
+        st.markdown("---")
+
+        # ===== 그래프 영역 =====
+        st.markdown(
+            """
+            <div class="spec-section-label">Voice Dynamics</div>
+            <div class="spec-title">목소리 변화 분석</div>
+            """,
+            unsafe_allow_html=True,
+        )
+
+        col_g1, col_g2 = st.columns(2)
+
+        # 그래프 1: 볼륨 변화
+        with col_g1:
+            st.markdown(
+                '<div class="spec-card-tight"><div class="spec-subtitle">RMS 기반 볼륨 변화</div>',
+                unsafe_allow_html=True,
+            )
+            fig_vol = line_chart(
+                times,
+                rms,
+                name="Volume",
+                xaxis_title="시간 (s)",
+                yaxis_title="상대 볼륨 (RMS)",
+                fill="tozeroy",
+            )
+            st.plotly_chart(fig_vol, use_container_width=True)
+            st.markdown("</div>", unsafe_allow_html=True)
+
+        # 그래프 2: 피치 변화
+        with col_g2:
+            st.markdown(
+                '<div class="spec-card-tight"><div class="spec-subtitle">피치(기초 주파수) 변화</div>',
+                unsafe_allow_html=True,
+            )
+            fig_pitch = line_chart(
+                t_pitch,
+                f0,
+                name="Pitch (Hz)",
+                xaxis_title="시간 (s)",
+                yaxis_title="기초 주파수 (Hz)",
+                mask=voiced,
+            )
+            st.plotly_chart(fig_pitch, use_container_width=True)
+            st.markdown("</div>", unsafe_allow_html=True)
+
+        # 그래프 3: 스펙트럴 센트로이드
+        st.markdown(
+            """
+            <div class="spec-card-tight">
+                <div class="spec-subtitle">발음·명료도 경향 (스펙트럴 센트로이드)</div>
+            """,
+            unsafe_allow_html=True,
+        )
+        fig_cent = line_chart(
+            times,
+            cent,
+            name="Spectral Centroid",
+            xaxis_title="시간 (s)",
+            yaxis_title="중심 주파수 (Hz 대역)",
+        )
+        st.plotly_chart(fig_cent, use_container_width=True)
+        st.markdown("</div>", unsafe_allow_html=True)
+
+    # ===== STT 내용 =====
+    if transcript is not None:
+        with st.expander("AI가 인식한 내용 보기 (Whisper STT 결과)"):
+            st.write(transcript)
+
+    # ===== 대본 비교 =====
+    if alignment is not None:
+        with st.expander("대본과 비교하기 (빠뜨린 말 · 바꿔 말한 말 · 덧붙인 말)"):
+            st.markdown(_alignment_html(alignment), unsafe_allow_html=True)
+            st.dataframe(
+                [
+                    {"문장": s.text, "일치율 (%)": round(s.match_rate, 1)}
+                    for s in alignment.sentences
+                ],
+                use_container_width=True,
+                hide_index=True,
+            )
+
+
+def _alignment_html(alignment) -> str:
+    """정렬 결과를 대본 기준으로 표시한다: 빠뜨림은 취소선, 바꿈은 대본→발화, 덧붙임은 초록색."""
+    def words(tokens, start, end):
+        return html.escape(" ".join(tokens[start:end]))
+
+    parts = []
+    for op in alignment.ops:
+        ref = words(alignment.ref_tokens, op.ref_start, op.ref_end)
+        hyp = words(alignment.hyp_tokens, op.hyp_start, op.hyp_end)
+        if op.tag == "equal":
+            parts.append(ref)
+        elif op.tag == "delete":
+            parts.append(f'<span style="color:#ff6b6b;text-decoration:line-through">{ref}</span>')
+        elif op.tag == "insert":
+            parts.append(f'<span style="color:#51cf66">+{hyp}</span>')
+        else:
+            parts.append(
+                f'<span style="color:#ff6b6b;text-decoration:line-through">{ref}</span> '
+                f'<span style="color:#fcc419">→ {hyp}</span>'
+            )
+    return '<div class="spec-feedback-body">' + " ".join(parts) + "</div>"
+
+
 def render_analyst_page(go_to):
     st.markdown(
         """
@@ -239,150 +583,16 @@ def render_analyst_page(go_to):
     audio = st.audio_input("발표 녹음하기")
 
     if audio:
+        queue_notice = st.empty()
         with st.spinner("음성 신호를 분석하고 있습니다..."):
             try:
-                # 오디오 로드
-                y, sr = librosa.load(audio, sr=None)
-                times, rms, cent, tot_dur, silence_ratio, init_silence = analyze_audio_features(
-                    y, sr
-                )
-                tempo = float(librosa.beat.beat_track(y=y, sr=sr)[0])
-
-                # 피치(f0) 추정
-                f0 = librosa.yin(
-                    y,
-                    fmin=librosa.note_to_hz("C2"),
-                    fmax=librosa.note_to_hz("C7"),
-                )
-                t_pitch = librosa.times_like(f0, sr=sr)
-
-                # STT
-                audio.seek(0)
-                transcript = client.audio.transcriptions.create(
-                    model="whisper-1",
-                    file=audio,
-                ).text
-
-                # 정확도 (대본이 있을 때만)
-                acc = (
-                    calculate_similarity(ref_text, transcript)
-                    if ref_text.strip()
-                    else 0.0
-                )
-
-                # ===== 상단 메트릭 카드 =====
-                col_top1, col_top2, col_top3 = st.columns(3)
-                with col_top1:
-                    st.metric("발표 시간", f"{tot_dur:.1f}초")
-                with col_top2:
-                    st.metric("발표 속도 (Tempo)", f"{tempo:.0f} BPM")
-                with col_top3:
-                    st.metric(
-                        "침묵 비율",
-                        f"{silence_ratio * 100:.1f}%",
-                    )
-
-                col_mid1, col_mid2 = st.columns(2)
-                with col_mid1:
-                    st.metric("초기 침묵 시간", f"{init_silence:.1f}초")
-                with col_mid2:
-                    st.metric(
-                        "대본과의 일치도",
-                        f"{acc:.1f}%" if ref_text.strip() else "N/A",
-                    )
-
-                st.markdown("---")
-
-                # ===== 그래프 영역 =====
-                st.markdown(
-                    """
-                    <div class="spec-section-label">Voice Dynamics</div>
-                    <div class="spec-title">목소리 변화 분석</div>
-                    """,
-                    unsafe_allow_html=True,
-                )
-
-                col_g1, col_g2 = st.columns(2)
-
-                # 그래프 1: 볼륨 변화
-                with col_g1:
-                    st.markdown(
-                        '<div class="spec-card-tight"><div class="spec-subtitle">RMS 기반 볼륨 변화</div>',
-                        unsafe_allow_html=True,
-                    )
-                    fig_vol = go.Figure()
-                    fig_vol.add_trace(
-                        go.Scatter(
-                            x=times,
-                            y=rms,
-                            fill="tozeroy",
-                            name="Volume",
-                        )
-                    )
-                    fig_vol.update_layout(
-                        xaxis_title="시간 (s)",
-                        yaxis_title="상대 볼륨 (RMS)",
-                        template="plotly_dark",
-                        margin=dict(l=40, r=20, t=30, b=30),
-                    )
-                    st.plotly_chart(fig_vol, use_container_width=True)
-                    st.markdown("</div>", unsafe_allow_html=True)
-
-                # 그래프 2: 피치 변화
-                with col_g2:
-                    st.markdown(
-                        '<div class="spec-card-tight"><div class="spec-subtitle">피치(기초 주파수) 변화</div>',
-                        unsafe_allow_html=True,
-                    )
-                    fig_pitch = go.Figure()
-                    fig_pitch.add_trace(
-                        go.Scatter(
-                            x=t_pitch,
-                            y=f0,
-                            name="Pitch (Hz)",
-                        )
-                    )
-                    fig_pitch.update_layout(
-                        xaxis_title="시간 (s)",
-                        yaxis_title="기초 주파수 (Hz)",
-                        template="plotly_dark",
-                        margin=dict(l=40, r=20, t=30, b=30),
-                    )
-                    st.plotly_chart(fig_pitch, use_container_width=True)
-                    st.markdown("</div>", unsafe_allow_html=True)
-
-                # 그래프 3: 스펙트럴 센트로이드
-                st.markdown(
-                    """
-                    <div class="spec-card-tight">
-                        <div class="spec-subtitle">발음·명료도 경향 (스펙트럴 센트로이드)</div>
-                    """,
-                    unsafe_allow_html=True,
-                )
-                t_cent = librosa.times_like(cent, sr=sr)
-                fig_cent = go.Figure()
-                fig_cent.add_trace(
-                    go.Scatter(
-                        x=t_cent,
-                        y=cent,
-                        name="Spectral Centroid",
-                    )
-                )
-                fig_cent.update_layout(
-                    xaxis_title="시간 (s)",
-                    yaxis_title="중심 주파수 (Hz 대역)",
-                    template="plotly_dark",
-                    margin=dict(l=40, r=20, t=30, b=30),
-                )
-                st.plotly_chart(fig_cent, use_container_width=True)
-                st.markdown("</div>", unsafe_allow_html=True)
-
-                # ===== STT 내용 =====
-                with st.expander("AI가 인식한 내용 보기 (Whisper STT 결과)"):
-                    st.write(transcript)
-
+                res = run_voice_analysis(audio, on_wait=wait_notice(queue_notice))
             except Exception as e:
                 st.error(f"오디오 분석 중 오류가 발생했습니다: {e}")
+                res = None
+
+        if res is not None:
+            render_voice_report(res, ref_text)
 
     st.markdown("---")
     if st.button("⬅️ 발표 메뉴로 복귀", use_container_width=True):
@@ -1,34 +1,470 @@
 #PDF → 텍스트
 # pdf_utils.py
+import functools
+import hashlib
+import io
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import Counter, deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
 import pdfplumber
-from pdf2image import convert_from_bytes
+from pdf2image import convert_from_path, pdfinfo_from_bytes
 import pytesseract
 
+try:
+    import tesserocr
+except ImportError:  # libtesseract 바인딩이 없으면 pytesseract만 사용
+    tesserocr = None
+
+from cache_utils import DiskCache
+
+
+# 이 글자 수보다 적게 추출된 페이지는 텍스트 레이어가 없는(스캔) 페이지로 본다.
+MIN_PAGE_TEXT_CHARS = 20
+OCR_LANG = "kor+eng"
+OCR_WORKERS = os.cpu_count() or 1
+# "auto"면 tesserocr(C API) 엔진을 우선 쓰고, 없으면 pytesseract(프로세스 호출)로 돌아간다.
+OCR_BACKEND = os.environ.get("OCR_BACKEND", "auto")
+# 낮은 DPI(그레이스케일)부터 OCR하고, 단어 평균 신뢰도가 기준보다 낮으면 다음 DPI로 다시 래스터화한다.
+OCR_DPI_LEVELS = tuple(
+    int(v) for v in os.environ.get("OCR_DPI_LEVELS", "150,300").split(",") if v.strip()
+)
+OCR_CONF_THRESHOLD = float(os.environ.get("OCR_CONF_THRESHOLD", "75"))
+
+# 추출 결과 캐시 (업로드 바이트의 SHA-256 → 페이지별 텍스트 + 추출 경로)
+PDF_CACHE_MAX_BYTES = 200 * 1024 * 1024
+_pdf_cache = DiskCache("pdf_text", max_bytes=PDF_CACHE_MAX_BYTES)
+
+# number는 1부터 시작, method는 "text"(텍스트 레이어) 또는 "ocr"
+# dpi / confidence / escalations는 OCR 페이지에서만 채워진다.
+PdfPage = namedtuple(
+    "PdfPage",
+    ["number", "text", "method", "dpi", "confidence", "escalations"],
+    defaults=(None, None, 0),
+)
+
+logger = logging.getLogger(__name__)
+
+_ocr_pool = None
+_ocr_pool_lock = threading.Lock()
+
+_ocr_backend = None
+_ocr_backend_lock = threading.Lock()
+
+# 프로세스 전체 OCR 통계 (DPI 상향 빈도를 보고 OCR_DPI_LEVELS/OCR_CONF_THRESHOLD를 조정)
+_ocr_stats = Counter()
+_ocr_stats_lock = threading.Lock()
+
+
+class PytesseractBackend:
+    """페이지마다 tesseract 프로세스를 새로 띄우는 기본 백엔드."""
+
+    name = "pytesseract"
+
+    def __init__(self, lang: str = OCR_LANG):
+        self.lang = lang
+
+    def image_to_string(self, image) -> str:
+        return pytesseract.image_to_string(image, lang=self.lang)
+
+    def recognize(self, image):
+        """(텍스트, 단어 평균 신뢰도 0~100 또는 None)을 반환한다."""
+        data = pytesseract.image_to_data(
+            image, lang=self.lang, output_type=pytesseract.Output.DICT
+        )
+        lines = {}
+        confs = []
+        for i, word in enumerate(data["text"]):
+            word = (word or "").strip()
+            if not word:
+                continue
+            line_key = (data["block_num"][i], data["par_num"][i], data["line_num"][i])
+            lines.setdefault(line_key, []).append(word)
+            conf = float(data["conf"][i])
+            if conf >= 0:
+                confs.append(conf)
+        text = "\n".join(" ".join(words) for words in lines.values())
+        return text, (sum(confs) / len(confs) if confs else None)
+
+
+class TesserocrBackend:
+    """
+    tesseract C API를 프로세스 안에서 직접 쓰는 백엔드.
+    kor+eng 학습 데이터는 생성할 때 한 번만 읽고, 이후 페이지/요청에서 계속 재사용한다.
+    """
+
+    name = "tesserocr"
+
+    def __init__(self, lang: str = OCR_LANG):
+        self.lang = lang
+        self._api = tesserocr.PyTessBaseAPI(lang=lang)
+        self._lock = threading.Lock()
+
+    def image_to_string(self, image) -> str:
+        with self._lock:
+            if isinstance(image, str):
+                self._api.SetImageFile(image)
+            else:
+                self._api.SetImage(image)
+            try:
+                return self._api.GetUTF8Text()
+            finally:
+                self._api.Clear()
 
-def extract_text_from_pdf(pdf_file) -> str:
+    def recognize(self, image):
+        """(텍스트, 단어 평균 신뢰도 0~100 또는 None)을 반환한다."""
+        with self._lock:
+            if isinstance(image, str):
+                self._api.SetImageFile(image)
+            else:
+                self._api.SetImage(image)
+            try:
+                text = self._api.GetUTF8Text()
+                confs = self._api.AllWordConfidences()
+            finally:
+                self._api.Clear()
+        return text, (sum(confs) / len(confs) if confs else None)
+
+
+def _create_ocr_backend(kind: str):
+    if kind in ("auto", "tesserocr") and tesserocr is not None:
+        try:
+            return TesserocrBackend()
+        except Exception:
+            if kind == "tesserocr":
+                raise
+    return PytesseractBackend()
+
+
+def get_ocr_backend():
     """
-    pdfplumber로 텍스트 추출을 시도하고,
-    텍스트가 너무 적으면 pdf2image + Tesseract로 OCR을 시도한다.
+    현재 프로세스의 OCR 엔진을 돌려준다.
+    OCR 워커 프로세스마다 한 번만 만들어지고, 풀이 살아 있는 동안 계속 재사용된다.
+    """
+    global _ocr_backend
+    with _ocr_backend_lock:
+        if _ocr_backend is None:
+            _ocr_backend = _create_ocr_backend(OCR_BACKEND)
+        return _ocr_backend
+
+
+def _get_ocr_pool():
+    """
+    OCR 전용 프로세스 풀을 (프로세스당 한 번) 만들어 재사용한다.
+    워커 수는 CPU 코어 수에 맞춘다.
+    OCR_WORKERS가 1이면(이미 프로세스 풀 안에서 도는 배치 작업 등) 프로세스를 더 띄우지 않고
+    현재 프로세스의 스레드 하나에서 OCR한다.
+    """
+    global _ocr_pool
+    with _ocr_pool_lock:
+        if _ocr_pool is None:
+            if OCR_WORKERS <= 1:
+                _ocr_pool = ThreadPoolExecutor(max_workers=1)
+            else:
+                _ocr_pool = ProcessPoolExecutor(max_workers=OCR_WORKERS)
+        return _ocr_pool
+
+
+def _ocr_page(
+    pdf_path: str,
+    page_number: int,
+    workdir: str,
+    dpi_levels=OCR_DPI_LEVELS,
+    conf_threshold: float = OCR_CONF_THRESHOLD,
+) -> dict:
+    """
+    (워커 프로세스) PDF의 한 페이지만 임시 파일로 래스터화해서 OCR한다.
+    dpi_levels의 첫 해상도(그레이스케일)로 먼저 읽고, 단어 평균 신뢰도가
+    conf_threshold보다 낮을 때만 다음 해상도로 다시 래스터화한다.
+    이미지는 파이썬 메모리에 올리지 않고 파일 경로로 넘긴 뒤 바로 지운다.
+    """
+    backend = get_ocr_backend()
+    start = time.perf_counter()
+    best = {"text": "", "confidence": None, "dpi": None}
+    escalations = 0
+
+    for i, dpi in enumerate(dpi_levels):
+        paths = convert_from_path(
+            pdf_path,
+            dpi=dpi,
+            first_page=page_number,
+            last_page=page_number,
+            output_folder=workdir,
+            grayscale=True,
+            paths_only=True,
+        )
+        try:
+            if not paths:
+                break
+            text, confidence = backend.recognize(paths[0])
+        finally:
+            for path in paths:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+        if best["dpi"] is None or (confidence or 0) >= (best["confidence"] or 0):
+            best = {"text": text, "confidence": confidence, "dpi": dpi}
+        if confidence is not None and confidence >= conf_threshold:
+            break
+        if i + 1 < len(dpi_levels):
+            escalations += 1
+
+    best["escalations"] = escalations
+    best["seconds"] = time.perf_counter() - start
+    return best
+
+
+def _record_ocr_page(page: "PdfPage", seconds: float):
+    with _ocr_stats_lock:
+        _ocr_stats["pages"] += 1
+        _ocr_stats["seconds"] += seconds
+        if page.escalations:
+            _ocr_stats["escalated_pages"] += 1
+        if page.dpi is not None:
+            _ocr_stats[f"final_dpi_{page.dpi}"] += 1
+    logger.info(
+        "OCR page %d: dpi=%s conf=%s escalations=%d %.2fs",
+        page.number,
+        page.dpi,
+        "-" if page.confidence is None else f"{page.confidence:.1f}",
+        page.escalations,
+        seconds,
+    )
+
+
+def get_ocr_stats() -> dict:
+    """
+    이 프로세스에서 OCR한 페이지 수, DPI를 올려 다시 읽은 페이지 수와 비율,
+    최종 DPI별 페이지 수, 누적 OCR 시간을 반환한다.
+    """
+    with _ocr_stats_lock:
+        stats = dict(_ocr_stats)
+    pages = stats.get("pages", 0)
+    stats["escalation_rate"] = stats.get("escalated_pages", 0) / pages if pages else 0.0
+    return stats
+
+
+def _iter_text_layer(pdf_bytes: bytes):
+    """
+    pdfplumber로 페이지를 하나씩 열어 (페이지 번호, 텍스트 레이어)를 내보낸다.
+    페이지를 다 읽으면 바로 닫아서 파싱 캐시가 쌓이지 않게 한다.
+    pdfplumber가 열지 못하면 poppler로 페이지 수만 알아내 빈 텍스트를 내보낸다.
     """
-    text = ""
     try:
-        with pdfplumber.open(pdf_file) as pdf:
-            for page in pdf.pages:
-                extracted = page.extract_text()
-                if extracted:
-                    text += extracted + "\n"
+        pdf = pdfplumber.open(io.BytesIO(pdf_bytes))
     except Exception:
-        pass
+        pdf = None
 
-    # 텍스트가 너무 적으면 OCR 시도
-    if len(text) < 50:
-        pdf_file.seek(0)
+    if pdf is None:
         try:
-            images = convert_from_bytes(pdf_file.read())
-            text = ""
-            for image in images:
-                text += pytesseract.image_to_string(image, lang="kor+eng") + "\n"
+            page_count = int(pdfinfo_from_bytes(pdf_bytes)["Pages"])
         except Exception:
-            pass
+            page_count = 0
+        for i in range(page_count):
+            yield i + 1, ""
+        return
+
+    with pdf:
+        for i, page in enumerate(pdf.pages):
+            try:
+                text = page.extract_text() or ""
+            except Exception:
+                text = ""
+            finally:
+                page.close()
+            yield i + 1, text
+
+
+def _resolve_page(number, layer_text, future) -> PdfPage:
+    if future is None:
+        return PdfPage(number, layer_text, "text")
+    try:
+        result = future.result()
+    except Exception:
+        return PdfPage(number, layer_text, "ocr")
+
+    text = result["text"]
+    if len(text.strip()) <= len(layer_text.strip()):
+        text = layer_text
+    page = PdfPage(
+        number, text, "ocr", result["dpi"], result["confidence"], result["escalations"]
+    )
+    _record_ocr_page(page, result["seconds"])
+    return page
+
 
-    return text
+def iter_pdf_pages(
+    pdf_bytes: bytes,
+    char_budget: int = None,
+    dpi_levels=OCR_DPI_LEVELS,
+    conf_threshold: float = OCR_CONF_THRESHOLD,
+):
+    """
+    PDF를 페이지 순서대로 하나씩 PdfPage로 내보내는 제너레이터.
+    - 텍스트 레이어가 있는 페이지는 pdfplumber 결과를 그대로 쓴다.
+    - 없는 페이지만 OCR 프로세스 풀로 보내되, 동시에 진행 중인 OCR은 워커 수까지만 둔다.
+      (한 번에 한 페이지씩 임시 파일로 래스터화하므로 메모리가 페이지 수에 비례해 늘지 않는다)
+    - OCR은 낮은 DPI부터 시작해 신뢰도가 conf_threshold 미만인 페이지만 dpi_levels를 따라 올린다.
+    - 누적 글자 수가 char_budget에 도달하면 남은 페이지는 처리하지 않고 멈춘다.
+    """
+    with tempfile.TemporaryDirectory() as workdir:
+        pdf_path = os.path.join(workdir, "source.pdf")
+        with open(pdf_path, "wb") as f:
+            f.write(pdf_bytes)
+
+        pool = None
+        pending = deque()  # (페이지 번호, 텍스트 레이어, OCR future 또는 None)
+        total_chars = 0
+
+        def in_flight():
+            return sum(1 for _, _, fut in pending if fut is not None)
+
+        try:
+            for number, layer_text in _iter_text_layer(pdf_bytes):
+                future = None
+                if len(layer_text.strip()) < MIN_PAGE_TEXT_CHARS:
+                    if pool is None:
+                        pool = _get_ocr_pool()
+                    future = pool.submit(
+                        _ocr_page, pdf_path, number, workdir, dpi_levels, conf_threshold
+                    )
+                pending.append((number, layer_text, future))
+
+                # 맨 앞 페이지가 준비됐거나 OCR 대기열이 꽉 찼으면 순서대로 내보낸다
+                while pending and (
+                    pending[0][2] is None
+                    or pending[0][2].done()
+                    or in_flight() >= OCR_WORKERS
+                ):
+                    page = _resolve_page(*pending.popleft())
+                    total_chars += len(page.text)
+                    yield page
+                    if char_budget is not None and total_chars >= char_budget:
+                        return
+
+            while pending:
+                page = _resolve_page(*pending.popleft())
+                total_chars += len(page.text)
+                yield page
+                if char_budget is not None and total_chars >= char_budget:
+                    return
+        finally:
+            for _, _, future in pending:
+                if future is not None:
+                    future.cancel()
+            # 이미 돌고 있는 OCR이 임시 디렉터리를 쓰는 동안 지우지 않도록 기다린다
+            for _, _, future in pending:
+                if future is not None and not future.cancelled():
+                    try:
+                        future.result()
+                    except Exception:
+                        pass
+
+
+def _extract_pages(pdf_bytes: bytes, char_budget: int = None):
+    """
+    iter_pdf_pages 결과를 모아
+    (페이지별 텍스트 리스트, 사용한 경로 "text" / "ocr" / "mixed", 끝까지 읽었는지)를 반환한다.
+    """
+    pages = []
+    methods = set()
+    complete = True
+    total_chars = 0
+    for page in iter_pdf_pages(pdf_bytes, char_budget=char_budget):
+        pages.append(page.text)
+        methods.add(page.method)
+        total_chars += len(page.text)
+        if char_budget is not None and total_chars >= char_budget:
+            complete = False
+
+    if methods == {"text"}:
+        method = "text"
+    elif methods == {"ocr"}:
+        method = "ocr"
+    else:
+        method = "mixed" if methods else "ocr"
+    return pages, method, complete
+
+
+@functools.lru_cache(maxsize=1)
+def ocr_config_fingerprint() -> str:
+    """
+    OCR 결과에 영향을 주는 설정(언어, 페이지 판정 기준, 엔진, DPI 단계, 신뢰도 기준,
+    Tesseract 버전)을 묶은 문자열.
+    이 값이 바뀌면 기존 캐시 항목은 무효로 취급된다.
+    """
+    try:
+        tess_version = str(pytesseract.get_tesseract_version())
+    except Exception:
+        tess_version = "unknown"
+    # auto에서 tesserocr가 import되더라도 엔진 생성에 실패하면 pytesseract로 돌아가므로,
+    # 실제로 만들어진 백엔드의 이름을 쓴다.
+    try:
+        backend = get_ocr_backend().name
+    except Exception:
+        backend = f"{OCR_BACKEND}-unavailable"
+    return (
+        f"lang={OCR_LANG};min_chars={MIN_PAGE_TEXT_CHARS};"
+        f"backend={backend};dpi={','.join(map(str, OCR_DPI_LEVELS))};"
+        f"conf={OCR_CONF_THRESHOLD:g};tesseract={tess_version}"
+    )
+
+
+def extract_pdf_pages(pdf_bytes: bytes, char_budget: int = None, use_cache: bool = True):
+    """
+    _extract_pages의 캐시 버전.
+    같은 PDF(같은 SHA-256)를 다시 올리면 OCR 없이 저장된 결과를 돌려준다.
+    char_budget으로 잘린 결과는 그 글자 수 이하를 요구하는 요청에만 재사용한다.
+    (페이지별 텍스트 리스트, 추출 경로)를 반환한다.
+    """
+    key = hashlib.sha256(pdf_bytes).hexdigest()
+    fingerprint = ocr_config_fingerprint()
+
+    if use_cache:
+        entry = _pdf_cache.get(key)
+        if entry is not None:
+            if entry.get("ocr_config") != fingerprint:
+                _pdf_cache.delete(key)
+            # "complete"가 없는 항목은 글자 수 제한 도입 전(항상 전체 추출)에 저장된 것이다
+            elif entry.get("complete", True) or (
+                char_budget is not None and sum(map(len, entry["pages"])) >= char_budget
+            ):
+                return entry["pages"], entry["method"]
+
+    pages, method, complete = _extract_pages(pdf_bytes, char_budget=char_budget)
+    if use_cache and any(t.strip() for t in pages):
+        _pdf_cache.set(
+            key,
+            {
+                "pages": pages,
+                "method": method,
+                "complete": complete,
+                "ocr_config": fingerprint,
+            },
+        )
+    return pages, method
+
+
+def clear_pdf_text_cache():
+    """OCR 설정을 바꿨을 때 등, 저장된 PDF 추출 결과를 모두 지운다."""
+    _pdf_cache.clear()
+    ocr_config_fingerprint.cache_clear()
+
+
+def extract_text_from_pdf(pdf_file, char_budget: int = None) -> str:
+    """
+    페이지마다 pdfplumber로 텍스트를 추출하고,
+    텍스트 레이어가 없는 페이지만 pdf2image + Tesseract로 OCR한다.
+    OCR은 CPU 코어 수만큼의 프로세스에서 병렬로 돌고, 결과는 페이지 순서를 유지한다.
+    char_budget을 주면 그만큼의 글자가 모이는 페이지에서 추출을 멈춘다.
+    같은 파일은 내용 해시 기준으로 캐시된 결과를 재사용한다.
+    """
+    pdf_file.seek(0)
+    pages, _ = extract_pdf_pages(pdf_file.read(), char_budget=char_budget)
+    return "".join(t + "\n" for t in pages if t)
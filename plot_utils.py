@@ -0,0 +1,152 @@
+#차트 헬퍼 (서버 측 다운샘플링 + WebGL 트레이스)
+# plot_utils.py
+import numpy as np
+import plotly.graph_objects as go
+
+
+# 차트 하나에 보내는 최대 점 수 (녹음 길이와 무관하게 JSON 크기/렌더 시간이 일정)
+MAX_POINTS = 1500
+
+_LAYOUT = dict(template="plotly_dark", margin=dict(l=40, r=20, t=30, b=30))
+
+
+def lttb(x, y, n_out: int):
+    """
+    Largest-Triangle-Three-Buckets: 모양(봉우리/골짜기)을 살리면서 n_out개 점으로 줄인다.
+    x, y에 NaN이 없어야 한다.
+    """
+    n = len(x)
+    if n_out >= n:
+        return x, y
+    if n_out < 3:
+        # 고를 가운데 점이 없으면 양 끝만 남긴다
+        idx = [0, n - 1][: max(n_out, 1)]
+        return x[idx], y[idx]
+
+    idx = np.empty(n_out, dtype=int)
+    idx[0], idx[-1] = 0, n - 1
+    every = (n - 2) / (n_out - 2)
+    a = 0
+    for i in range(n_out - 2):
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+        # 다음 버킷의 평균점과 이전에 고른 점으로 만드는 삼각형 넓이가 가장 큰 점을 고른다
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        area = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(np.argmax(area))
+        idx[i + 1] = a
+    return x[idx], y[idx]
+
+
+def minmax_decimate(x, y, n_out: int):
+    """
+    버킷마다 최솟값/최댓값 두 점만 남긴다 (NaN 허용).
+    전부 NaN인 버킷은 NaN 한 점으로 남겨 그래프가 그 구간에서 끊기게 한다.
+    """
+    n = len(x)
+    n_buckets = max(n_out // 2, 1)
+    if n <= n_out:
+        return x, y
+
+    xs, ys = [], []
+    for bucket in np.array_split(np.arange(n), n_buckets):
+        yb = y[bucket]
+        finite = np.isfinite(yb)
+        if not finite.any():
+            xs.append(x[bucket[0]])
+            ys.append(np.nan)
+            continue
+        lo = bucket[np.nanargmin(yb)]
+        hi = bucket[np.nanargmax(yb)]
+        for i in sorted({lo, hi}):
+            xs.append(x[i])
+            ys.append(y[i])
+    return np.asarray(xs), np.asarray(ys)
+
+
+def _finite_runs(finite):
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], finite.astype(int), [0]))))
+    return edges.reshape(-1, 2)
+
+
+def decimate(x, y, max_points: int = MAX_POINTS):
+    """
+    시계열을 max_points개 안팎으로 줄인다.
+    NaN(무성/침묵)으로 끊긴 구간은 구간별로 LTTB를 적용하고 사이에 NaN을 넣어 끊김을 유지한다.
+    끊긴 조각이 너무 많으면 min/max 버킷으로 대신한다.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    if len(y) <= max_points:
+        return x, y
+
+    finite = np.isfinite(y)
+    if finite.all():
+        return lttb(x, y, max_points)
+
+    runs = _finite_runs(finite)
+    if len(runs) == 0:
+        return x[:1], y[:1]
+    if len(runs) * 3 > max_points:
+        return minmax_decimate(x, y, max_points)
+
+    # 조각마다 양 끝 두 점 + NaN 구분점을 먼저 떼어 두고 나머지를 길이에 비례해 나눈다
+    budget = max_points - 3 * len(runs)
+    n_finite = int(finite.sum())
+    xs, ys = [], []
+    for start, end in runs:
+        if xs:
+            xs.append([x[start - 1]])
+            ys.append([np.nan])
+        n_out = min(end - start, 2 + budget * (end - start) // n_finite)
+        rx, ry = lttb(x[start:end], y[start:end], n_out)
+        xs.append(rx)
+        ys.append(ry)
+    return np.concatenate(xs), np.concatenate(ys)
+
+
+def line_chart(
+    x,
+    y,
+    name: str,
+    xaxis_title: str,
+    yaxis_title: str,
+    mask=None,
+    fill: str = None,
+    max_points: int = MAX_POINTS,
+):
+    """
+    다운샘플링한 시계열 하나를 WebGL(Scattergl) 선 그래프로 만든다.
+    mask가 False인 프레임(예: 무성 피치)은 NaN으로 가려 선을 끊는다.
+    """
+    y = np.asarray(y, dtype=float)
+    if mask is not None:
+        y = np.where(mask, y, np.nan)
+    x, y = decimate(x, y, max_points)
+
+    fig = go.Figure()
+    fig.add_trace(go.Scattergl(x=x, y=y, name=name, fill=fill, mode="lines", connectgaps=False))
+    fig.update_layout(xaxis_title=xaxis_title, yaxis_title=yaxis_title, **_LAYOUT)
+    return fig
+
+
+def radar_chart(categories, values, name: str, r_max: float = 100):
+    """점수 레이더 차트 (WebGL Scatterpolargl)."""
+    fig = go.Figure(
+        data=go.Scatterpolargl(
+            r=list(values),
+            theta=list(categories),
+            fill="toself",
+            name=name,
+        )
+    )
+    fig.update_layout(
+        polar=dict(radialaxis=dict(range=[0, r_max])),
+        showlegend=False,
+        **_LAYOUT,
+    )
+    return fig
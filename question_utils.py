@@ -0,0 +1,51 @@
+#생기부 → 면접 질문 생성 (페이지/배치 공용)
+# question_utils.py
+from llm_utils import chat_completion
+from pdf_utils import extract_pdf_pages
+from record_parser import build_record_prompt
+
+
+# 생기부에서 읽어 들일 최대 글자 수 (비정상적으로 큰 PDF 방지용 안전장치)
+MAX_RECORD_CHARS = 100000
+# 질문 생성 프롬프트에 넣는 생기부 내용의 토큰 예산
+QUESTION_PROMPT_TOKENS = 6000
+QUESTION_MODEL = "gpt-4o-mini"
+# 같은 생기부 내용이면 이 기간 동안 생성한 질문을 재사용한다 (초)
+QUESTION_CACHE_TTL_SEC = 7 * 24 * 3600
+
+
+def record_text_from_pdf(pdf_bytes: bytes) -> str:
+    """생기부 PDF 바이트에서 질문 생성용으로 압축한 생기부 내용을 만든다."""
+    pages, _ = extract_pdf_pages(pdf_bytes, char_budget=MAX_RECORD_CHARS)
+    return build_record_prompt(pages, token_budget=QUESTION_PROMPT_TOKENS)
+
+
+def build_question_prompt(record_text: str) -> str:
+    return (
+        "다음 생기부 내용을 바탕으로, 학생부 종합전형 면접에서 나올 법한 예상 질문 10개를 "
+        "한국어로 만들어줘. 각 질문은 한 줄에 하나씩 써줘.\n\n"
+        f"[생기부 내용]\n{record_text}"
+    )
+
+
+def parse_question_lines(q_text: str) -> list:
+    """줄 단위로 나누고, "?"가 포함된 줄만 질문으로 간주한다."""
+    lines = [ln.strip("-• ").strip() for ln in q_text.splitlines()]
+    return [ln for ln in lines if "?" in ln]
+
+
+def generate_questions(client, record_text: str, cache: bool = True, on_wait=None):
+    """
+    압축된 생기부 내용으로 예상 질문을 생성한다.
+    (모델이 준 원문, 질문 리스트)를 반환한다. cache=False면 캐시를 건너뛰고 새로 생성한다.
+    """
+    q_text = chat_completion(
+        client,
+        QUESTION_MODEL,
+        [{"role": "user", "content": build_question_prompt(record_text)}],
+        site="questions",
+        ttl=QUESTION_CACHE_TTL_SEC,
+        cache=cache,
+        on_wait=on_wait,
+    )
+    return q_text, parse_question_lines(q_text)
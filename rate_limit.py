@@ -0,0 +1,216 @@
+#OpenAI 호출 동시성/속도 조절 (RPM/TPM, 선착순 대기열)
+# rate_limit.py
+"""
+모든 세션의 chat/전사/TTS 호출이 지나가는 프로세스 단위 관문.
+- 최근 60초 동안 들여보낸 요청 수(RPM)와 추정 토큰 수(TPM), 동시 진행 수를 설정한 한도 안으로 유지한다.
+- 한도를 넘는 요청은 실패시키지 않고 도착 순서대로(FIFO) 줄을 세운다.
+  기다리는 동안 on_wait(대기 순번, 예상 대기 초)를 불러 화면에 보여줄 수 있다.
+- 그래도 429가 오면(같은 키를 쓰는 다른 프로세스 등) 잠시 전체 입장을 멈춘다.
+한 반 40명이 동시에 면접을 시작해도 재시도 폭주 대신 계정 한도 근처의 처리량으로 수렴한다.
+
+    with governed(estimate_chat_tokens(messages), on_wait=wait_notice(st.empty())) as usage:
+        res = client.chat.completions.create(...)
+        usage["tokens"] = res.usage.total_tokens   # 실제 사용량으로 보정 (선택)
+"""
+import os
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+
+import openai
+
+
+OPENAI_RPM_LIMIT = int(os.environ.get("OPENAI_RPM_LIMIT", "500"))
+OPENAI_TPM_LIMIT = int(os.environ.get("OPENAI_TPM_LIMIT", "200000"))
+OPENAI_MAX_CONCURRENCY = int(os.environ.get("OPENAI_MAX_CONCURRENCY", "16"))
+# 응답 길이를 모를 때 잡아 두는 출력 토큰 수
+DEFAULT_COMPLETION_TOKENS = 1024
+# 대기 중 화면 갱신 간격 (초)
+WAIT_NOTICE_INTERVAL_SEC = 1.0
+# 429에 Retry-After가 없을 때 입장을 멈추는 시간 (초)
+RATE_LIMIT_PAUSE_SEC = 5.0
+
+WINDOW_SEC = 60.0
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    tokenizer 없이 잡는 보수적인 토큰 수. UTF-8 4바이트당 1토큰
+    (한글은 글자당 약 0.75, 영어는 글자당 약 0.25)으로 센다.
+    """
+    return len((text or "").encode("utf-8")) // 4 + 1
+
+
+def estimate_chat_tokens(messages: list, max_tokens: int = None) -> int:
+    prompt = sum(estimate_tokens(m.get("content") if isinstance(m.get("content"), str) else "") + 4 for m in messages)
+    return prompt + (max_tokens or DEFAULT_COMPLETION_TOKENS)
+
+
+class RateGovernor:
+    """
+    최근 WINDOW_SEC 동안 입장한 요청의 [입장 시각, 토큰 수] 목록과 대기열로
+    RPM/TPM/동시 진행 수를 맞춘다. 스레드 안전.
+    """
+
+    def __init__(self, rpm: int, tpm: int, max_concurrency: int):
+        self.rpm = rpm
+        self.tpm = tpm
+        self.max_concurrency = max_concurrency
+        self._cond = threading.Condition()
+        self._window = deque()
+        self._queue = deque()
+        self._in_flight = 0
+        self._paused_until = 0.0
+        self._stats = Counter()
+
+    def _expire(self, now: float):
+        while self._window and self._window[0][0] <= now - WINDOW_SEC:
+            self._window.popleft()
+
+    def _admit_wait(self, tokens: int, now: float) -> float:
+        """지금 tokens짜리 요청 하나를 들여보내려면 더 기다려야 하는 시간 (0이면 바로)."""
+        self._expire(now)
+        wait = max(0.0, self._paused_until - now)
+        if len(self._window) >= self.rpm:
+            wait = max(wait, self._window[len(self._window) - self.rpm][0] + WINDOW_SEC - now)
+        excess = sum(entry[1] for entry in self._window) + tokens - self.tpm
+        if excess > 0:
+            # 오래된 요청부터 창 밖으로 나가며 토큰이 충분히 비는 시점
+            for admitted_at, used in self._window:
+                excess -= used
+                if excess <= 0:
+                    wait = max(wait, admitted_at + WINDOW_SEC - now)
+                    break
+        return wait
+
+    def acquire(self, tokens: int = 0, on_wait=None) -> list:
+        """
+        차례가 오고 한도가 허락할 때까지 기다렸다가 입장한다.
+        반환값(입장 기록)은 release()에 넘긴다. 한 건이 TPM보다 크면 TPM만큼으로 본다.
+        """
+        tokens = min(max(int(tokens), 0), self.tpm)
+        ticket = object()
+        waited = False
+        start = time.monotonic()
+        with self._cond:
+            self._queue.append(ticket)
+        try:
+            while True:
+                with self._cond:
+                    now = time.monotonic()
+                    head = self._queue[0] is ticket
+                    slot = self._in_flight < self.max_concurrency
+                    wait = self._admit_wait(tokens, now) if head and slot else None
+                    if wait == 0:
+                        self._queue.popleft()
+                        entry = [now, tokens]
+                        self._window.append(entry)
+                        self._in_flight += 1
+                        self._stats["admitted"] += 1
+                        if waited:
+                            self._stats["queued"] += 1
+                            self._stats["wait_sec"] += now - start
+                        self._cond.notify_all()
+                        break
+                    position = self._queue.index(ticket) + 1
+                    eta = (wait or 0.0) + (position - 1) * WINDOW_SEC / self.rpm
+                    self._cond.wait(min(wait, WAIT_NOTICE_INTERVAL_SEC) if wait else WAIT_NOTICE_INTERVAL_SEC)
+                waited = True
+                if on_wait:
+                    on_wait(position, eta)
+        except BaseException:
+            # 세션 중지/재실행 등으로 기다리다 빠져나가면 줄에서 뺀다
+            with self._cond:
+                if ticket in self._queue:
+                    self._queue.remove(ticket)
+                self._cond.notify_all()
+            raise
+
+        if waited and on_wait:
+            on_wait(0, 0.0)
+        return entry
+
+    def release(self, entry: list, tokens: int = None):
+        """호출이 끝나면 동시 진행 수를 돌려주고, 알면 실제 토큰 수로 기록을 고친다."""
+        with self._cond:
+            if tokens is not None:
+                entry[1] = tokens
+            self._in_flight -= 1
+            self._cond.notify_all()
+
+    def pause(self, seconds: float):
+        """429를 받으면 seconds 동안 새 입장을 멈춘다."""
+        with self._cond:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._stats["rate_limited"] += 1
+
+    def snapshot(self) -> dict:
+        """현재 대기열/진행 수, 최근 1분 사용량, 누적 대기 통계."""
+        with self._cond:
+            self._expire(time.monotonic())
+            stats = dict(self._stats)
+            stats.update(
+                queued_now=len(self._queue),
+                in_flight=self._in_flight,
+                rpm_used=len(self._window),
+                tpm_used=sum(entry[1] for entry in self._window),
+                rpm_limit=self.rpm,
+                tpm_limit=self.tpm,
+            )
+        queued = stats.get("queued", 0)
+        stats["avg_wait_sec"] = stats.get("wait_sec", 0.0) / queued if queued else 0.0
+        return stats
+
+
+openai_governor = RateGovernor(OPENAI_RPM_LIMIT, OPENAI_TPM_LIMIT, OPENAI_MAX_CONCURRENCY)
+
+
+def retry_after(error) -> float:
+    try:
+        return float(error.response.headers.get("retry-after"))
+    except Exception:
+        return RATE_LIMIT_PAUSE_SEC
+
+
+@contextmanager
+def governed(tokens: int = 0, on_wait=None):
+    """
+    블록 안의 OpenAI 호출 하나를 관문을 거쳐 실행한다.
+    yield하는 dict의 "tokens"에 실제 사용량을 넣으면 TPM 기록을 보정한다.
+    """
+    with admitted(openai_governor.acquire(tokens, on_wait)) as usage:
+        yield usage
+
+
+@contextmanager
+def admitted(entry: list):
+    """
+    이미 받아 둔 입장 기록(openai_governor.acquire의 반환값)으로 블록 안의 호출을 실행하고
+    끝나면 돌려준다. 대기는 화면 스레드에서, 호출은 다른 스레드에서 할 때 쓴다.
+    """
+    usage = {"tokens": None}
+    try:
+        yield usage
+    except openai.RateLimitError as e:
+        openai_governor.pause(retry_after(e))
+        raise
+    finally:
+        openai_governor.release(entry, usage["tokens"])
+
+
+def wait_notice(placeholder):
+    """
+    Streamlit placeholder(st.empty())에 대기 순번과 예상 대기 시간을 보여주는 on_wait 콜백.
+    입장하면 안내를 지운다.
+    """
+    def on_wait(position: int, eta: float):
+        if position == 0:
+            placeholder.empty()
+        else:
+            placeholder.info(
+                f"⏳ 지금 요청이 많아 순서대로 처리하고 있습니다. "
+                f"대기 {position}번째 · 예상 {max(eta, 1):.0f}초"
+            )
+
+    return on_wait
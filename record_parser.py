@@ -0,0 +1,212 @@
+#생기부 섹션 파서 & 프롬프트 압축
+# record_parser.py
+import re
+from collections import Counter
+
+try:
+    import tiktoken
+except ImportError:  # requirements.txt에 포함. 설치가 안 된 환경에서만 글자 수 기반 추정치 사용
+    tiktoken = None
+
+
+# (키, 제목, 우선순위). 우선순위가 높을수록 토큰 예산을 더 많이 받고, 0이면 프롬프트에서 뺀다.
+SECTIONS = [
+    ("personal", "인적·학적사항", 0),
+    ("attendance", "출결상황", 0),
+    ("awards", "수상경력", 2),
+    ("certificates", "자격증 및 인증 취득상황", 1),
+    ("career", "진로희망사항", 3),
+    ("activities", "창의적 체험활동상황", 4),
+    ("volunteer", "봉사활동실적", 1),
+    ("grades", "교과학습발달상황", 1),
+    ("subject_notes", "세부능력 및 특기사항", 5),
+    ("reading", "독서활동상황", 3),
+    ("behavior", "행동특성 및 종합의견", 4),
+]
+# 섹션 제목을 못 찾은 문서 전체에 쓰는 우선순위
+FALLBACK_PRIORITY = 3
+
+# 여러 페이지에 반복되는 머리말/꼬리말로 볼 최소 비율
+REPEATED_LINE_PAGE_RATIO = 0.5
+# 표 머리글처럼 짧은 줄이 이 횟수 이상 반복되면 첫 번째만 남긴다.
+REPEATED_LINE_MIN_COUNT = 3
+REPEATED_LINE_MAX_LEN = 40
+
+_PAGE_NUMBER_RE = re.compile(
+    r"^\s*(?:-\s*\d+\s*-|\d+\s*/\s*\d+|page\s*\d+(?:\s*of\s*\d+)?|\d+\s*쪽|\d+)\s*$",
+    re.IGNORECASE,
+)
+
+
+def _compact(line: str) -> str:
+    """공백과 가운뎃점 변형을 지워 제목 비교용 문자열을 만든다 ("인 적 · 학 적" → "인적학적")."""
+    return re.sub(r"[\s·ㆍ•・.\-]", "", line)
+
+
+_SECTION_KEYS = {_compact(title): key for key, title, _ in SECTIONS}
+_SECTION_HEADER_RE = re.compile(
+    r"^(?:\d{1,2}\s*[.)]?\s*)?(" + "|".join(re.escape(k) for k in _SECTION_KEYS) + r")$"
+)
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    gpt-4o 계열 토큰 수를 센다. tiktoken이 없으면
+    한글은 글자당 약 1토큰, 나머지는 4글자당 1토큰으로 추정한다.
+    """
+    if tiktoken is not None:
+        return len(_get_encoding().encode(text))
+    hangul = sum(1 for ch in text if "가" <= ch <= "힣")
+    return hangul + (len(text) - hangul + 3) // 4
+
+
+_encoding = None
+
+
+def _get_encoding():
+    global _encoding
+    if _encoding is None:
+        _encoding = tiktoken.get_encoding("o200k_base")
+    return _encoding
+
+
+def strip_boilerplate(pages) -> list:
+    """
+    페이지별 텍스트에서 쪽 번호, 여러 페이지에 반복되는 머리말/꼬리말,
+    반복되는 표 머리글(첫 번째만 유지)을 지우고 남은 줄 리스트를 반환한다.
+    """
+    page_lines = [[ln.strip() for ln in (p or "").splitlines() if ln.strip()] for p in pages]
+
+    pages_with_line = Counter()
+    for lines in page_lines:
+        pages_with_line.update(set(lines))
+    min_pages = max(2, int(len(page_lines) * REPEATED_LINE_PAGE_RATIO + 0.5))
+    running_headers = {
+        ln for ln, n in pages_with_line.items() if len(page_lines) > 1 and n >= min_pages
+    }
+
+    line_counts = Counter(ln for lines in page_lines for ln in lines)
+    seen = set()
+    result = []
+    for lines in page_lines:
+        for ln in lines:
+            if _PAGE_NUMBER_RE.match(ln):
+                continue
+            if ln in running_headers and not _SECTION_HEADER_RE.match(_compact(ln)):
+                continue
+            if (
+                len(ln) <= REPEATED_LINE_MAX_LEN
+                and line_counts[ln] >= REPEATED_LINE_MIN_COUNT
+                and not _SECTION_HEADER_RE.match(_compact(ln))
+            ):
+                if ln in seen:
+                    continue
+                seen.add(ln)
+            result.append(ln)
+    return result
+
+
+def split_sections(lines) -> list:
+    """
+    줄 리스트를 생기부 표준 섹션으로 나눈다.
+    [(키, 제목, 줄 리스트)]를 문서 순서대로 반환하며, 같은 섹션이 학년별로
+    여러 번 나오면 하나로 합친다. 첫 섹션 제목 앞의 줄은 "preamble"로 묶는다.
+    """
+    titles = {key: title for key, title, _ in SECTIONS}
+    order = []
+    bodies = {}
+    current = "preamble"
+
+    for ln in lines:
+        m = _SECTION_HEADER_RE.match(_compact(ln))
+        if m:
+            current = _SECTION_KEYS[m.group(1)]
+            continue
+        if current not in bodies:
+            order.append(current)
+            bodies[current] = []
+        bodies[current].append(ln)
+
+    return [(key, titles.get(key, "기타"), bodies[key]) for key in order]
+
+
+def _truncate_lines(lines, max_tokens: int) -> str:
+    """토큰 한도 안에 들어가는 만큼 줄 단위로 자르고, 넘치는 줄은 글자 단위로 자른다."""
+    out = []
+    used = 0
+    for ln in lines:
+        cost = estimate_tokens(ln) + 1
+        if used + cost <= max_tokens:
+            out.append(ln)
+            used += cost
+            continue
+        remaining = max_tokens - used
+        if remaining > 8:
+            # 추정치 기준으로 대략 비례해서 자른다
+            cut = max(1, int(len(ln) * remaining / cost))
+            out.append(ln[:cut] + "…")
+        break
+    return "\n".join(out)
+
+
+def _allocate(needs: dict, priorities: dict, budget: int) -> dict:
+    """
+    우선순위 비율로 예산을 나누되, 필요량보다 많이 받은 섹션의 남는 몫은
+    아직 모자란 섹션들에 다시 나눠 준다.
+    """
+    alloc = {k: 0 for k in needs}
+    active = {k for k in needs if priorities[k] > 0 and needs[k] > 0}
+    remaining = budget
+    while active and remaining > 0:
+        weight = sum(priorities[k] for k in active)
+        satisfied = set()
+        spent = 0
+        for k in active:
+            share = remaining * priorities[k] // weight
+            give = min(share, needs[k] - alloc[k])
+            alloc[k] += give
+            spent += give
+            if alloc[k] >= needs[k]:
+                satisfied.add(k)
+        if spent == 0:
+            break
+        remaining -= spent
+        active -= satisfied
+        if not satisfied:
+            break
+    return alloc
+
+
+def build_record_prompt(pages, token_budget: int = 6000) -> str:
+    """
+    extract_pdf_pages로 얻은 페이지별 텍스트를 받아
+    머리말/꼬리말을 지우고 섹션별로 나눈 뒤, 섹션 우선순위에 따라
+    token_budget 안에 들어가도록 잘라 "[섹션 제목]" 블록들로 합친 문자열을 반환한다.
+    """
+    sections = split_sections(strip_boilerplate(pages))
+    if not sections:
+        return ""
+
+    priorities = {key: p for key, _, p in SECTIONS}
+    found_standard = any(key in priorities for key, _, _ in sections)
+    priorities["preamble"] = 0 if found_standard else FALLBACK_PRIORITY
+
+    needs = {}
+    headers = {}
+    for key, title, lines in sections:
+        headers[key] = f"[{title}]" if key != "preamble" else ""
+        needs[key] = sum(estimate_tokens(ln) + 1 for ln in lines)
+    header_cost = sum(
+        estimate_tokens(headers[k]) + 2 for k in needs if priorities.get(k, 0) > 0 and needs[k]
+    )
+    alloc = _allocate(needs, priorities, max(token_budget - header_cost, 0))
+
+    blocks = []
+    for key, _, lines in sections:
+        if alloc.get(key, 0) <= 0:
+            continue
+        body = _truncate_lines(lines, alloc[key])
+        if not body:
+            continue
+        blocks.append(f"{headers[key]}\n{body}" if headers[key] else body)
+    return "\n\n".join(blocks)
@@ -0,0 +1,159 @@
+#발화 속도 (Whisper 단어 타임스탬프 + 비침묵 구간)
+# speech_utils.py
+import re
+from collections import namedtuple
+
+import numpy as np
+
+from analysis_utils import to_original_time
+from rate_limit import admitted, governed
+
+
+# 이보다 짧은 무음은 쉼(pause)으로 세지 않는다 (초)
+MIN_PAUSE_SEC = 0.25
+
+# word는 인식된 단어, start/end는 원본 녹음 기준 초
+Word = namedtuple("Word", ["word", "start", "end"])
+
+# *_spm은 분당 음절 수
+SpeechRate = namedtuple(
+    "SpeechRate",
+    [
+        "syllables",
+        "speech_rate_spm",
+        "articulation_rate_spm",
+        "speaking_time",
+        "phonation_time",
+        "pauses",
+        "pause_count",
+        "pause_mean",
+        "pause_median",
+        "pause_max",
+    ],
+)
+
+_LATIN_VOWEL_GROUP = re.compile(r"[aeiouy]+", re.IGNORECASE)
+_TOKEN = re.compile(r"[가-힣]|[A-Za-z]+|\d")
+
+
+def count_syllables(text: str) -> int:
+    """
+    한글은 완성형 글자 하나가 한 음절.
+    영어 단어는 모음 묶음 수(최소 1), 숫자는 자릿수 하나를 한 음절로 근사한다.
+    """
+    count = 0
+    for token in _TOKEN.findall(text or ""):
+        if "가" <= token <= "힣" or token.isdigit():
+            count += 1
+        else:
+            count += max(1, len(_LATIN_VOWEL_GROUP.findall(token)))
+    return count
+
+
+def _get(item, key):
+    return item.get(key) if isinstance(item, dict) else getattr(item, key, None)
+
+
+def transcribe_speech(client, wav_bytes: bytes, on_wait=None, admission=None):
+    """
+    발화 구간 WAV를 Whisper로 전사한다 (verbose_json, 단어/세그먼트 타임스탬프 포함).
+    요청 한도 때문에 기다리는 동안 on_wait(대기 순번, 예상 대기 초)를 부른다.
+    호출한 쪽이 이미 관문에 입장했으면 그 기록을 admission으로 넘긴다 (끝나면 여기서 돌려준다).
+    """
+    with admitted(admission) if admission is not None else governed(on_wait=on_wait):
+        return client.audio.transcriptions.create(
+            model="whisper-1",
+            file=("speech.wav", wav_bytes, "audio/wav"),
+            response_format="verbose_json",
+            timestamp_granularities=["word", "segment"],
+        )
+
+
+def transcription_to_dict(transcription) -> dict:
+    """
+    verbose_json 전사 결과에서 text와 단어/세그먼트 타임스탬프만 남긴 dict (캐시 저장용).
+    words_from_transcription은 이 dict도 그대로 받는다.
+    """
+    def items(key, text_key):
+        return [
+            {text_key: _get(item, text_key), "start": _get(item, "start"), "end": _get(item, "end")}
+            for item in _get(transcription, key) or []
+        ]
+
+    return {
+        "text": _get(transcription, "text") or "",
+        "words": items("words", "word"),
+        "segments": items("segments", "text"),
+    }
+
+
+def words_from_transcription(transcription) -> list:
+    """
+    verbose_json 전사 결과에서 Word 리스트를 만든다.
+    단어 타임스탬프가 없으면 세그먼트 단위로 대신한다.
+    """
+    items = _get(transcription, "words") or _get(transcription, "segments") or []
+    words = []
+    for item in items:
+        text = _get(item, "word") or _get(item, "text") or ""
+        start, end = _get(item, "start"), _get(item, "end")
+        if start is None or end is None or not text.strip():
+            continue
+        words.append(Word(text.strip(), float(start), float(end)))
+    return words
+
+
+def words_to_original(words, segments, sr) -> list:
+    """발화 구간만 잘라 올린 오디오 기준의 단어 시각을 원본 녹음 시각으로 되돌린다."""
+    if not words or len(segments) == 0:
+        return list(words)
+    starts = to_original_time([w.start for w in words], segments, sr)
+    ends = to_original_time([w.end for w in words], segments, sr)
+    return [Word(w.word, float(s), float(e)) for w, s, e in zip(words, starts, ends)]
+
+
+def compute_speech_rate(words, intervals, sr, min_pause: float = MIN_PAUSE_SEC) -> SpeechRate:
+    """
+    단어 타임스탬프로 음절 수와 발화 구간(첫 단어 시작~마지막 단어 끝)을 정하고,
+    extract_features의 비침묵 구간(intervals, 샘플 인덱스)으로 실제 발성 시간과 쉼을 잰다.
+    - 발화 속도: 음절 수 / 발화 구간 (쉼 포함)
+    - 조음 속도: 음절 수 / 발성 시간 (쉼 제외)
+    - 쉼: 발화 구간 안에서 비침묵 구간 사이의 min_pause 이상 간격
+    """
+    syllables = sum(count_syllables(w.word) for w in words)
+    spans = np.asarray(intervals, dtype=float).reshape(-1, 2) / sr
+
+    if words:
+        span_start, span_end = words[0].start, words[-1].end
+    elif len(spans):
+        span_start, span_end = spans[0, 0], spans[-1, 1]
+    else:
+        span_start = span_end = 0.0
+    speaking_time = max(span_end - span_start, 0.0)
+
+    if len(spans):
+        clipped = np.clip(spans, span_start, span_end)
+        phonation_time = float(np.sum(clipped[:, 1] - clipped[:, 0]))
+        gaps = spans[1:, 0] - spans[:-1, 1]
+        inside = (spans[1:, 0] > span_start) & (spans[:-1, 1] < span_end)
+        pauses = gaps[inside & (gaps >= min_pause)]
+    else:
+        # 음향 구간이 없으면 단어 사이 간격으로 대신한다
+        phonation_time = float(sum(w.end - w.start for w in words))
+        gaps = np.array([b.start - a.end for a, b in zip(words, words[1:])])
+        pauses = gaps[gaps >= min_pause] if gaps.size else gaps
+    if phonation_time <= 0:
+        phonation_time = speaking_time
+
+    return SpeechRate(
+        syllables=syllables,
+        speech_rate_spm=syllables / speaking_time * 60 if speaking_time > 0 else 0.0,
+        articulation_rate_spm=syllables / phonation_time * 60 if phonation_time > 0 else 0.0,
+        speaking_time=speaking_time,
+        phonation_time=phonation_time,
+        pauses=pauses,
+        pause_count=int(len(pauses)),
+        pause_mean=float(np.mean(pauses)) if len(pauses) else 0.0,
+        pause_median=float(np.median(pauses)) if len(pauses) else 0.0,
+        pause_max=float(np.max(pauses)) if len(pauses) else 0.0,
+    )
@@ -0,0 +1,282 @@
+#블록 단위 오디오 분석 (스트리밍 디코드, 일정한 메모리)
+# stream_utils.py
+import numpy as np
+import librosa
+import soundfile as sf
+import soxr
+
+from analysis_utils import (
+    N_FFT,
+    HOP_LENGTH,
+    TOP_DB,
+    PITCH_SR,
+    VOICE_FMIN,
+    VOICE_FMAX,
+    STT_SR,
+    AudioFeatures,
+    PitchTrack,
+    _nonsilent_intervals,
+    speech_segments,
+    speech_only_wav,
+    pitch_frame_params,
+    pitch_frame_ranges,
+)
+
+
+# 디코드 블록 크기 (샘플 수)
+BLOCK_SIZE = 65536
+
+
+class _Framer:
+    """
+    조금씩 들어오는 샘플을 center=True 프레임 격자(프레임 i는 i*hop_length 중심)로 나눈다.
+    push는 새로 완성된 프레임들이 덮는 샘플 구간과 프레임 수를 돌려주고,
+    그 구간을 center=False로 분석하면 전체 신호를 한 번에 분석한 값과 같다.
+    남겨 두는 샘플은 프레임 하나 + 블록 하나 정도다.
+    """
+
+    def __init__(self, frame_length: int, hop_length: int):
+        self.frame_length = frame_length
+        self.hop_length = hop_length
+        # 버퍼의 시작은 항상 다음 프레임(n_frames)의 왼쪽 끝이다 (처음엔 왼쪽 0 패딩)
+        self._buf = np.zeros(frame_length // 2, dtype=np.float32)
+        self.n_frames = 0
+        self.n_samples = 0
+
+    def push(self, x, last: bool = False):
+        self.n_samples += len(x)
+        buf = np.concatenate((self._buf, x)) if len(x) else self._buf
+        if last:
+            # 전체 프레임 수는 1 + n_samples // hop, 오른쪽 끝은 0으로 채운다
+            n = 1 + self.n_samples // self.hop_length - self.n_frames
+            need = (n - 1) * self.hop_length + self.frame_length
+            if len(buf) < need:
+                buf = np.pad(buf, (0, need - len(buf)))
+        elif len(buf) >= self.frame_length:
+            n = 1 + (len(buf) - self.frame_length) // self.hop_length
+        else:
+            n = 0
+
+        if n <= 0:
+            self._buf = buf
+            return buf[:0], 0
+        chunk = buf[: (n - 1) * self.hop_length + self.frame_length]
+        self._buf = buf[n * self.hop_length:]
+        self.n_frames += n
+        return chunk, n
+
+
+class StreamingAnalyzer:
+    """
+    고정 크기 오디오 블록을 feed로 받아 RMS, 스펙트럴 센트로이드, 피치를 프레임 단위로 쌓는다.
+    원본 샘플은 보관하지 않으므로 메모리는 녹음 길이와 거의 무관하다 (프레임당 숫자 몇 개).
+    비침묵/발화 구간은 전체 최댓값이 있어야 정해지므로 finalize에서 계산하며,
+    결과는 extract_features / track_pitch와 같다 (cent는 발화 구간 밖에서 NaN).
+    snapshot은 지금까지 들어온 부분으로 중간 결과를 만든다.
+
+        analyzer = StreamingAnalyzer(sr)
+        for block in blocks:
+            analyzer.feed(block)
+        feats, pitch = analyzer.finalize()
+    """
+
+    def __init__(
+        self,
+        sr: int,
+        n_fft: int = N_FFT,
+        hop_length: int = HOP_LENGTH,
+        top_db: float = TOP_DB,
+        with_pitch: bool = True,
+        fmin: float = VOICE_FMIN,
+        fmax: float = VOICE_FMAX,
+        analysis_sr: int = PITCH_SR,
+    ):
+        self.sr = sr
+        self.n_fft = n_fft
+        self.hop_length = hop_length
+        self.top_db = top_db
+        self._frames = _Framer(n_fft, hop_length)
+        self._rms = []
+        self._cent = []
+        self._finalized = None
+
+        self.with_pitch = with_pitch
+        if with_pitch:
+            self.fmin, self.fmax, self.analysis_sr = fmin, fmax, analysis_sr
+            frame_length, pitch_hop = pitch_frame_params(fmin, analysis_sr)
+            self._pitch_frames = _Framer(frame_length, pitch_hop)
+            # track_pitch의 librosa.resample(soxr_hq)과 같은 결과를 블록 단위로 낸다
+            self._resampler = (
+                soxr.ResampleStream(sr, analysis_sr, 1, dtype="float32", quality="HQ")
+                if sr != analysis_sr
+                else None
+            )
+            self._pitch_samples = 0
+            self._f0 = []
+
+    @property
+    def duration(self) -> float:
+        """지금까지 들어온 길이 (초)."""
+        return self._frames.n_samples / self.sr
+
+    def feed(self, block):
+        """모노 float 블록 하나를 분석에 반영한다."""
+        if self._finalized is not None:
+            raise RuntimeError("finalize 이후에는 feed할 수 없습니다.")
+        block = np.asarray(block, dtype=np.float32)
+        self._push_spectral(block, last=False)
+        if self.with_pitch:
+            self._push_pitch(block, last=False)
+
+    def _push_spectral(self, block, last):
+        chunk, n = self._frames.push(block, last)
+        if not n:
+            return
+        self._rms.append(
+            librosa.feature.rms(
+                y=chunk, frame_length=self.n_fft, hop_length=self.hop_length, center=False
+            )[0]
+        )
+        S = np.abs(librosa.stft(chunk, n_fft=self.n_fft, hop_length=self.hop_length, center=False))
+        self._cent.append(
+            librosa.feature.spectral_centroid(
+                S=S, sr=self.sr, n_fft=self.n_fft, hop_length=self.hop_length
+            )[0]
+        )
+
+    def _push_pitch(self, block, last):
+        if self._resampler is not None:
+            block = self._resampler.resample_chunk(block, last=last)
+        if last:
+            # librosa.resample처럼 길이를 ceil(n * analysis_sr / sr)에 맞춘다
+            target = int(np.ceil(self._frames.n_samples * self.analysis_sr / self.sr))
+            extra = target - (self._pitch_samples + len(block))
+            block = np.pad(block, (0, extra)) if extra > 0 else block[: len(block) + extra]
+        self._pitch_samples += len(block)
+
+        chunk, n = self._pitch_frames.push(block, last)
+        if not n:
+            return
+        self._f0.append(
+            librosa.yin(
+                chunk,
+                fmin=self.fmin,
+                fmax=self.fmax,
+                sr=self.analysis_sr,
+                frame_length=self._pitch_frames.frame_length,
+                hop_length=self._pitch_frames.hop_length,
+                center=False,
+            )
+        )
+
+    def _features(self, rms, cent, n_samples) -> AudioFeatures:
+        intervals = _nonsilent_intervals(rms, n_samples, self.hop_length, self.top_db)
+        segments = speech_segments(intervals, self.sr, n_samples)
+
+        # extract_features처럼 발화 구간 밖의 센트로이드는 NaN
+        in_speech = np.zeros(len(rms), dtype=bool)
+        for start, end in segments:
+            first = start // self.hop_length
+            in_speech[first:first + 1 + (end - first * self.hop_length) // self.hop_length] = True
+        cent = np.where(in_speech, cent, np.nan)
+
+        total_dur = n_samples / self.sr
+        non_silent_dur = float(np.sum(intervals[:, 1] - intervals[:, 0])) / self.sr
+        init_silence = intervals[0][0] / self.sr if len(intervals) > 0 else 0.0
+        silence_ratio = (total_dur - non_silent_dur) / total_dur if total_dur > 0 else 0.0
+        times = librosa.times_like(rms, sr=self.sr, hop_length=self.hop_length)
+        return AudioFeatures(
+            times, rms, cent, total_dur, silence_ratio, init_silence, intervals, None, segments
+        )
+
+    def _pitch(self, f0_all, intervals) -> PitchTrack:
+        frame_length = self._pitch_frames.frame_length
+        hop = self._pitch_frames.hop_length
+        n_frames = len(f0_all)
+        intervals = np.round(np.asarray(intervals) * self.analysis_sr / self.sr).astype(int)
+
+        f0 = np.full(n_frames, np.nan)
+        for first, last in pitch_frame_ranges(intervals, frame_length, hop, n_frames):
+            f0[first:last] = f0_all[first:last]
+        voiced = np.isfinite(f0) & (f0 > self.fmin * 1.01) & (f0 < self.fmax * 0.99)
+        f0[~voiced] = np.nan
+        times = librosa.frames_to_time(np.arange(n_frames), sr=self.analysis_sr, hop_length=hop)
+        return PitchTrack(times, f0, voiced)
+
+    def snapshot(self):
+        """
+        지금까지 완성된 프레임으로 (AudioFeatures, PitchTrack 또는 None)을 만든다.
+        비침묵 판정은 지금까지의 최댓값 기준이라 finalize 결과와 다를 수 있다.
+        """
+        if self._finalized is not None:
+            return self._finalized
+        rms = np.concatenate(self._rms) if self._rms else np.zeros(0, dtype=np.float32)
+        cent = np.concatenate(self._cent) if self._cent else np.zeros(0)
+        feats = self._features(rms, cent, self._frames.n_frames * self.hop_length)
+        pitch = None
+        if self.with_pitch:
+            f0_all = np.concatenate(self._f0) if self._f0 else np.zeros(0)
+            pitch = self._pitch(f0_all, feats.intervals)
+        return feats, pitch
+
+    def finalize(self):
+        """남은 샘플을 처리하고 최종 (AudioFeatures, PitchTrack 또는 None)을 반환한다."""
+        if self._finalized is None:
+            empty = np.zeros(0, dtype=np.float32)
+            self._push_spectral(empty, last=True)
+            if self.with_pitch:
+                self._push_pitch(empty, last=True)
+            rms = np.concatenate(self._rms)
+            cent = np.concatenate(self._cent)
+            feats = self._features(rms, cent, self._frames.n_samples)
+            pitch = self._pitch(np.concatenate(self._f0), feats.intervals) if self.with_pitch else None
+            self._rms, self._cent = [rms], [cent]
+            self._finalized = (feats, pitch)
+        return self._finalized
+
+
+def iter_audio_blocks(source, block_size: int = BLOCK_SIZE):
+    """
+    파일 경로나 파일 객체를 soundfile로 조금씩 디코드해 모노 float32 블록을 내보낸다.
+    (sr, 전체 샘플 수, 블록 제너레이터)를 반환한다. 전체 신호를 메모리에 올리지 않는다.
+    """
+    f = sf.SoundFile(source)
+
+    def blocks():
+        with f:
+            for block in f.blocks(blocksize=block_size, dtype="float32", always_2d=True):
+                # librosa.load(mono=True)와 같은 채널 평균
+                yield block[:, 0] if block.shape[1] == 1 else np.mean(block, axis=1)
+
+    return f.samplerate, f.frames, blocks()
+
+
+def analyze_stream(source, block_size: int = BLOCK_SIZE, with_pitch: bool = True, on_progress=None):
+    """
+    source를 블록 단위로 디코드하면서 분석한다. 반환은 (AudioFeatures, PitchTrack 또는 None).
+    on_progress(analyzer, done_ratio)는 블록마다 호출되어 analyzer.snapshot()으로 중간 결과를 볼 수 있다.
+    """
+    sr, total, blocks = iter_audio_blocks(source, block_size)
+    analyzer = StreamingAnalyzer(sr, with_pitch=with_pitch)
+    for block in blocks:
+        analyzer.feed(block)
+        if on_progress:
+            on_progress(analyzer, analyzer.duration * sr / total if total else 1.0)
+    return analyzer.finalize()
+
+
+def speech_only_wav_from_file(source, segments, target_sr: int = STT_SR) -> bytes:
+    """
+    파일에서 발화 구간만 찾아 읽어 speech_only_wav와 같은 STT 업로드용 WAV를 만든다.
+    발화 구간 밖은 디코드하지 않는다.
+    """
+    with sf.SoundFile(source) as f:
+        sr = f.samplerate
+        if len(segments) == 0:
+            segments = [(0, f.frames)]
+        parts = []
+        for start, end in segments:
+            f.seek(int(start))
+            block = f.read(int(end - start), dtype="float32", always_2d=True)
+            parts.append(block[:, 0] if block.shape[1] == 1 else np.mean(block, axis=1))
+    return speech_only_wav(np.concatenate(parts), sr, [], target_sr)
@@ -0,0 +1,20 @@
+#align_utils.align_texts 점수 테스트
+# tests/test_align_utils.py
+from align_utils import align_texts
+
+
+def test_spacing_difference_does_not_lower_score():
+    alignment = align_texts("발표할 주제는 인공지능입니다.", "발표할주제는 인공지능입니다")
+    assert alignment.score == 100.0
+    assert alignment.sentences[0].match_rate == 100.0
+
+
+def test_partial_replacement_counts_matching_characters():
+    alignment = align_texts("오늘 날씨가 좋다", "내일 날씨가 나쁘다")
+    # "날씨가"와 "좋다"/"나쁘다"의 "다"만 맞는다: 2*4/15
+    assert round(alignment.score, 1) == 53.3
+
+
+def test_empty_inputs():
+    assert align_texts("", "").score == 100.0
+    assert align_texts("안녕하세요", "").score == 0.0
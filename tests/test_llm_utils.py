@@ -0,0 +1,94 @@
+#llm_utils.ChatStream과 관문 입장 반환 테스트
+# tests/test_llm_utils.py
+import gc
+import os
+import tempfile
+from types import SimpleNamespace
+
+os.environ.setdefault("SPECTRUM_CACHE_DIR", tempfile.mkdtemp(prefix="spectrum-test-"))
+
+import pytest  # noqa: E402
+
+import llm_utils  # noqa: E402
+from rate_limit import RateGovernor  # noqa: E402
+
+
+class FakeStream:
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.closed = False
+
+    def __iter__(self):
+        return iter(self.chunks)
+
+    def close(self):
+        self.closed = True
+
+
+def _chunk(text=None, finish_reason=None):
+    return SimpleNamespace(
+        choices=[SimpleNamespace(delta=SimpleNamespace(content=text), finish_reason=finish_reason)],
+        usage=None,
+    )
+
+
+def _client(streams):
+    def create(**kwargs):
+        stream = FakeStream([_chunk("안녕"), _chunk("하세요", "stop")])
+        streams.append(stream)
+        return stream
+
+    return SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+
+
+@pytest.fixture
+def governor(monkeypatch):
+    gov = RateGovernor(rpm=100, tpm=10**6, max_concurrency=2)
+    monkeypatch.setattr(llm_utils, "openai_governor", gov)
+    return gov
+
+
+def _open(streams):
+    return llm_utils.ChatStream(
+        _client(streams), "gpt-4o-mini", [{"role": "user", "content": "x"}], site="test", cache=False
+    )
+
+
+def test_iterated_stream_releases_admission(governor):
+    streams = []
+    stream = _open(streams)
+    assert governor.snapshot()["in_flight"] == 1
+    assert "".join(stream) == "안녕하세요"
+    assert stream.complete
+    assert streams[0].closed
+    assert governor.snapshot()["in_flight"] == 0
+
+
+def test_dropped_uniterated_stream_releases_admission(governor):
+    streams = []
+    stream = _open(streams)
+    assert governor.snapshot()["in_flight"] == 1
+    del stream
+    gc.collect()
+    assert streams[0].closed
+    assert governor.snapshot()["in_flight"] == 0
+
+
+def test_close_is_idempotent(governor):
+    streams = []
+    stream = _open(streams)
+    stream.close()
+    stream.close()
+    del stream
+    gc.collect()
+    assert governor.snapshot()["in_flight"] == 0
+
+
+def test_failed_create_releases_admission(governor):
+    def create(**kwargs):
+        raise RuntimeError("boom")
+
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    with pytest.raises(RuntimeError):
+        llm_utils.ChatStream(client, "gpt-4o-mini", [{"role": "user", "content": "x"}], site="test", cache=False)
+    assert governor.snapshot()["in_flight"] == 0
@@ -0,0 +1,98 @@
+#음성 분석 워밍업 (numba JIT 디스크 캐시 + 시작 시 백그라운드 실행)
+# warmup.py
+"""
+librosa의 numba 커널(yin, 프레임 처리 등)은 처음 호출될 때 컴파일되므로
+배포/재시작 후 첫 분석만 유독 느리다.
+- 이 모듈을 librosa보다 먼저 import하면 NUMBA_CACHE_DIR을 공유 캐시 폴더로 잡아,
+  컴파일 결과가 디스크에 남고 새 인스턴스는 다시 컴파일하지 않는다.
+- SPECTRUM_WARMUP=1이면 start_warmup()이 작은 합성 신호로 분석 파이프라인을 한 번
+  백그라운드 스레드에서 돌려, 첫 사용자 요청이 평소 속도로 처리되게 한다.
+"""
+import io
+import logging
+import os
+import threading
+import time
+
+from cache_utils import CACHE_DIR
+
+
+# numba를 import하기 전에 정해야 적용된다
+os.environ.setdefault("NUMBA_CACHE_DIR", os.path.join(CACHE_DIR, "numba"))
+
+WARMUP_ENABLED = os.environ.get("SPECTRUM_WARMUP", "0") == "1"
+
+logger = logging.getLogger(__name__)
+if not logger.handlers:
+    # 시작 로그에 워밍업 시간이 남도록 INFO를 따로 출력한다
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter("%(asctime)s %(name)s %(levelname)s %(message)s"))
+    logger.addHandler(_handler)
+    logger.setLevel(logging.INFO)
+
+_lock = threading.Lock()
+_thread = None
+warmup_done = threading.Event()
+
+
+def _synthetic_wav(duration: float = 2.0, sr: int = 48000) -> bytes:
+    """무음 - 배음 톤 - 무음으로 된 짧은 WAV (VAD, 피치, 리샘플링 경로를 모두 지나가게)."""
+    import numpy as np
+    import soundfile as sf
+
+    t = np.arange(int(duration * sr)) / sr
+    y = 0.1 * np.sin(2 * np.pi * 150 * t) + 0.05 * np.sin(2 * np.pi * 300 * t)
+    y[(t < 0.4) | (t > duration - 0.4)] = 0.0
+    buf = io.BytesIO()
+    sf.write(buf, y.astype(np.float32), sr, format="WAV", subtype="PCM_16")
+    return buf.getvalue()
+
+
+def run_warmup() -> float:
+    """
+    발표 분석 페이지와 같은 순서로 파이프라인을 한 번 돌리고 걸린 시간(초)을 반환한다.
+    (디코드 → VAD → 특징 → 피치 → STT용 WAV → 스트리밍 분석 → 차트 다운샘플링)
+    """
+    start = time.perf_counter()
+    from analysis_utils import detect_speech, extract_features, speech_only_wav, track_pitch
+    from audio_io import load_audio
+    from plot_utils import decimate
+    from stream_utils import analyze_stream
+
+    wav = _synthetic_wav()
+    y, sr = load_audio(wav)
+    speech = detect_speech(y, sr)
+    feats = extract_features(y, sr, speech=speech)
+    pitch = track_pitch(y, sr, feats.intervals)
+    speech_only_wav(y, sr, feats.segments)
+    analyze_stream(io.BytesIO(wav))
+    decimate(pitch.times, pitch.f0, max_points=10)
+    return time.perf_counter() - start
+
+
+def _run():
+    try:
+        elapsed = run_warmup()
+        logger.info(
+            "음성 분석 워밍업 완료: %.2fs (NUMBA_CACHE_DIR=%s)", elapsed, os.environ["NUMBA_CACHE_DIR"]
+        )
+    except Exception:
+        logger.exception("음성 분석 워밍업 실패")
+    finally:
+        warmup_done.set()
+
+
+def start_warmup(force: bool = False):
+    """
+    SPECTRUM_WARMUP=1(또는 force)이면 프로세스당 한 번만 워밍업 스레드를 시작한다.
+    Streamlit은 상호작용마다 app.py를 다시 실행하므로 여러 번 불려도 된다.
+    """
+    global _thread
+    if not (WARMUP_ENABLED or force):
+        return None
+    with _lock:
+        if _thread is None:
+            _thread = threading.Thread(target=_run, name="analysis-warmup", daemon=True)
+            _thread.start()
+            logger.info("음성 분석 워밍업 시작")
+    return _thread